@@ -1,52 +1,184 @@
+import sys
 import argparse
-from lib.output import Console
-from azure.cli_manager import Azure
-from azure.config_file import Config
 
 if __name__ == "__main__":
 
     # Create the argument parser
     parser = argparse.ArgumentParser(description="Script to execute backup or start a console in Azure CLI")
     parser.add_argument("--backup", action="store_true", help="Run backup mode")
+    parser.add_argument("--incremental", action="store_true", help="Transfer only the files that changed since the previous backup")
+    parser.add_argument("--transport", choices=["cp", "tar"], help="Backup transport: kubectl cp, or a tar stream over kubectl exec")
+    parser.add_argument("--compression", choices=["none", "gzip", "zstd"], help="Compress the tar stream inside the pod")
+    parser.add_argument("--archive", action="store_true", help="Save the backup as a single archive file instead of extracting it")
+    parser.add_argument("--verify", action="store_true", help="Verify the backup against the pod with SHA-256 checksums")
+    parser.add_argument("--resume", action="store_true", help="Continue an interrupted resumable backup from its last completed unit")
+    parser.add_argument("--snapshot", action="store_true", help="Store the backup as a dated, deduplicated snapshot and apply the retention policy")
+    parser.add_argument("--targets", action="store_true", help="Back up every target in backup.targets in parallel instead of a selected pod")
+    parser.add_argument("--workers", type=int, help="Maximum number of concurrent backups with --targets, or clusters with --inventory")
+    parser.add_argument("--inventory", action="store_true", help="Collect namespaces, deployments and pod health from every cluster in inventory.clusters concurrently")
     parser.add_argument("--console", action="store_true", help="Run console mode")
+    parser.add_argument("--watch", action="store_true", help="Keep the pod table of the selected deployment live until interrupted")
+    parser.add_argument("--force-login", action="store_true", help="Always run az login and fetch the cluster credentials instead of reusing them")
+    parser.add_argument("--prefetch", action="store_true", help="Fetch deployments and pods in the background while the selection prompts are open")
+    parser.add_argument("--all-pods", action="store_true", help="List every pod of the namespace instead of only the pods of the selected deployment")
+    parser.add_argument("--chunk-size", type=int, help="Fetch listings in pages of this size and render them progressively")
+    parser.add_argument("--refresh", action="store_true", help="Ignore the cached listings and fetch namespaces, deployments and pods again")
+    parser.add_argument("--command-stats", action="store_true", help="Print the time, exit codes and output size of every az and kubectl command at the end")
+    parser.add_argument("--profile", action="store_true", help="Time every phase and external command and print a nested summary at the end")
+    parser.add_argument("--profile-trace", metavar="FILE", help="Also write the profile as a Chrome trace / Perfetto JSON file (implies --profile)")
+    parser.add_argument("--output", choices=["text", "plain", "json", "ndjson"], default="text", help="Output format: coloured text (default), plain text without ANSI escapes, a JSON array, or one JSON record per line")
+    parser.add_argument("--recheck-tools", action="store_true", help="Ignore the cached tool detection and check Azure CLI and kubectl again")
+    parser.add_argument("--no-banner", action="store_true", help="Do not print the ASCII art banner at start")
 
     # Parse the arguments
     args = parser.parse_args()
 
+    # A JSON array is only written at the end, so a watch would keep every event in memory and print nothing
+    if args.watch and args.output == 'json':
+        parser.error("--watch runs until interrupted: use --output ndjson to get its records as they happen")
+
+    # The project modules are loaded once the arguments are valid, so --help and usage errors answer at once
+    from lib.output import Console
+    from azure.cli_manager import Azure
+    from azure.config_file import Config
+    from lib.tracing import tracer, PROFILE_HEADERS, profile_rows
+
+    azure = None
+
+    # Select the output format before anything is printed
+    Console.configure(args.output)
+
+    # Record the timing of every phase and command
+    if args.profile or args.profile_trace:
+        tracer.enable()
+
     try:
         # Load the connection configuration
-        config = Config()
+        with tracer.span('loadConfig'):
+            config = Config()
 
         # Initialize Azure service
-        azure = Azure()
-
-        # Log in to Azure with the provided tenant ID
-        azure.login(tenant_id=config.tenant)
+        with tracer.span('initialize'):
+            azure = Azure(
+                recheck_tools=args.recheck_tools,
+                # Listings are fetched live with --refresh, so prefetching them would be wasted
+                prefetch=args.prefetch and not args.refresh,
+                running_pods_only=config.pods_running_only,
+                namespace_pods=args.all_pods or config.pods_namespace_wide,
+                chunk_size=args.chunk_size or config.listing_chunk_size,
+                column_width=config.listing_column_width,
+                cache_ttl=config.listing_cache_ttl,
+                command_timeout=config.commands_timeout,
+                command_retries=config.commands_retries,
+                command_stats=args.command_stats,
+                banner=not args.no_banner
+            )
+
+        # Log in to Azure with the provided tenant ID, reusing a valid session if possible
+        azure.login(
+            tenant_id=config.tenant,
+            subscription_id=config.subscription_id,
+            reuse_session=not args.force_login
+        )
+
+        # Query every configured cluster through its own kubeconfig, without changing the active subscription
+        if args.inventory:
+            azure.runInventory(
+                clusters=config.inventory_clusters,
+                workers=args.workers or config.inventory_workers,
+                timeout=config.inventory_timeout,
+                refresh=args.force_login
+            )
+            sys.exit(0)
 
         # Set the subscription
         azure.setSubscription(subscription_id=config.subscription_id)
 
+        # Use the credentials of the configured AKS cluster, fetching them only when needed
+        if config.resource_group and config.name:
+            azure.getCredentials(
+                resource_group=config.resource_group,
+                name=config.name,
+                subscription_id=config.subscription_id,
+                overwrite_existing=config.overwrite_existing,
+                refresh=args.force_login
+            )
+
+        # Back up every configured target in parallel instead of prompting for a pod
+        if args.targets:
+            azure.runTargetBackups(
+                targets=config.backup_targets,
+                folder=config.backup_targets_folder,
+                origin=config.backup_origin or '/var/www/app',
+                workers=args.workers or config.backup_workers,
+                verify=args.verify,
+                incremental=args.incremental or config.backup_incremental,
+                hashes=config.backup_hash,
+                transport=args.transport or config.backup_transport,
+                compression=args.compression or config.backup_compression,
+                level=config.backup_compression_level,
+                archive=args.archive or config.backup_archive,
+                snapshots=config.backup_snapshots if config.backup_snapshots is not None else ({} if args.snapshot else None),
+                resumable=config.backup_resumable,
+                resume=args.resume,
+                unit_size=config.backup_unit_size,
+                retries=config.backup_retries,
+                filters=config.backup_filters
+            )
+            sys.exit(0)
+
         # List available namespaces
-        azure.listNamespaces(echo=config.namespace_echo)
+        azure.listNamespaces(echo=config.namespace_echo, refresh=args.refresh)
 
         # Select the namespace to use
         azure.selectNamespace(namespace=config.namespace_select)
 
         # List deployments within the selected namespace
-        azure.listDeployments(echo=config.deployments_echo)
+        azure.listDeployments(echo=config.deployments_echo, refresh=args.refresh)
 
         # Select the deployment to use
         azure.selectDeployment(deployment=config.deployments_select)
 
+        # Keep the pod table live from a watch stream instead of selecting a pod
+        if args.watch:
+            azure.watchPods()
+            sys.exit(0)
+
         # List available Pods
-        azure.listPods(echo=config.pods_echo)
+        azure.listPods(echo=config.pods_echo, refresh=args.refresh)
 
         # Select the Pod to use
         azure.selectPod(pod=config.pods_select)
 
         # Perform backup if the backup argument is provided
         if args.backup:
-            azure.runBackup(folder=config.backup_folder, origin=config.backup_origin)
+            azure.runBackup(
+                folder=config.backup_folder,
+                origin=config.backup_origin,
+                incremental=args.incremental or config.backup_incremental,
+                hashes=config.backup_hash,
+                transport=args.transport or config.backup_transport,
+                compression=args.compression or config.backup_compression,
+                level=config.backup_compression_level,
+                archive=args.archive or config.backup_archive,
+                snapshots=config.backup_snapshots if config.backup_snapshots is not None else ({} if args.snapshot else None),
+                resumable=config.backup_resumable,
+                resume=args.resume,
+                unit_size=config.backup_unit_size,
+                retries=config.backup_retries,
+                filters=config.backup_filters
+            )
+
+        # Verify the backup against the pod
+        if args.verify:
+            azure.verifyBackup(
+                folder=config.backup_folder,
+                origin=config.backup_origin or '/var/www/app',
+                filters=config.backup_filters,
+                snapshots=config.backup_snapshots is not None or args.snapshot,
+                archive=args.archive or config.backup_archive,
+                compression=args.compression or config.backup_compression
+            )
 
         # Start the terminal session if the console argument is provided
         if args.console:
@@ -58,3 +190,21 @@ if __name__ == "__main__":
 
         # Print the full traceback for debugging
         raise ValueError(e)
+
+    finally:
+        # Cancel any pending background work
+        if azure:
+            azure.close()
+
+        # Print where the time went and keep the trace for later comparisons
+        if tracer.enabled:
+            Console.newLine()
+            Console.textSuccess(f"Profile ({tracer.elapsed():.3f}s):")
+            Console.table(headers=PROFILE_HEADERS, rows=profile_rows(tracer.summary(), tracer.elapsed()), name='span')
+            Console.newLine()
+            if args.profile_trace:
+                tracer.write(args.profile_trace)
+                Console.info(message=f"Trace written to {args.profile_trace} (open it in chrome://tracing or ui.perfetto.dev).", timestamp=True)
+
+        # Write the records collected by the JSON output
+        Console.finish()
@@ -0,0 +1,907 @@
+import os
+import re
+import json
+import mmap
+import hashlib
+import time
+import random
+import shlex
+import shutil
+import tarfile
+import tempfile
+import threading
+import subprocess
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from lib.output import Console
+from azure.runner import runner
+from lib.helpers import format_bytes
+
+# Lists every selected regular file under the origin as "<size> <mtime> <path>" in a single remote
+# call. GNU find prints the metadata directly; BusyBox images fall back to `stat`. When the second
+# argument is "1", the SHA-256 of every file is appended after a marker line. With filters, the
+# number and size of all the files are appended too, so the excluded ones can be reported.
+MANIFEST_SCRIPT = r"""
+cd "$1" || exit 1
+if find . -maxdepth 0 -printf '' >/dev/null 2>&1; then GNU=1; else GNU=0; fi
+if [ "$GNU" = "1" ]; then
+    find . {select} -printf '%s %T@ %P\n'
+else
+    find . {select} -exec stat -c '%s %Y %n' {{}} +
+fi
+if [ "$2" = "1" ]; then
+    echo '--HASHES--'
+    find . {select} -exec sha256sum {{}} +
+fi
+"""
+
+# Appended when filters are used: the count and size of every file, summed on the pod when awk exists
+TOTALS_SCRIPT = r"""
+echo '--TOTALS--'
+total() { if command -v awk >/dev/null 2>&1; then awk '{n++; s+=$1} END {print "total", n+0, s+0}'; else cat; fi; }
+if [ "$GNU" = "1" ]; then
+    find . -type f -printf '%s\n' | total
+else
+    find . -type f -exec stat -c '%s' {} + | total
+fi
+"""
+
+class RemoteFiles(dict):
+    """The files of a remote manifest ({path: [size, mtime, hash]}) with the totals of the excluded ones."""
+
+    excluded_files = 0
+    excluded_bytes = 0
+
+def find_filters(include: list = None, exclude: list = None, max_size: float = 0) -> str:
+    """
+    Builds the `find` expression that selects the files of a backup on the pod.
+
+    Patterns without a slash match file or folder names anywhere (e.g. 'node_modules', '*.log');
+    patterns with a slash match paths relative to the origin (e.g. 'storage/logs', 'public/*.map'),
+    with the `find -path` rules, where '*' also matches '/'. Excluded folders are pruned, so they
+    are never traversed.
+
+    Args:
+        include (list, optional): If provided, only the files matching one of these globs are selected.
+        exclude (list, optional): Files and folders matching these globs are skipped.
+        max_size (float, optional): If greater than 0, files larger than this size in MiB are skipped.
+
+    Returns:
+        str: The expression, with the patterns quoted for `sh`.
+
+    Example:
+        >>> find_filters(exclude=['node_modules'], max_size=1)
+        '\\\\( -name node_modules \\\\) -prune -o -type f -size -1048577c'
+    """
+    def predicates(patterns: list) -> str:
+        terms = []
+        for pattern in patterns:
+            pattern = pattern.strip().rstrip('/')
+            if '/' in pattern:
+                path = pattern[2:] if pattern.startswith('./') else pattern.lstrip('/')
+                terms.append(f"-path {shlex.quote('./' + path)}")
+            elif pattern:
+                terms.append(f"-name {shlex.quote(pattern)}")
+        return ' -o '.join(terms)
+
+    expression = ''
+    if exclude and predicates(exclude):
+        expression += f"\\( {predicates(exclude)} \\) -prune -o "
+
+    expression += "-type f"
+    if include and predicates(include):
+        expression += f" \\( {predicates(include)} \\)"
+    if max_size and float(max_size) > 0:
+        expression += f" -size -{int(float(max_size) * 1024 * 1024) + 1}c"
+
+    return expression
+
+def manifest_path(backup_path: Path) -> Path:
+    """
+    Returns the location of the manifest describing a backup folder.
+
+    The manifest is stored next to the folder, so it never becomes part of the backup itself.
+
+    Args:
+        backup_path (Path): The backup folder.
+
+    Returns:
+        Path: The manifest file path.
+    """
+    return backup_path.parent / f".{backup_path.name}.manifest.json"
+
+def load_manifest(path: Path, origin: str) -> dict:
+    """
+    Loads the manifest of the previous backup.
+
+    Args:
+        path (Path): The manifest file path.
+        origin (str): The origin folder of the current backup.
+
+    Returns:
+        dict: The files of the previous backup ({path: [size, mtime, hash]}), or an empty dictionary
+              if there is no manifest or it belongs to another origin.
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as file:
+            data = json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+    return data.get('files', {}) if data.get('origin') == origin else {}
+
+def save_manifest(path: Path, origin: str, files: dict):
+    """
+    Stores the manifest of a completed backup.
+
+    Args:
+        path (Path): The manifest file path.
+        origin (str): The origin folder of the backup.
+        files (dict): The files of the backup ({path: [size, mtime, hash]}).
+    """
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as file:
+        json.dump({"origin": origin, "files": files}, file)
+    os.replace(tmp_path, path)
+
+def parse_manifest(output: str) -> dict:
+    """
+    Parses the output of `MANIFEST_SCRIPT`.
+
+    Args:
+        output (str): The script output.
+
+    Returns:
+        RemoteFiles: The remote files ({path: [size, mtime, hash]}).
+    """
+    files = RemoteFiles()
+    section = 'files'
+    total_files = 0
+    total_bytes = 0
+
+    for line in output.splitlines():
+        if line in ('--HASHES--', '--TOTALS--'):
+            section = line.strip('-').lower()
+            continue
+
+        if section == 'files':
+            parts = line.split(' ', 2)
+            if len(parts) != 3:
+                continue
+            size, mtime, path = parts
+            files[path[2:] if path.startswith('./') else path] = [int(size), int(float(mtime)), None]
+
+        elif section == 'hashes':
+            # Hash lines are "<sha256>  ./<path>"
+            digest, _, path = line.partition('  ')
+            path = path[2:] if path.startswith('./') else path
+            if path in files:
+                files[path][2] = digest
+
+        elif line.startswith('total '):
+            _, count, size = line.split()
+            total_files += int(count)
+            total_bytes += int(size)
+
+        elif line.strip().isdigit():
+            total_files += 1
+            total_bytes += int(line)
+
+    if section == 'totals':
+        files.excluded_files = max(total_files - len(files), 0)
+        files.excluded_bytes = max(total_bytes - sum(entry[0] for entry in files.values()), 0)
+
+    return files
+
+def remote_manifest(namespace: str, pod: str, origin: str, hashes: bool = False, filters: dict = None) -> dict:
+    """
+    Builds the manifest of the origin folder on the pod with a single `kubectl exec`.
+
+    Args:
+        namespace (str): The namespace of the pod.
+        pod (str): The pod name.
+        origin (str): The folder inside the pod.
+        hashes (bool, optional): If True, the SHA-256 of every file is included. Defaults to False.
+        filters (dict, optional): The 'include' and 'exclude' globs and the 'max-file-size' in MiB,
+                                  applied on the pod (see `find_filters`). Defaults to None.
+
+    Raises:
+        subprocess.CalledProcessError: If the remote command fails.
+
+    Returns:
+        RemoteFiles: The remote files ({path: [size, mtime, hash]}) and the totals of the excluded ones.
+    """
+    filters = filters or {}
+    select = find_filters(filters.get('include'), filters.get('exclude'), filters.get('max-file-size', 0))
+    script = MANIFEST_SCRIPT.format(select=select)
+    if select != "-type f":
+        script += TOTALS_SCRIPT
+
+    command = [
+        "kubectl", "exec", "-n", namespace, pod, "--",
+        "sh", "-c", script, "sh", origin, "1" if hashes else "0"
+    ]
+    # Listing and hashing a large tree can take long, so no timeout applies
+    result = runner.run(command, timeout=None)
+    return parse_manifest(result.stdout)
+
+def diff_manifest(previous: dict, current: dict, backup_path: Path) -> tuple:
+    """
+    Compares the previous backup with the current state of the pod.
+
+    A file is transferred when it is new, when its size, modification time or hash changed, or
+    when it is missing locally.
+
+    Args:
+        previous (dict): The manifest of the previous backup.
+        current (dict): The manifest of the pod.
+        backup_path (Path): The backup folder.
+
+    Returns:
+        tuple: The paths to transfer, the paths deleted on the pod and the bytes skipped.
+    """
+    changed = []
+    skipped_bytes = 0
+
+    for path, (size, mtime, digest) in current.items():
+        known = previous.get(path)
+        unchanged = (
+            known is not None
+            and known[0] == size
+            and known[1] == mtime
+            and (digest is None or known[2] is None or known[2] == digest)
+            and (backup_path / path).is_file()
+        )
+        if unchanged:
+            skipped_bytes += size
+        else:
+            changed.append(path)
+
+    deleted = [path for path in previous if path not in current]
+    return changed, deleted, skipped_bytes
+
+# Remote compressors and the suffix of the archives they produce
+COMPRESSORS = {
+    'none': ('', '.tar'),
+    'gzip': (' | gzip -{level}', '.tar.gz'),
+    'zstd': (' | zstd -q -{level} -c', '.tar.zst'),
+}
+
+# Default compression level of each compressor
+DEFAULT_LEVELS = {'none': 0, 'gzip': 6, 'zstd': 3}
+
+# Files reported by GNU tar because they changed or vanished on a live pod while being archived. A file
+# of the list given to `tar -T -` that was deleted since the listing cannot be stat'ed and makes tar exit
+# with 2 instead of 1, but the archive is just as complete. Messages start with the program as it was
+# called (`tar:` or `/bin/tar:`).
+TAR_CHANGED = re.compile(
+    r'^(?:\S*/)?tar: (?:\./)?(.+?): (file changed as we read it|File removed before we read it|File shrank by \d+ bytes.*'
+    r'|Cannot stat: No such file or directory)$',
+    re.MULTILINE
+)
+TAR_VANISHED = ('File removed before we read it', 'Cannot stat: No such file or directory')
+TAR_FAILURE_NOTE = re.compile(r'^(?:\S*/)?tar: Exiting with failure status due to previous errors$')
+
+# Line the remote script writes to stderr with the exit code of `tar` when its output is piped to a
+# compressor: the pipeline exits with the compressor's code, and `set -o pipefail` is not in every `sh`
+TAR_STATUS = re.compile(r'^tar exit status: (\d+)\n?', re.MULTILINE)
+
+def archive_suffix(compression: str = 'none') -> str:
+    """Returns the file suffix of an archive produced with the given compression."""
+    return COMPRESSORS[compression or 'none'][1]
+
+class CountingReader:
+    """Wraps a binary stream, counts the bytes read from it and reports them to an optional callback."""
+
+    def __init__(self, stream, on_read=None):
+        self.stream = stream
+        self.bytes = 0
+        self.on_read = on_read
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.stream.read(size)
+        self.bytes += len(data)
+        if self.on_read:
+            self.on_read(self.bytes)
+        return data
+
+class ProgressReporter:
+    """Prints the bytes received and the throughput of a transfer on a single refreshed line."""
+
+    def __init__(self, label: str, interval: float = 0.5):
+        """
+        Initializes the reporter.
+
+        Args:
+            label (str): The text shown before the counters.
+            interval (float, optional): Minimum seconds between two refreshes. Defaults to 0.5.
+        """
+        self.label = label
+        self.interval = interval
+        self.start = time.monotonic()
+        self.last = 0.0
+
+    def line(self, total: int) -> str:
+        """Formats the counters for the given number of bytes."""
+        elapsed = max(time.monotonic() - self.start, 1e-6)
+        return f"{self.label}: {format_bytes(total)} received ({format_bytes(total / elapsed)}/s)"
+
+    def fields(self, total: int) -> dict:
+        """Returns the counters written in the structured output modes."""
+        elapsed = max(time.monotonic() - self.start, 1e-6)
+        return {"label": self.label, "bytes": total, "seconds": round(elapsed, 3), "rate": round(total / elapsed)}
+
+    def __call__(self, total: int):
+        now = time.monotonic()
+        if now - self.last >= self.interval:
+            self.last = now
+            Console.progress(self.line(total), **self.fields(total))
+
+    def done(self, total: int):
+        """Prints the final counters and ends the line."""
+        Console.progress(self.line(total), final=True, **self.fields(total))
+
+def zstandard_module():
+    """
+    Imports the optional `zstandard` package used to decompress zstd streams.
+
+    Raises:
+        RuntimeError: If the package is not installed.
+    """
+    try:
+        import zstandard
+    except ImportError:
+        raise RuntimeError("zstd compression requires the 'zstandard' package: pip install zstandard")
+    return zstandard
+
+def extract_stream(stream, destination: Path, compression: str = 'none') -> int:
+    """
+    Extracts a tar stream into a folder as the bytes arrive.
+
+    Existing files are unlinked before being written, so files that are hard linked elsewhere
+    are never modified in place.
+
+    Args:
+        stream (file): The binary tar stream.
+        destination (Path): The folder to extract into.
+        compression (str, optional): The compression of the stream ('none', 'gzip' or 'zstd'). Defaults to 'none'.
+
+    Raises:
+        ValueError: If a member would be written outside the destination.
+        RuntimeError: If the stream uses zstd and the `zstandard` package is not installed.
+
+    Returns:
+        int: The number of files extracted.
+    """
+    root = str(destination.resolve())
+    folders = {root}
+    extracted = 0
+    mode = 'r|'
+
+    if compression == 'gzip':
+        mode = 'r|gz'
+    elif compression == 'zstd':
+        stream = zstandard_module().ZstdDecompressor().stream_reader(stream)
+
+    with tarfile.open(fileobj=stream, mode=mode) as archive:
+        for member in archive:
+            target = os.path.abspath(os.path.join(root, member.name))
+            if target != root and not target.startswith(root + os.sep):
+                raise ValueError(f"Refusing to extract '{member.name}' outside of the backup folder.")
+
+            if not member.isfile():
+                # The 'tar' filter keeps symlinks as they are on the pod, like `kubectl cp` does
+                if hasattr(tarfile, 'tar_filter'):
+                    archive.extract(member, root, filter='tar')
+                else:
+                    archive.extract(member, root)
+                continue
+
+            # Regular files are written directly: going through `extract` costs several path
+            # resolutions per member, which dominates on trees with many small files. Folders
+            # are checked once, so a symlinked folder can never lead outside the backup.
+            folder = os.path.dirname(target)
+            if folder not in folders:
+                os.makedirs(folder, exist_ok=True)
+                real = os.path.realpath(folder)
+                if real != root and not real.startswith(root + os.sep):
+                    raise ValueError(f"Refusing to extract '{member.name}' outside of the backup folder.")
+                folders.add(folder)
+
+            try:
+                os.unlink(target)
+            except FileNotFoundError:
+                pass
+
+            with archive.extractfile(member) as source, open(target, 'wb') as file:
+                shutil.copyfileobj(source, file)
+
+            # Same permissions as the 'tar' filter: no setuid/setgid/sticky, no group/other write
+            os.chmod(target, member.mode & 0o755)
+            os.utime(target, (member.mtime, member.mtime))
+            extracted += 1
+
+    return extracted
+
+def stream_tar(namespace: str, pod: str, origin: str, destination: Path = None, files: list = None,
+               compression: str = 'none', level: int = None, archive: Path = None, progress: str = None) -> dict:
+    """
+    Streams a tar archive of the origin folder from the pod over `kubectl exec`.
+
+    The archive is produced by `tar` inside the pod, optionally compressed there, and either
+    extracted locally as the bytes arrive or saved as a single archive file.
+
+    Args:
+        namespace (str): The namespace of the pod.
+        pod (str): The pod name.
+        origin (str): The folder inside the pod.
+        destination (Path, optional): The local folder to extract into.
+        files (list, optional): Only these paths (relative to the origin) are archived. Defaults to the whole folder.
+        compression (str, optional): 'none', 'gzip' or 'zstd'. Defaults to 'none'.
+        level (int, optional): The compression level. Defaults to the compressor's default.
+        archive (Path, optional): If provided, the stream is saved to this file instead of being extracted.
+        progress (str, optional): If provided, live byte counts and throughput are shown with this label.
+
+    Raises:
+        ValueError: If the compression is not supported.
+        RuntimeError: If the remote command fails. Exit code 1 of `tar`, and exit code 2 when every error
+                      is a file deleted since it was listed, are only a warning: the archive is complete,
+                      but some files changed or vanished while they were read (see 'changed').
+
+    Returns:
+        dict: The bytes received on the wire ('bytes'), the files extracted ('files'), the paths that
+              changed or vanished during the transfer ('changed'), whose copy may be inconsistent, and
+              the ones among them that no longer exist on the pod ('vanished').
+    """
+    compression = compression or 'none'
+    if compression not in COMPRESSORS:
+        raise ValueError(f"Unsupported compression '{compression}'. Use one of: {', '.join(COMPRESSORS)}.")
+    if compression == 'zstd' and not archive:
+        zstandard_module()
+    if files is not None and not files:
+        return {"bytes": 0, "files": 0, "changed": [], "vanished": []}
+
+    level = int(level if level is not None else DEFAULT_LEVELS[compression])
+    source = "-T -" if files is not None else "."
+    archiver = f"tar cf - {source}"
+    if compression != 'none':
+        archiver = f'{{ {archiver}; echo "tar exit status: $?" >&2; }}' + COMPRESSORS[compression][0].format(level=level)
+    script = f'cd "$1" || exit 1\n{archiver}'
+
+    command = ["kubectl", "exec", "-i", "-n", namespace, pod, "--", "sh", "-c", script, "sh", origin]
+    errors = tempfile.TemporaryFile()
+    started = time.perf_counter()
+    process = runner.popen(
+        command, stdin=subprocess.PIPE if files is not None else subprocess.DEVNULL,
+        stdout=subprocess.PIPE, stderr=errors
+    )
+
+    # Send the file list from a thread, so a long list never blocks the archive being read.
+    # Names are prefixed with './' so the ones starting with '-' are not read as options.
+    sender = None
+    if files is not None:
+        def send_list():
+            try:
+                process.stdin.write(''.join(f"./{path}\n" for path in files).encode('utf-8'))
+                process.stdin.close()
+            except OSError:
+                pass
+
+        sender = threading.Thread(target=send_list, daemon=True)
+        sender.start()
+
+    reporter = ProgressReporter(progress) if progress else None
+    reader = CountingReader(process.stdout, on_read=reporter)
+    extracted = 0
+    failure = None
+
+    try:
+        if archive:
+            # Save the stream as it is, replacing the previous archive only once complete
+            partial = archive.with_name(archive.name + '.part')
+            with open(partial, 'wb') as file:
+                shutil.copyfileobj(reader, file, 1024 * 1024)
+        else:
+            extracted = extract_stream(reader, destination, compression)
+    except tarfile.TarError as e:
+        # A truncated stream is reported with the remote error below, when there is one
+        failure = e
+    finally:
+        process.stdout.close()
+        process.wait()
+        if sender:
+            sender.join()
+        errors.seek(0)
+        stderr = errors.read().decode('utf-8', 'replace')
+        errors.close()
+        runner.record(command, time.perf_counter() - started, process.returncode, reader.bytes, started=started)
+        if reporter:
+            reporter.done(reader.bytes)
+
+    # Behind a compressor, the exit code of tar is the one it reported on stderr
+    returncode = process.returncode
+    statuses = TAR_STATUS.findall(stderr)
+    stderr = TAR_STATUS.sub('', stderr)
+    if returncode == 0 and statuses:
+        returncode = int(statuses[-1])
+
+    # Exit code 1, or 2 for files deleted since they were listed: files changed or vanished while they
+    # were read on a live pod, the archive itself is complete
+    lines = stderr.strip().splitlines()
+    errors = [line for line in lines if line and not TAR_FAILURE_NOTE.match(line)]
+    tolerated = returncode == 1 or (returncode == 2 and errors and all(TAR_CHANGED.match(line) for line in errors))
+    changed = []
+    vanished = []
+    if tolerated and not failure:
+        reported = TAR_CHANGED.findall(stderr)
+        changed = sorted({path for path, _ in reported})
+        vanished = sorted({path for path, reason in reported if reason in TAR_VANISHED})
+        Console.textWarning(
+            f"{len(changed) or 'Some'} files changed on the pod while they were archived: "
+            f"{'; '.join(lines[:5])}{' ...' if len(lines) > 5 else ''}"
+        )
+    elif returncode != 0:
+        raise RuntimeError(f"Remote tar failed with exit code {returncode}: {stderr.strip()}") from failure
+    if failure:
+        raise failure
+
+    if archive:
+        os.replace(partial, archive)
+
+    return {"bytes": reader.bytes, "files": extracted, "changed": changed, "vanished": vanished}
+
+def unsettled(manifest: dict, changed: list) -> dict:
+    """
+    Drops the files that changed during a transfer from the manifest saved with the backup.
+
+    Their local copy may not match the recorded size and time, so the next incremental backup or
+    snapshot sees them as new and checks them again.
+
+    Args:
+        manifest (dict): The manifest of the pod ({path: [size, mtime, sha256]}).
+        changed (list): The paths reported by `stream_tar`.
+
+    Returns:
+        dict: The manifest to save.
+    """
+    if not changed:
+        return manifest
+    changed = set(changed)
+    return {path: entry for path, entry in manifest.items() if path not in changed}
+
+def remove_files(files: list, destination: Path):
+    """
+    Removes files deleted on the pod from the backup and prunes the folders left empty.
+
+    Args:
+        files (list): The paths to remove, relative to the backup folder.
+        destination (Path): The backup folder.
+    """
+    folders = set()
+    for path in files:
+        target = destination / path
+        if target.is_file() or target.is_symlink():
+            target.unlink()
+        folders.update(parent for parent in target.parents if destination in parent.parents)
+
+    # Remove the deepest folders first
+    for folder in sorted(folders, key=lambda item: len(item.parts), reverse=True):
+        try:
+            folder.rmdir()
+        except OSError:
+            pass
+
+def plan_units(files: dict, unit_bytes: int = 64 * 1024 * 1024, unit_files: int = 5000) -> list:
+    """
+    Splits the files to transfer into checkpointed units.
+
+    Paths are sorted so that each folder is kept together, and a unit is closed once it
+    reaches `unit_bytes` or `unit_files`.
+
+    Args:
+        files (dict): The files to transfer ({path: [size, mtime, hash]}).
+        unit_bytes (int, optional): Target size of a unit. Defaults to 64 MiB.
+        unit_files (int, optional): Maximum number of files in a unit. Defaults to 5000.
+
+    Returns:
+        list: The units, each a list of paths.
+    """
+    units = []
+    unit = []
+    size = 0
+
+    for path in sorted(files):
+        unit.append(path)
+        size += files[path][0]
+        if size >= unit_bytes or len(unit) >= unit_files:
+            units.append(unit)
+            unit = []
+            size = 0
+
+    if unit:
+        units.append(unit)
+    return units
+
+def with_retries(action, retries: int = 3, delay: float = 2.0, label: str = 'Transfer'):
+    """
+    Runs an action, retrying it with exponential backoff when it fails transiently.
+
+    Dropped exec streams, truncated archives and failed kubectl calls are retried; any
+    other error is raised immediately.
+
+    Args:
+        action (callable): The action to run.
+        retries (int, optional): Number of retries after the first attempt. Defaults to 3.
+        delay (float, optional): Delay before the first retry in seconds, doubled on each retry. Defaults to 2.0.
+        label (str, optional): Name of the action in the retry messages. Defaults to 'Transfer'.
+
+    Returns:
+        The result of the action.
+    """
+    attempt = 0
+    while True:
+        try:
+            return action()
+        except (RuntimeError, tarfile.TarError, subprocess.CalledProcessError) as e:
+            if attempt >= retries:
+                raise
+            wait = delay * (2 ** attempt) * random.uniform(0.8, 1.2)
+            attempt += 1
+            message = e.stderr.strip() if isinstance(e, subprocess.CalledProcessError) and e.stderr else str(e)
+            Console.textWarning(f"{label} failed ({message}). Retry {attempt}/{retries} in {wait:.1f}s...")
+            time.sleep(wait)
+
+class BackupJournal:
+    """
+    Records the progress of a backup, so an interrupted run can continue where it stopped.
+
+    The journal is a JSON lines file next to the backup folder: the first line holds the plan
+    (the pod manifest, the units to transfer and the files to delete) and each following line
+    marks a unit as completed. Appending one line per unit keeps checkpoints cheap.
+    """
+
+    def __init__(self, backup_path: Path):
+        """
+        Initializes the journal of a backup folder.
+
+        Args:
+            backup_path (Path): The backup folder.
+        """
+        self.path = backup_path.parent / f".{backup_path.name}.journal"
+
+    def exists(self) -> bool:
+        """Returns True if an unfinished backup left a journal."""
+        return self.path.is_file()
+
+    def start(self, plan: dict):
+        """
+        Starts a new journal with the plan of the backup.
+
+        Args:
+            plan (dict): The 'origin', 'incremental', 'manifest', 'units' and 'deleted' of the backup.
+        """
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            file.write(json.dumps(plan) + "\n")
+        os.replace(tmp_path, self.path)
+
+    def load(self) -> tuple:
+        """
+        Reads the plan and the completed units.
+
+        Returns:
+            tuple: The plan (or None if the journal is missing or unreadable) and the set of completed unit indexes.
+                   The plan's 'changed' lists the files that changed while the completed units were read.
+        """
+        try:
+            with open(self.path, 'r', encoding='utf-8') as file:
+                plan = json.loads(file.readline())
+                done = set()
+                changed = set()
+                for line in file:
+                    # A line cut by a crash is ignored, its unit is simply transferred again
+                    try:
+                        checkpoint = json.loads(line)
+                        done.add(checkpoint['done'])
+                        changed.update(checkpoint.get('changed', []))
+                    except (ValueError, KeyError):
+                        pass
+                plan['changed'] = sorted(changed)
+        except (OSError, ValueError, TypeError):
+            return None, set()
+
+        return plan, done
+
+    def complete(self, index: int, changed: list = None):
+        """
+        Marks a unit as completed, flushing the checkpoint to disk.
+
+        Args:
+            index (int): The unit index.
+            changed (list, optional): The files of the unit that changed while they were read. Defaults to None.
+        """
+        checkpoint = {"done": index, "changed": changed} if changed else {"done": index}
+        with open(self.path, 'a', encoding='utf-8') as file:
+            file.write(json.dumps(checkpoint) + "\n")
+            file.flush()
+            os.fsync(file.fileno())
+
+    def remove(self):
+        """Deletes the journal once the backup is complete."""
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+
+def file_digest(path, mmap_threshold: int = 4 * 1024 * 1024, chunk_size: int = 1024 * 1024) -> str:
+    """
+    Computes the SHA-256 of a file.
+
+    Large files are memory-mapped and hashed in a single call, which releases the GIL for the
+    whole file, so several files can be hashed in parallel threads at disk speed.
+
+    Args:
+        path (Path | str): The file path.
+        mmap_threshold (int, optional): Files of at least this size are memory-mapped. Defaults to 4 MiB.
+        chunk_size (int, optional): Bytes read at a time for smaller files. Defaults to 1 MiB.
+
+    Returns:
+        str: The hexadecimal digest.
+    """
+    with open(path, 'rb') as file:
+        if os.fstat(file.fileno()).st_size >= mmap_threshold:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return hashlib.sha256(mapped).hexdigest()
+
+        digest = hashlib.sha256()
+        for chunk in iter(lambda: file.read(chunk_size), b''):
+            digest.update(chunk)
+        return digest.hexdigest()
+
+def local_digests(folder: Path, workers: int = None) -> dict:
+    """
+    Hashes every regular file of a local folder concurrently.
+
+    Args:
+        folder (Path): The folder to hash.
+        workers (int, optional): The number of hashing threads. Defaults to the number of CPUs plus 4 (at most 32).
+
+    Returns:
+        dict: The digest and size of every file ({path: [size, sha256]}), with '/' separated relative paths.
+    """
+    paths = []
+    for current, _, names in os.walk(folder):
+        for name in names:
+            path = os.path.join(current, name)
+            if os.path.isfile(path) and not os.path.islink(path):
+                paths.append(path)
+
+    workers = workers or min(32, (os.cpu_count() or 1) + 4)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        digests = list(executor.map(file_digest, paths))
+
+    root = str(folder)
+    return {
+        os.path.relpath(path, root).replace(os.sep, '/'): [os.path.getsize(path), digest]
+        for path, digest in zip(paths, digests)
+    }
+
+def archive_digests(archive: Path, compression: str = 'none') -> dict:
+    """
+    Hashes every regular file of a backup archive, reading it once as a stream.
+
+    Args:
+        archive (Path): The archive saved by `stream_tar`.
+        compression (str, optional): The compression of the archive ('none', 'gzip' or 'zstd'). Defaults to 'none'.
+
+    Raises:
+        RuntimeError: If the archive uses zstd and the `zstandard` package is not installed.
+
+    Returns:
+        dict: The digest and size of every file ({path: [size, sha256]}), with the paths of `local_digests`.
+    """
+    digests = {}
+    mode = 'r|gz' if compression == 'gzip' else 'r|'
+
+    with open(archive, 'rb') as stream:
+        source = zstandard_module().ZstdDecompressor().stream_reader(stream) if compression == 'zstd' else stream
+        with tarfile.open(fileobj=source, mode=mode) as members:
+            for member in members:
+                if not member.isfile():
+                    continue
+                digest = hashlib.sha256()
+                with members.extractfile(member) as file:
+                    for chunk in iter(lambda: file.read(1024 * 1024), b''):
+                        digest.update(chunk)
+                path = os.path.normpath(member.name).replace(os.sep, '/')
+                digests[path] = [member.size, digest.hexdigest()]
+
+    return digests
+
+def compare_digests(remote: dict, local: dict) -> tuple:
+    """
+    Compares the checksums of the pod with those of a local backup.
+
+    Args:
+        remote (dict): The remote manifest with hashes ({path: [size, mtime, sha256]}).
+        local (dict): The local digests ({path: [size, sha256]}), from a folder or an archive.
+
+    Returns:
+        tuple: The sorted paths missing locally, the extra local paths and the mismatched paths.
+    """
+    missing = sorted(path for path in remote if path not in local)
+    extra = sorted(path for path in local if path not in remote)
+    mismatched = sorted(path for path in remote if path in local and local[path][1] != remote[path][2])
+    return missing, extra, mismatched
+
+def staging_path(backup_path: Path) -> Path:
+    """Returns the folder a new copy of a backup is written to before being swapped into place."""
+    return backup_path.parent / f".{backup_path.name}.staging"
+
+def partial_path(backup_path: Path) -> Path:
+    """Returns the folder a full resumable backup is written to, kept across interruptions until it is swapped into place."""
+    return backup_path.parent / f".{backup_path.name}.partial"
+
+def retired_path(backup_path: Path) -> Path:
+    """Returns a unique name for a copy of a backup that is waiting to be deleted."""
+    return backup_path.parent / f".{backup_path.name}.old-{time.time_ns()}"
+
+def stale_paths(backup_path: Path) -> list:
+    """
+    Returns the staging and retired copies left next to a backup folder by interrupted runs.
+
+    Only the exact names of `staging_path` and `retired_path` are matched, so the partial copy of a
+    resumable backup, the journal and manifest files, and the copies of other backups whose folder
+    name starts with the same text (e.g. `app` and `app.v2`) are never taken for them.
+
+    Args:
+        backup_path (Path): The backup folder.
+
+    Returns:
+        list: The stale folders.
+    """
+    pattern = re.compile(rf"\.{re.escape(backup_path.name)}\.(staging|old-\d+)")
+    if not backup_path.parent.is_dir():
+        return []
+    return [path for path in backup_path.parent.iterdir() if pattern.fullmatch(path.name) and path.is_dir()]
+
+def swap_into_place(staging: Path, backup_path: Path) -> Path:
+    """
+    Replaces a backup folder with its staged copy.
+
+    The previous folder is renamed aside and the staged copy renamed into place: two renames in
+    the same parent folder, so the backup is never missing or half written for longer than that.
+
+    Args:
+        staging (Path): The completed staged copy.
+        backup_path (Path): The backup folder.
+
+    Returns:
+        Path: The retired previous copy to delete, or None if there was none.
+    """
+    retired = None
+    if backup_path.exists():
+        retired = retired_path(backup_path)
+        os.replace(backup_path, retired)
+    os.replace(staging, backup_path)
+    return retired
+
+def remove_tree_async(path: Path, label: str) -> threading.Thread:
+    """
+    Deletes a folder tree in a background thread and reports how long it took.
+
+    Args:
+        path (Path): The folder to delete.
+        label (str): The description used in the timing message.
+
+    Returns:
+        threading.Thread: The started thread.
+    """
+    def remove():
+        start = time.monotonic()
+        shutil.rmtree(path, ignore_errors=True)
+        Console.info(message=f"{label} removed in {time.monotonic() - start:.2f}s (background).", timestamp=True)
+
+    thread = threading.Thread(target=remove, name=f"cleanup-{path.name}")
+    thread.start()
+    return thread
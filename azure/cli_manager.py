@@ -7,18 +7,71 @@
 import re
 import os
 import json
+import time
 import shutil
+import functools
 import subprocess
 from pathlib import Path
-from lib.output import Console
-from lib.helpers import sanitize_folder_name
+from urllib.parse import urlencode
+from lib.cache import FileCache, ListingCache, RecentChoices
+from azure.profile import AzureProfile
+from lib.output import Console, LiveTable
+from lib.tracing import traced
+from azure.watch import iter_watch_events
+from lib.helpers import sanitize_folder_name, format_bytes
+from azure.runner import runner, CommandStats
+from azure.kubeconfig import aks_kubeconfig_path, credential_valid
+from azure.inventory import cluster_label, kubeconfig_path, kubectl_command, summarize_cluster, problems_cell
+from azure.resources import Namespace, Deployment, Pod, parse_namespaces, parse_deployments, parse_deployment, parse_pod, parse_pods, record_values, RECORD_TYPES
+
+# The backup, snapshot and prefetch modules (tarfile, hashlib, concurrent.futures...) are imported by
+# the methods that use them, so runs that only list, select or open a console start faster.
+
+# Tools validated before their first command: label, version command, version parser and install guide
+TOOLS = {
+    "az": (
+        "Azure CLI", ["az", "version"],
+        lambda output: json.loads(output).get("azure-cli", "Unknown"),
+        "https://learn.microsoft.com/en-us/cli/azure/install-azure-cli"
+    ),
+    "kubectl": (
+        "kubectl", ["kubectl", "version", "--client", "--output=json"],
+        lambda output: json.loads(output)["clientVersion"]["gitVersion"],
+        "https://kubernetes.io/docs/tasks/tools/"
+    ),
+}
 
 class Azure:
 
-    def __init__(self):
+    def __init__(self, recheck_tools: bool = False, prefetch: bool = False,
+                 running_pods_only: bool = False, namespace_pods: bool = False,
+                 chunk_size: int = None, column_width: int = 60, cache_ttl: int = 0,
+                 command_timeout: float = 60, command_retries: int = 2, command_stats: bool = False,
+                 banner: bool = True):
         """
         Initializes the command interpreter service for connecting to Azure CLI.
 
+        Args:
+            recheck_tools (bool, optional): If True, ignores the cached tool detection and runs
+                                            `az version` / `kubectl version` again. Defaults to False.
+            prefetch (bool, optional): If True, deployments and pods are fetched in the background
+                                       while the user answers the selection prompts. Defaults to False.
+            running_pods_only (bool, optional): If True, only pods in the Running phase are listed. Defaults to False.
+            namespace_pods (bool, optional): If True, every pod of the namespace is listed instead of only
+                                             the pods of the selected deployment. Defaults to False.
+            chunk_size (int, optional): If set, listings are fetched in pages of this size and rendered
+                                        progressively. Defaults to None (single request).
+            column_width (int, optional): Maximum column width of the listing tables. Defaults to 60.
+            cache_ttl (int, optional): Seconds a cached listing is reused without contacting the cluster.
+                                       Once expired it is listed again. Defaults to 0 (disabled).
+            command_timeout (float, optional): Seconds allowed to each `az` / `kubectl` call that is not
+                                               interactive or a transfer. Defaults to 60.
+            command_retries (int, optional): Retries of a call failing with a transient API server or
+                                             network error. Defaults to 2.
+            command_stats (bool, optional): If True, the time, exit codes and output size of every command
+                                            are printed when the run ends. Defaults to False.
+            banner (bool, optional): If False, the ASCII art banner is not printed. Defaults to True.
+
         Prerequisites:
         - Azure CLI: Ensure Azure CLI is installed. Follow the guide here:
         https://learn.microsoft.com/en-us/cli/azure/install-azure-cli
@@ -26,26 +79,24 @@ class Azure:
         https://kubernetes.io/docs/tasks/tools/
 
         The initialization process will:
-        1. Validate that the required tools are installed and accessible.
-        2. Display the detected versions of Azure CLI and kubectl.
+        1. Display the banner, unless disabled.
+        2. Register the validation of Azure CLI and kubectl, run before the first command of each tool.
         3. Prepare the object for managing Azure CLI connections and Kubernetes namespaces.
         """
 
-        #read Art:
-        current_path = os.path.dirname(__file__)
-        art_path = os.path.join(current_path, '..', 'lib', 'art.ascii')
+        # The banner is text only, it would break the structured output
+        if banner and not Console.structured():
+            art_path = os.path.join(os.path.dirname(__file__), '..', 'lib', 'art.ascii')
+            with(open(art_path, 'r')) as art:
+                print(art.read())
 
-        with(open(art_path, 'r')) as art:
-            print(art.read())
+        # Apply the timeout and retry policy of every command
+        runner.configure(timeout=command_timeout, retries=command_retries)
+        self.command_stats = command_stats
 
-        # Validate required tools
-        tools = self.check_required_tools()
-
-        # Display tool versions
-        Console.info(
-            message=f"Tools detected: Azure CLI {tools['Azure CLI']} | kubectl {tools['kubectl']}",
-            timestamp=True
-        )
+        # Validate each required tool just before its first command
+        for program in TOOLS:
+            runner.require(program, functools.partial(self.check_tool, program, recheck_tools))
 
         # Initialize connection data and namespaces
         self.data_connection = None
@@ -53,63 +104,541 @@ class Azure:
         self.deployments = []
         self.pods = []
 
-    def check_required_tools(self):
+        # Pod listing filters and the label selectors resolved per deployment
+        self.running_pods_only = running_pods_only
+        self.namespace_pods = namespace_pods
+        self.selectors = {}
+
+        # Paginated listing settings
+        self.chunk_size = chunk_size
+        self.column_width = column_width
+
+        # Persistent listing cache and the kinds served from it in this run
+        self.cache_ttl = cache_ttl
+        self.cached_listings = set()
+
+        # Background deletions of replaced backups
+        self.cleanups = []
+
+        # Speculative listing engine and recently used selections
+        self.prefetcher = None
+        if prefetch:
+            from azure.prefetch import Prefetcher
+            self.prefetcher = Prefetcher()
+        self.recent = RecentChoices()
+
+    def close(self):
+        """
+        Releases background resources, cancelling any pending prefetch and waiting for backup cleanups.
+        The command statistics are printed last when enabled.
+        """
+        if self.prefetcher:
+            self.prefetcher.shutdown()
+
+        # Let the deletion of replaced backups finish
+        for thread in self.cleanups:
+            thread.join()
+
+        if self.command_stats:
+            self.printCommandStats()
+
+    def printCommandStats(self):
         """
-        Validates that the required dependencies (Azure CLI and kubectl) are installed and accessible.
-        Raises an error with guidance links if any dependency is missing.
+        Prints the calls, failures, retries, time and output size of every command, the slowest first.
+        """
+        summary = runner.summary()
+        if not summary:
+            return
+
+        Console.newLine()
+        Console.textSuccess("Command statistics:")
+        Console.table(headers=CommandStats.headers, rows=[stats.row() for stats in summary], name='command')
+        Console.newLine()
+
+    def fetch(self, command: list, refresh: bool = False) -> str:
+        """
+        Executes a listing command, serving it from the prefetch cache when possible.
+
+        Args:
+            command (list): The command to execute.
+            refresh (bool, optional): If True, the command is always run, even if it was prefetched. Defaults to False.
+
+        Raises:
+            subprocess.CalledProcessError: If the command fails.
 
         Returns:
-            dict: A dictionary containing the status and version of the tools.
+            str: The standard output of the command.
         """
-        tools_status = {}
+        if self.prefetcher and not refresh:
+            stdout = self.prefetcher.take(command)
+            if stdout is not None:
+                return stdout
 
-        # Check Azure CLI
-        try:
-            command = "az version"
-            result = subprocess.run(command, shell=True, check=True, capture_output=True, text=True)
-            az_version = json.loads(result.stdout).get("azure-cli", "Unknown")
-            tools_status["Azure CLI"] = f"Installed (Version: {az_version})"
-        except subprocess.CalledProcessError:
-            raise RuntimeError(
-                "Azure CLI is not installed. Please install it from: "
-                "https://learn.microsoft.com/en-us/cli/azure/install-azure-cli"
+        return runner.run(command).stdout
+
+    def prefetchChoices(self, choices: list, recent: list, command):
+        """
+        Schedules the listing that follows a prompt for the default choice and the recently used ones.
+
+        Nothing is scheduled when listings are paginated (`chunk_size`): they are streamed page by page
+        with their own commands, so a prefetched output would never be served.
+
+        Args:
+            choices (list): The options offered to the user. The first one is the default.
+            recent (list): The recently selected values, most recent first.
+            command (callable): Builds the listing command for a given choice.
+        """
+        if not self.prefetcher or self.chunk_size or not choices:
+            return
+
+        candidates = [choices[0]] + [value for value in recent if value in choices]
+        for value in list(dict.fromkeys(candidates))[:self.prefetcher.max_entries // 2]:
+            self.prefetcher.schedule(command(value))
+
+    def listingPath(self, kind: str, namespace: str = None) -> str:
+        """
+        Returns the API path of a resource collection.
+
+        Args:
+            kind (str): The resource kind ('namespaces', 'deployments' or 'pods').
+            namespace (str, optional): The namespace of the collection.
+
+        Returns:
+            str: The API path (e.g. '/api/v1/namespaces/default/pods').
+        """
+        if kind == 'namespaces':
+            return "/api/v1/namespaces"
+        if kind == 'deployments':
+            return f"/apis/apps/v1/namespaces/{namespace}/deployments"
+        return f"/api/v1/namespaces/{namespace}/{kind}"
+
+    def listingCommand(self, kind: str, namespace: str = None, query: dict = None) -> list:
+        """
+        Builds the command that reads a resource collection as JSON from the API server.
+
+        The raw API response is used instead of `kubectl get -o json` because it accepts the
+        `limit` and `continue` parameters of the paged listings.
+
+        Args:
+            kind (str): The resource kind.
+            namespace (str, optional): The namespace of the collection.
+            query (dict, optional): Query parameters such as selectors or `limit`.
+
+        Returns:
+            list: The kubectl command.
+        """
+        path = self.listingPath(kind, namespace)
+        return ["kubectl", "get", "--raw", f"{path}?{urlencode(query)}" if query else path]
+
+    def namespacesCommand(self) -> list:
+        """Builds the command that lists the namespaces as JSON."""
+        return self.listingCommand('namespaces')
+
+    def deploymentsCommand(self, namespace: str) -> list:
+        """Builds the command that lists the deployments of a namespace as JSON."""
+        return self.listingCommand('deployments', namespace)
+
+    @traced
+    def deploymentSelector(self, namespace: str, deployment: str) -> str:
+        """
+        Resolves the label selector of a deployment, fetching it at most once per deployment.
+
+        Args:
+            namespace (str): The namespace of the deployment.
+            deployment (str): The deployment name.
+
+        Raises:
+            RuntimeError: If the deployment cannot be retrieved.
+
+        Returns:
+            str: The selector in `kubectl -l` syntax, or an empty string if it has none.
+        """
+        key = (namespace, deployment)
+        if key not in self.selectors:
+            # Reuse the listed deployments when they belong to the same namespace
+            record = None
+            if namespace == getattr(self, 'namespace_selected', None):
+                record = next((item for item in self.deployments or [] if item.name == deployment), None)
+
+            if record is None:
+                try:
+                    stdout = self.fetch(["kubectl", "get", "deployment", deployment, "-n", namespace, "-o", "json"])
+                    record = parse_deployment(json.loads(stdout))
+                except subprocess.CalledProcessError as e:
+                    error_message = f"Failed to retrieve deployment [{deployment}] in namespace [{namespace}]. Error: {e.stderr.strip()}"
+                    raise RuntimeError(error_message) from e
+                except ValueError as e:
+                    raise RuntimeError(f"Invalid JSON response while retrieving deployment [{deployment}].") from e
+
+            self.selectors[key] = record.selector
+
+        return self.selectors[key]
+
+    def podsQuery(self, namespace: str, deployment: str = None) -> dict:
+        """
+        Builds the server-side filters used to list the pods of a deployment.
+
+        Only the pods matching the deployment's label selector are requested, unless
+        `namespace_pods` is enabled or no deployment is given.
+
+        Args:
+            namespace (str): The namespace of the pods.
+            deployment (str, optional): The deployment the pods belong to.
+
+        Returns:
+            dict: The `labelSelector` and `fieldSelector` filters that apply.
+        """
+        query = {}
+
+        if deployment and not self.namespace_pods:
+            selector = self.deploymentSelector(namespace, deployment)
+            if selector:
+                query['labelSelector'] = selector
+
+        if self.running_pods_only:
+            query['fieldSelector'] = "status.phase=Running"
+
+        return query
+
+    def podsCommand(self, namespace: str, deployment: str = None) -> list:
+        """
+        Builds the command that lists the pods of a deployment as JSON.
+
+        Args:
+            namespace (str): The namespace of the pods.
+            deployment (str, optional): The deployment the pods belong to.
+
+        Returns:
+            list: The kubectl command.
+        """
+        return self.listingCommand('pods', namespace, self.podsQuery(namespace, deployment))
+
+    def currentContext(self) -> str:
+        """
+        Reads the current kubeconfig context without running kubectl.
+
+        Returns:
+            str: The name of the current context, or an empty string if it cannot be determined.
+        """
+        paths = os.environ.get('KUBECONFIG') or str(Path.home() / '.kube' / 'config')
+        for path in paths.split(os.pathsep):
+            try:
+                with open(path, 'r', encoding='utf-8') as file:
+                    match = re.search(r'^current-context:\s*["\']?([^"\'\s]+)', file.read(), re.MULTILINE)
+            except OSError:
+                continue
+            if match:
+                return match.group(1)
+        return ''
+
+    @traced
+    def cachedListing(self, cache: ListingCache, record_class) -> tuple:
+        """
+        Returns the records of a cached listing younger than the TTL.
+
+        A listing is either reused as it is or fetched again: the collection `resourceVersion`
+        changes with every write in the cluster, so comparing it would almost never reuse a listing.
+
+        Args:
+            cache (ListingCache): The cache entry of the listing.
+            record_class (type): The record type to rebuild.
+
+        Returns:
+            tuple: The cached records and their age in seconds, or None if the cache is missing or expired.
+        """
+        entry = cache.read()
+        if not entry:
+            return None
+
+        age = time.time() - entry.get('fetched', 0)
+        if not 0 <= age <= self.cache_ttl:
+            return None
+
+        return [record_class(*values) for values in entry['rows']], age
+
+    @traced
+    def loadListing(self, kind: str, parser, record_class, namespace: str = None, query: dict = None,
+                    title: str = None, refresh: bool = False) -> list:
+        """
+        Retrieves a resource collection from the listing cache, page by page, or in a single request.
+
+        Args:
+            kind (str): The resource kind ('namespaces', 'deployments' or 'pods').
+            parser (callable): Parses a decoded listing into records.
+            record_class (type): The record type of the listing.
+            namespace (str, optional): The namespace of the collection.
+            query (dict, optional): Selectors applied on the server.
+            title (str, optional): If provided, the records are printed in a table under this title.
+            refresh (bool, optional): If True, the cache and the prefetched outputs are bypassed. Defaults to False.
+
+        Raises:
+            subprocess.CalledProcessError: If the listing command fails.
+            ValueError: If the response is not valid JSON.
+
+        Returns:
+            list: The records of the collection.
+        """
+        query = query or {}
+        cache = ListingCache(self.currentContext(), kind, namespace, query) if self.cache_ttl else None
+        cached = None
+
+        # Serve the listing from the local cache when possible
+        if cache and not refresh:
+            cached = self.cachedListing(cache, record_class)
+
+        if cached is not None:
+            records, age = cached
+            self.cached_listings.add(kind)
+
+            # Cached tables are labelled, since they may miss the latest changes of the cluster
+            if title:
+                title = f"{title.rstrip(':')} (cached {age:.0f}s ago, --refresh to list again):"
+        else:
+            self.cached_listings.discard(kind)
+
+            if self.chunk_size:
+                records = self.streamListing(
+                    path=self.listingPath(kind, namespace),
+                    parser=parser,
+                    headers=record_class.headers,
+                    query=query,
+                    title=title,
+                    namespace=namespace,
+                    name=RECORD_TYPES[kind]
+                )
+                title = None
+            else:
+                records = parser(json.loads(self.fetch(self.listingCommand(kind, namespace, query), refresh)))
+
+            # Keep the listing for the next runs
+            if cache:
+                cache.store([record_values(record) for record in records])
+
+        # Display the records unless they were already rendered page by page
+        if title and records:
+            Console.newLine()
+            Console.textSuccess(title)
+            Console.table(
+                headers=record_class.headers,
+                rows=self.tableRows(records, namespace),
+                max_width=self.column_width,
+                name=RECORD_TYPES[kind]
             )
-        except json.JSONDecodeError:
-            raise RuntimeError("Failed to parse Azure CLI version information.")
+            Console.newLine()
+
+        return records
+
+    def tableRows(self, records: list, namespace: str = None):
+        """
+        Returns the table rows of listed records, or their typed values in the structured output modes.
+
+        Args:
+            records (list): The Namespace, Deployment or Pod records.
+            namespace (str, optional): The namespace added to the structured values. Defaults to None.
+
+        Returns:
+            iterator: The rows.
+        """
+        if Console.structured():
+            extra = {"namespace": namespace} if namespace else {}
+            return (dict(record.data(), **extra) for record in records)
+        return (record.row() for record in records)
+
+    @traced
+    def streamListing(self, path: str, parser, headers: list, query: dict = None, title: str = None,
+                      namespace: str = None, name: str = 'row') -> tuple:
+        """
+        Lists a collection page by page through the API server using `limit` and `continue`.
+
+        Each page is parsed as soon as it arrives and, when a title is given, its rows are
+        rendered immediately, so the first rows show up before the whole list is fetched.
+
+        Args:
+            path (str): The API path of the collection (e.g. '/api/v1/namespaces').
+            parser (callable): Parses a decoded page into records.
+            headers (list): The table headers.
+            query (dict, optional): Additional query parameters such as selectors.
+            title (str, optional): If provided, the table is printed under this title.
+            namespace (str, optional): The namespace of the collection, added to the structured records.
+            name (str, optional): The record type of the rows in the structured output modes. Defaults to 'row'.
+
+        Raises:
+            subprocess.CalledProcessError: If a page cannot be retrieved.
+            ValueError: If a page is not valid JSON.
+
+        Returns:
+            list: The records of every page.
+        """
+        records = []
+
+        def pages():
+            token = None
+            while True:
+                params = dict(query or {}, limit=self.chunk_size)
+                if token:
+                    params['continue'] = token
+
+                command = ["kubectl", "get", "--raw", f"{path}?{urlencode(params)}"]
+                document = json.loads(runner.run(command).stdout)
+
+                page = parser(document)
+                records.extend(page)
+                yield list(self.tableRows(page, namespace))
+
+                # The last page has no continuation token
+                token = document.get('metadata', {}).get('continue')
+                if not token:
+                    break
+
+        if title:
+            Console.newLine()
+            Console.textSuccess(title)
+            Console.tableStream(headers=headers, pages=pages(), max_width=self.column_width, name=name)
+            Console.newLine()
+        else:
+            for _ in pages():
+                pass
+
+        return records
+
+    def tool_fingerprint(self, binary: str):
+        """
+        Builds a fingerprint of an installed binary from its resolved path, size and modification time.
 
-        # Check kubectl
+        Args:
+            binary (str): The executable name (e.g. 'az' or 'kubectl').
+
+        Returns:
+            dict: The fingerprint of the binary, or None if it is not found on the PATH.
+        """
+        location = shutil.which(binary)
+        if not location:
+            return None
+
+        # Resolve symlinks so an upgrade that only swaps the link target is detected
+        resolved = Path(location).resolve()
         try:
-            command = "kubectl version --client --output=json"
-            result = subprocess.run(command, shell=True, check=True, capture_output=True, text=True)
-            kubectl_version = json.loads(result.stdout)["clientVersion"]["gitVersion"]
-            tools_status["kubectl"] = f"Installed (Version: {kubectl_version})"
+            stat = resolved.stat()
+        except OSError:
+            return None
+
+        return {"path": str(resolved), "size": stat.st_size, "mtime": stat.st_mtime_ns}
+
+    @traced
+    def check_tool(self, program: str, recheck: bool = False) -> str:
+        """
+        Validates that a required tool (Azure CLI or kubectl) is installed and accessible.
+        Raises an error with guidance links if it is missing.
+
+        It runs just before the first call of the tool (see `CommandRunner.require`), so a run that
+        never needs a tool never checks it. The detected version is cached in `.cache/tools.json`,
+        keyed by the fingerprint of the binary, so runs with an unchanged binary skip the version
+        command. The cache invalidates itself when the binary is upgraded, moved or replaced.
+
+        Args:
+            program (str): The tool executable, 'az' or 'kubectl'.
+            recheck (bool, optional): If True, ignores the cache and detects the tool again. Defaults to False.
+
+        Raises:
+            RuntimeError: If the tool is not installed or its version cannot be read.
+
+        Returns:
+            str: The detected version.
+        """
+        label, command, parse, guide = TOOLS[program]
+        cache = FileCache('tools')
+        fingerprint = self.tool_fingerprint(program)
+        cached = cache.read()
+        entry = cached.get(program) or {}
+
+        # Reuse the previous detection while the binary is unchanged
+        if not recheck and fingerprint and entry.get('fingerprint') == fingerprint and entry.get('version'):
+            version = entry['version']
+        else:
+            try:
+                version = parse(runner.run(command).stdout)
+            except subprocess.CalledProcessError:
+                raise RuntimeError(f"{label} is not installed. Please install it from: {guide}")
+            except (ValueError, KeyError, TypeError):
+                raise RuntimeError(f"Failed to parse {label} version information.")
+
+            # Store the detection for the next runs, next to the other tools
+            if fingerprint:
+                try:
+                    tools = {name: value for name, value in cached.items() if name in TOOLS}
+                    tools[program] = {"fingerprint": fingerprint, "version": version}
+                    cache.write(tools)
+                except OSError:
+                    pass
+
+        Console.info(message=f"Tool detected: {label} {version}", timestamp=True)
+        return version
+
+    @traced
+    def find_session(self, tenant_id=None, subscription_id=None):
+        """
+        Looks for an existing Azure CLI session that can be reused instead of logging in again.
+
+        The local Azure CLI profile is checked for an enabled account matching the tenant and
+        subscription. If the token cache holds a valid access token for it, the session is reused
+        without running any command. Otherwise a silent token refresh is attempted once.
+
+        Args:
+            tenant_id (str, optional): The expected tenant ID.
+            subscription_id (str, optional): The expected subscription ID.
+
+        Returns:
+            dict: The cached account record, or None if the session is missing or stale.
+        """
+        profile = AzureProfile()
+        account = profile.find_account(tenant_id=tenant_id, subscription_id=subscription_id)
+        if not account:
+            return None
+
+        # A valid access token in the local cache is enough
+        if profile.has_valid_token(account):
+            return account
+
+        # Otherwise let the Azure CLI refresh the token silently with its refresh token
+        try:
+            runner.run(["az", "account", "get-access-token", "--subscription", account['id'], "--output", "none"])
         except subprocess.CalledProcessError:
-            raise RuntimeError(
-                "kubectl is not installed. Please install it from: "
-                "https://kubernetes.io/docs/tasks/tools/"
-            )
-        except json.JSONDecodeError:
-            raise RuntimeError("Failed to parse kubectl version information.")
+            return None
 
-        return tools_status
+        return account
 
-    def login(self, tenant_id=None):
+    @traced
+    def login(self, tenant_id=None, subscription_id=None, reuse_session: bool = True):
         """
         Logs into Azure.
 
+        If `reuse_session` is enabled and the local Azure CLI profile already holds a valid session
+        for the tenant and subscription, that session is reused and `az login` is not executed.
+
         Args:
             tenant_id (str, optional): The tenant ID for login. If not provided, performs a generic login.
+            subscription_id (str, optional): The subscription the reused session must have access to.
+            reuse_session (bool, optional): If True, reuses a valid existing session. Defaults to True.
 
         Raises:
             ValueError: If login is unsuccessful or the connection state is not enabled.
             RuntimeError: If an error occurs while executing the command.
         """
+        # Reuse the current session when it is still valid
+        if reuse_session:
+            session = self.find_session(tenant_id=tenant_id, subscription_id=subscription_id)
+            if session:
+                tenant_message = f", Tenant: {session.get('name')}" if tenant_id else ""
+                Console.info(message=f"Reusing existing Azure session{tenant_message}.", timestamp=True)
+                self.data_connection = session
+                return
+
         try:
             # Build the command based on the presence of tenant_id
-            command = f"az login --tenant {tenant_id}" if tenant_id else "az login"
+            command = ["az", "login", "--tenant", tenant_id] if tenant_id else ["az", "login"]
 
-            # Execute the command
-            result = subprocess.run(command, shell=True, check=True, capture_output=True, text=True)
+            # Execute the command, without a timeout or retries since it waits for the user
+            result = runner.run(command, timeout=None, retries=0)
 
             # Parse the response as JSON
             connect_data = json.loads(result.stdout)[0]
@@ -152,6 +681,7 @@ class Azure:
 
         return self.data_connection
 
+    @traced
     def setSubscription(self, subscription_id):
         """
         Set the Azure subscription for the current context.
@@ -165,10 +695,18 @@ class Azure:
         Raises:
             ValueError: If the subscription could not be set due to an error.
         """
+        # Skip the command when the reused session already points to the subscription
+        if self.data_connection and self.data_connection.get('isDefault') \
+                and subscription_id in (self.data_connection.get('id'), self.data_connection.get('name')):
+            Console.info(
+                message=f"Subscription [{subscription_id}] is already active in the current context.",
+                timestamp=True
+            )
+            return
+
         try:
             # Execute the command to set the subscription
-            command = f"az account set --subscription {subscription_id}"
-            subprocess.run(command, shell=True, check=True, capture_output=True, text=True)
+            runner.run(["az", "account", "set", "--subscription", subscription_id])
 
             # Log success message
             Console.info(
@@ -184,7 +722,87 @@ class Azure:
             error_message = f"An unexpected error occurred while setting subscription [{subscription_id}]."
             raise ValueError(error_message) from e
 
-    def listNamespaces(self, echo: bool = True):
+    @traced
+    def fetchCredentials(self, resource_group: str, name: str, subscription_id: str = None,
+                         overwrite_existing: bool = True, refresh: bool = False, timeout: int = 60) -> tuple:
+        """
+        Gets the credentials of an AKS cluster into its own kubeconfig file.
+
+        The file (`.cache/kubeconfig/<resource-group>_<name>`) is reused without running any command while
+        its current context exists and its credential is valid: an installed exec plugin such as
+        kubelogin, an unexpired client certificate or cached token. Otherwise `az aks get-credentials`
+        fetches it again, with an explicit `--subscription` so the active subscription is not needed.
+
+        Args:
+            resource_group (str): The resource group of the cluster.
+            name (str): The name of the cluster.
+            subscription_id (str, optional): The subscription of the cluster. Defaults to the active one.
+            overwrite_existing (bool, optional): If True, entries of the same name are replaced. Defaults to True.
+            refresh (bool, optional): If True, the credentials are fetched even if still valid. Defaults to False.
+            timeout (int, optional): Seconds allowed to fetch the credentials. Defaults to 60.
+
+        Raises:
+            RuntimeError: If the credentials cannot be fetched.
+
+        Returns:
+            tuple: The kubeconfig file and whether it was fetched (False when reused).
+        """
+        path = aks_kubeconfig_path(resource_group, name)
+        if not refresh and credential_valid(path):
+            return path, False
+
+        path.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
+        command = [
+            "az", "aks", "get-credentials", "--resource-group", resource_group, "--name", name,
+            "--file", str(path), "--only-show-errors"
+        ]
+        if overwrite_existing:
+            command.append("--overwrite-existing")
+        if subscription_id:
+            command += ["--subscription", subscription_id]
+
+        try:
+            runner.run(command, timeout=timeout)
+        except subprocess.CalledProcessError as e:
+            raise RuntimeError(f"Failed to get the credentials of cluster [{name}]. Error: {e.stderr.strip()}") from e
+
+        return path, True
+
+    @traced
+    def getCredentials(self, resource_group: str, name: str, subscription_id: str = None,
+                       overwrite_existing: bool = True, refresh: bool = False):
+        """
+        Gets the credentials of the configured AKS cluster and uses them for every kubectl command.
+
+        The dedicated kubeconfig is exported as `KUBECONFIG`, so the user's `~/.kube/config` is neither
+        read nor modified. A normal run reuses the cached credentials without any `az` call.
+
+        Args:
+            resource_group (str): The resource group of the cluster.
+            name (str): The name of the cluster.
+            subscription_id (str, optional): The subscription of the cluster. Defaults to the active one.
+            overwrite_existing (bool, optional): If True, entries of the same name are replaced. Defaults to True.
+            refresh (bool, optional): If True, the credentials are fetched even if still valid. Defaults to False.
+
+        Raises:
+            RuntimeError: If the credentials cannot be fetched.
+        """
+        path, fetched = self.fetchCredentials(
+            resource_group=resource_group,
+            name=name,
+            subscription_id=subscription_id,
+            overwrite_existing=overwrite_existing if overwrite_existing is not None else True,
+            refresh=refresh
+        )
+        os.environ['KUBECONFIG'] = str(path)
+
+        Console.info(
+            message=f"{'Fetched' if fetched else 'Reusing cached'} credentials of cluster [{name}].",
+            timestamp=True
+        )
+
+    @traced
+    def listNamespaces(self, echo: bool = True, refresh: bool = False):
         """
         List available Kubernetes namespaces.
 
@@ -193,6 +811,7 @@ class Azure:
 
         Args:
             echo (bool, optional): If True, the namespaces are printed to the console. Defaults to True.
+            refresh (bool, optional): If True, the listing cache is bypassed. Defaults to False.
 
         Raises:
             ValueError: If no namespaces are found or the command fails.
@@ -201,37 +820,17 @@ class Azure:
             None
         """
         try:
-            # Execute the command to retrieve namespaces
-            command = "kubectl get namespaces"
-            result = subprocess.run(command, shell=True, check=True, capture_output=True, text=True)
+            # Retrieve the namespaces and display them in the console if echo is True
+            all_namespaces = self.loadListing(
+                kind='namespaces',
+                parser=parse_namespaces,
+                record_class=Namespace,
+                title="Available Kubernetes namespaces:" if echo else None,
+                refresh=refresh
+            )
 
             # Check if valid data is returned
-            if 'NAME' in result.stdout and 'STATUS' in result.stdout and 'AGE' in result.stdout:
-                # Prepare namespace data
-                raw_data = result.stdout.split()[3:]  # Exclude headers (NAME, STATUS, AGE)
-                all_namespaces = []
-                namespace_data = []
-
-                # Process data into structured format
-                for index, value in enumerate(raw_data, start=1):
-                    if index % 3 == 0:  # Age column
-                        value = value.replace('y', ' Years ').replace('d', ' Days ').replace('h', ' Hours ').replace('m', ' Minutes ')
-                        namespace_data.append(value.strip())
-                        all_namespaces.append(namespace_data)
-                        namespace_data = []
-                    else:  # Name or Status column
-                        namespace_data.append(value)
-
-                # Display the namespaces in the console if echo is True
-                if echo:
-                    Console.newLine()
-                    Console.textSuccess("Available Kubernetes namespaces:")
-                    Console.table(
-                        headers=["Name", "Status", "Age"],
-                        rows=all_namespaces
-                    )
-                    Console.newLine()
-
+            if all_namespaces:
                 # Store namespaces data
                 self.namespaces = all_namespaces
                 return
@@ -243,6 +842,10 @@ class Azure:
             error_message = f"Failed to retrieve namespaces. Error: {e.stderr.strip()}"
             raise RuntimeError(error_message) from e
 
+        except ValueError as e:
+            raise RuntimeError("Invalid JSON response while retrieving namespaces.") from e
+
+    @traced
     def selectNamespace(self, namespace:str=None):
         """
         Prompt the user to select a Kubernetes namespace if none is configured.
@@ -264,22 +867,33 @@ class Azure:
         # Extract the list of namespace names
         if not self.namespaces:
             self.listNamespaces(echo=False)
-        available_namespaces = [ns[0] for ns in self.namespaces]
+        available_namespaces = [ns.name for ns in self.namespaces]
 
         # Prompt the user if no namespace is provided
         if namespace is None:
-            namespace = Console.choice(
+            recent = self.recent.get('namespaces')
+            self.prefetchChoices(available_namespaces, recent, self.deploymentsCommand)
+            namespace = Console.select(
                 question="Which namespace would you like to use?",
-                choices=available_namespaces
+                choices=available_namespaces,
+                recent=recent
             )
 
+        # A configured namespace missing from a cached listing is checked against a live listing
+        if namespace not in available_namespaces and 'namespaces' in self.cached_listings:
+            self.listNamespaces(echo=False, refresh=True)
+            available_namespaces = [ns.name for ns in self.namespaces]
+
         # Validate the namespace against the available options
         if namespace not in available_namespaces:
             error_message = f"The namespace [{namespace}] is not among the available options."
             raise ValueError(error_message)
 
-        # Store the selected namespace
+        # Store the selected namespace and drop prefetches for the other choices
         self.namespace_selected = namespace
+        self.recent.add('namespaces', namespace)
+        if self.prefetcher:
+            self.prefetcher.cancel(keep=[self.deploymentsCommand(namespace)])
 
         # Display confirmation of the selected namespace
         Console.info(
@@ -287,7 +901,8 @@ class Azure:
             timestamp=True
         )
 
-    def listDeployments(self, echo:bool = True):
+    @traced
+    def listDeployments(self, echo:bool = True, refresh: bool = False):
         """
         List deployments in the selected Kubernetes namespace.
 
@@ -296,6 +911,7 @@ class Azure:
 
         Args:
             echo (bool, optional): If True, the deployments are printed to the console. Defaults to True.
+            refresh (bool, optional): If True, the listing cache is bypassed. Defaults to False.
 
         Raises:
             RuntimeError: If no deployments are found or the `kubectl` command fails.
@@ -304,33 +920,18 @@ class Azure:
             None
         """
         try:
-            # Execute the command to list deployments in the selected namespace
-            command = f"kubectl get deployments -n {self.namespace_selected}"
-            result = subprocess.run(command, shell=True, check=True, capture_output=True, text=True)
+            # List the deployments in the selected namespace and display them if echo is True
+            all_deployments = self.loadListing(
+                kind='deployments',
+                parser=parse_deployments,
+                record_class=Deployment,
+                namespace=self.namespace_selected,
+                title=f"Deployments available in namespace [{self.namespace_selected}]:" if echo else None,
+                refresh=refresh
+            )
 
             # Check if valid deployment data is returned
-            if 'NAME' in result.stdout and 'READY' in result.stdout and 'AGE' in result.stdout:
-                # Prepare deployment data
-                # Skip header row
-                raw_data = result.stdout.splitlines()[1:]
-                all_deployments = []
-
-                for line in raw_data:
-                    # Split each line into columns and normalize time units
-                    columns = line.split()
-                    columns[-1] = columns[-1].replace('y', ' Years ').replace('d', ' Days ').replace('h', ' Hours ').replace('m', ' Minutes ')
-                    all_deployments.append(columns)
-
-                # Display the deployments in the console if echo is True
-                if echo:
-                    Console.newLine()
-                    Console.textSuccess(f"Deployments available in namespace [{self.namespace_selected}]:")
-                    Console.table(
-                        headers=['Name', 'Ready', 'Up-to-date', 'Available', 'Age'],
-                        rows=all_deployments
-                    )
-                    Console.newLine()
-
+            if all_deployments:
                 # Store the deployments data
                 self.deployments = all_deployments
                 return
@@ -342,6 +943,10 @@ class Azure:
             error_message = f"Failed to retrieve deployments for namespace [{self.namespace_selected}]. Error: {e.stderr.strip()}"
             raise RuntimeError(error_message) from e
 
+        except ValueError as e:
+            raise RuntimeError(f"Invalid JSON response while retrieving deployments for namespace [{self.namespace_selected}].") from e
+
+    @traced
     def selectDeployment(self, deployment:str=None):
         """
         Prompt the user to select a deployment if none is configured.
@@ -363,22 +968,37 @@ class Azure:
         # Generate the list of available deployments
         if not self.deployments:
             self.listDeployments(echo=False)
-        available_deployments = [d[0] for d in self.deployments]
+        available_deployments = [d.name for d in self.deployments]
 
         # Prompt the user to select a deployment if none is provided
         if deployment is None:
-            deployment = Console.choice(
+            recent = self.recent.get(f"deployments/{self.namespace_selected}")
+            self.prefetchChoices(
+                available_deployments,
+                recent,
+                lambda value: self.podsCommand(self.namespace_selected, value)
+            )
+            deployment = Console.select(
                 question="Which deployment would you like to use?",
-                choices=available_deployments
+                choices=available_deployments,
+                recent=recent
             )
 
+        # A configured deployment missing from a cached listing is checked against a live listing
+        if deployment not in available_deployments and 'deployments' in self.cached_listings:
+            self.listDeployments(echo=False, refresh=True)
+            available_deployments = [d.name for d in self.deployments]
+
         # Validate the provided deployment against the available options
         if deployment not in available_deployments:
             error_message = f"The deployment [{deployment}] is not among the available options."
             raise ValueError(error_message)
 
-        # Store the selected deployment
+        # Store the selected deployment and drop prefetches for the other choices
         self.deployment_selected = deployment
+        self.recent.add(f"deployments/{self.namespace_selected}", deployment)
+        if self.prefetcher:
+            self.prefetcher.cancel(keep=[self.podsCommand(self.namespace_selected, deployment)])
 
         # Display confirmation of the selected deployment
         Console.info(
@@ -386,7 +1006,8 @@ class Azure:
             timestamp=True
         )
 
-    def listPods(self, echo: bool = True):
+    @traced
+    def listPods(self, echo: bool = True, refresh: bool = False):
         """
         List the pods in the selected namespace and deployment.
 
@@ -396,6 +1017,7 @@ class Azure:
 
         Args:
             echo (bool, optional): If True, the pods are printed to the console. Defaults to True.
+            refresh (bool, optional): If True, the listing cache is bypassed. Defaults to False.
 
         Raises:
             RuntimeError: If no pods are found or the `kubectl` command fails.
@@ -404,33 +1026,19 @@ class Azure:
             None
         """
         try:
-            # Execute the command to get the pods in the selected namespace
-            command = f"kubectl get pods -n {self.namespace_selected}"
-            result = subprocess.run(command, shell=True, check=True, capture_output=True, text=True)
+            # Get the pods of the selected deployment and display them if echo is True
+            all_pods = self.loadListing(
+                kind='pods',
+                parser=parse_pods,
+                record_class=Pod,
+                namespace=self.namespace_selected,
+                query=self.podsQuery(self.namespace_selected, self.deployment_selected),
+                title=f"Available Pods in namespace [{self.namespace_selected}] for deployment [{self.deployment_selected}]:" if echo else None,
+                refresh=refresh
+            )
 
             # Check if valid pod data is returned
-            if 'NAME' in result.stdout and 'READY' in result.stdout and 'AGE' in result.stdout:
-                # Clean the output to remove unwanted timestamps
-                cleaned_output = re.sub(r"\([^)]* ago\)", "", result.stdout)
-                pod_data = cleaned_output.splitlines()[1:]  # Skip header row
-
-                all_pods = []
-                for line in pod_data:
-                    columns = line.split()
-                    # Replace time format and pod status
-                    columns[-1] = columns[-1].replace('y', ' Years ').replace('d', ' Days ').replace('h', ' Hours ').replace('m', ' Minutes ').strip()
-                    all_pods.append(columns)
-
-                # Display the pod information in the console if echo is True
-                if echo:
-                    Console.newLine()
-                    Console.textSuccess(f"Available Pods in namespace [{self.namespace_selected}] for deployment [{self.deployment_selected}]:")
-                    Console.table(
-                        headers=['Name', 'Ready', 'Status', 'Restarts', 'Age'],
-                        rows=all_pods
-                    )
-                    Console.newLine()
-
+            if all_pods:
                 # Store the pod data
                 self.pods = all_pods
                 return
@@ -442,6 +1050,10 @@ class Azure:
             error_message = f"Failed to retrieve pods for namespace [{self.namespace_selected}] and deployment [{self.deployment_selected}]. Error: {e.stderr.strip()}"
             raise RuntimeError(error_message) from e
 
+        except ValueError as e:
+            raise RuntimeError(f"Invalid JSON response while retrieving pods for namespace [{self.namespace_selected}].") from e
+
+    @traced
     def selectPod(self, pod:str=None):
         """
         Prompt the user to select a pod if none is already selected.
@@ -462,21 +1074,28 @@ class Azure:
         # Generate the list of available pods
         if not self.pods:
             self.listPods(echo=False)
-        list_pods = [i_value[0] for i_value in self.pods]
+        list_pods = [item.name for item in self.pods]
 
         # If no pod is selected, prompt the user to choose one
         if pod is None:
-            pod = Console.choice(
+            pod = Console.select(
                 question="Which POD would you like to access?",
-                choices=list_pods
+                choices=list_pods,
+                recent=self.recent.get(f"pods/{self.namespace_selected}")
             )
 
+        # A configured pod missing from a cached listing is checked against a live listing
+        if pod not in list_pods and 'pods' in self.cached_listings:
+            self.listPods(echo=False, refresh=True)
+            list_pods = [item.name for item in self.pods]
+
         # Ensure the selected pod is available in the list
         if pod not in list_pods:
             raise ValueError(f"The POD [{pod}] does not exist in the available options.")
 
         # Store the selected pod for later use
         self.pod_selected = pod
+        self.recent.add(f"pods/{self.namespace_selected}", pod)
 
         # Display the selected pod name in the console
         Console.info(
@@ -484,6 +1103,137 @@ class Azure:
             timestamp=True
         )
 
+    @traced
+    def watchPods(self):
+        """
+        Keeps the pod table of the selected deployment live from a Kubernetes watch stream.
+
+        A single long-lived `kubectl get pods --watch-only` process streams the changes, which are
+        applied to an in-memory pod index; only the rows that changed are redrawn. When the stream
+        ends (e.g. the API server closes it), the watch is restarted and the index is reconciled
+        with a fresh listing. A watch failing with a transient error is restarted with an increasing
+        delay, announced on the status line below the table; any other error stops it. The watch runs
+        until it is interrupted with Ctrl+C.
+
+        Raises:
+            RuntimeError: If the pods cannot be listed or the watch fails with a non-transient error.
+        """
+        import tempfile
+        from azure.runner import TRANSIENT_ERRORS
+
+        namespace = self.namespace_selected
+        query = self.podsQuery(namespace, self.deployment_selected)
+
+        # Build the watch command with the same server-side filters as the listing
+        command = ["kubectl", "get", "pods", "-n", namespace, "--watch-only", "--output-watch-events", "-o", "json"]
+        if 'labelSelector' in query:
+            command += ["-l", query['labelSelector']]
+        if 'fieldSelector' in query:
+            command += ["--field-selector", query['fieldSelector']]
+
+        Console.newLine()
+        Console.textSuccess(f"Watching pods in namespace [{namespace}] for deployment [{self.deployment_selected}] (Ctrl+C to stop):")
+
+        index = {}
+        table = None
+        process = None
+        failures = 0
+
+        try:
+            while True:
+                # Start the watch before listing, so no change between both is lost
+                started = time.perf_counter()
+                errors = tempfile.TemporaryFile()
+                process = runner.popen(command, stdout=subprocess.PIPE, stderr=errors, text=True)
+
+                try:
+                    pods = self.loadListing(kind='pods', parser=parse_pods, record_class=Pod, namespace=namespace, query=query, refresh=True)
+                except (subprocess.CalledProcessError, ValueError) as e:
+                    raise RuntimeError(f"Failed to retrieve pods for namespace [{namespace}].") from e
+
+                # Fix the column widths from the first listing, leaving room for longer values
+                if table is None:
+                    minimums = [len(self.deployment_selected or '') + 17, 5, 17, 8, 20]
+                    widths = [
+                        min(max([len(header), minimum] + [len(pod.row()[position]) for pod in pods]), self.column_width)
+                        for position, (header, minimum) in enumerate(zip(Pod.headers, minimums))
+                    ]
+                    table = LiveTable(headers=Pod.headers, widths=widths, name='pod')
+
+                # Reconcile the index with the fresh listing
+                current = {pod.name: pod for pod in pods}
+                for name in [name for name in index if name not in current]:
+                    del index[name]
+                    table.remove(name)
+                for name, pod in current.items():
+                    index[name] = pod
+                    table.upsert(name, pod.row(), 'ADDED', pod.data())
+
+                # The watch is back after a failure: its restart message is outdated
+                if failures:
+                    table.status()
+
+                # Apply the events incrementally
+                error = None
+                interrupted = False
+                for event_type, item in iter_watch_events(process.stdout):
+                    if event_type == 'ERROR':
+                        # An expired watch (410 Gone) is only restarted; other errors are classified below
+                        if item.get('code') != 410:
+                            error = item.get('message') or f"watch error {item.get('code')}"
+                        interrupted = True
+                        break
+                    if event_type not in ('ADDED', 'MODIFIED', 'DELETED'):
+                        continue
+
+                    pod = parse_pod(item)
+                    if event_type == 'DELETED':
+                        index.pop(pod.name, None)
+                        table.remove(pod.name)
+                    else:
+                        index[pod.name] = pod
+                        table.upsert(pod.name, pod.row(), event_type, pod.data())
+
+                # The stream ended: read why before restarting it
+                if interrupted:
+                    process.kill()
+                process.wait()
+                runner.record(command, time.perf_counter() - started, process.returncode, started=started)
+                errors.seek(0)
+                stderr = errors.read().decode('utf-8', 'replace').strip()
+                errors.close()
+
+                if not interrupted and process.returncode != 0:
+                    error = stderr or f"kubectl exited with code {process.returncode}"
+                if error is None:
+                    failures = 0
+                    time.sleep(1)
+                    continue
+
+                if not TRANSIENT_ERRORS.search(error):
+                    raise RuntimeError(f"Failed to watch pods in namespace [{namespace}]. Error: {error}")
+
+                # Transient failure: restart with an increasing delay, capped at 30 seconds
+                wait = min(runner.delay * 2 ** failures, 30)
+                failures += 1
+                Console.textWarning(f"Pod watch failed ({error.splitlines()[-1]}). Restarting in {wait:.0f}s...")
+                time.sleep(wait)
+
+        except KeyboardInterrupt:
+            Console.newLine()
+            Console.info(message="Watch stopped.", timestamp=True)
+
+        finally:
+            if table:
+                table.close()
+            if process and process.poll() is None:
+                process.kill()
+                process.wait()
+                runner.record(command, time.perf_counter() - started, 0, started=started)
+
+            # Keep the last known state of the pods
+            self.pods = list(index.values())
+
     def clear_folder(self, folder_path):
         """Clears the contents of the specified folder."""
         for file in folder_path.iterdir():
@@ -492,63 +1242,1046 @@ class Azure:
             else:
                 file.unlink()
 
-    def runBackup(self, folder: str = None, origin: str = '/var/www/app'):
+    def backupPath(self, folder: str = None, pod: str = None) -> Path:
+        """
+        Resolves the local folder of a backup.
+
+        Args:
+            folder (str, optional): The configured folder. If not specified, `backups/<pod>` in the project is used.
+            pod (str, optional): The pod name. Defaults to the selected pod.
+
+        Returns:
+            Path: The absolute backup folder.
+        """
+        if not folder:
+            current_path = Path(__file__).resolve().parent
+            return current_path.parent / 'backups' / sanitize_folder_name(pod or self.pod_selected)
+        return Path(folder).resolve()
+
+    @traced
+    def runBackup(self, folder: str = None, origin: str = '/var/www/app', incremental: bool = False, hashes: bool = False,
+                  transport: str = 'cp', compression: str = 'none', level: int = None, archive: bool = False,
+                  namespace: str = None, pod: str = None, progress: bool = True, snapshots: dict = None,
+                  resumable: bool = False, resume: bool = False, unit_size: int = 64, retries: int = 3,
+                  filters: dict = None) -> dict:
         """
         This method performs a backup of the source code from the specified pod in the selected namespace.
 
         Args:
             folder (str, optional): The directory where the backup will be stored. If not specified, the default backup path is used.
+            origin (str, optional): The folder inside the pod to back up. Defaults to '/var/www/app'.
+            incremental (bool, optional): If True, only new or changed files are transferred and files deleted
+                                          on the pod are removed locally. Defaults to False.
+            hashes (bool, optional): If True, incremental backups also compare SHA-256 checksums. Defaults to False.
+            transport (str, optional): 'cp' uses `kubectl cp`; 'tar' streams a tar archive over `kubectl exec`
+                                       and extracts it as the bytes arrive. Defaults to 'cp'.
+            compression (str, optional): Compression applied inside the pod by the 'tar' transport and by
+                                         incremental backups ('none', 'gzip' or 'zstd'). Defaults to 'none'.
+            level (int, optional): The compression level. Defaults to the compressor's default.
+            archive (bool, optional): If True, the stream is saved as a single archive file next to the
+                                      backup folder instead of being extracted. Defaults to False.
+            namespace (str, optional): The namespace of the pod. Defaults to the selected namespace.
+            pod (str, optional): The pod to back up. Defaults to the selected pod.
+            progress (bool, optional): If True, the throughput of streamed transfers is shown live. Defaults to True.
+            snapshots (dict, optional): If provided, the backup is stored as a dated, deduplicated snapshot in
+                                        the backup folder, and older snapshots are pruned with this retention
+                                        policy ('keep-last', 'keep-daily', 'keep-weekly'). Defaults to None.
+            resumable (bool, optional): If True, the files are transferred with `tar` in checkpointed units recorded
+                                        in a journal next to the backup folder. Defaults to False.
+            resume (bool, optional): If True, an interrupted resumable backup continues from its last completed
+                                     unit instead of starting over. Implies `resumable`. Defaults to False.
+            unit_size (int, optional): Target size of a resumable unit in MiB. Defaults to 64.
+            retries (int, optional): Retries of a failed unit, with exponential backoff. Defaults to 3.
+            filters (dict, optional): The 'include' and 'exclude' globs and the 'max-file-size' in MiB, applied
+                                      on the pod before any data is transferred. Defaults to None.
 
         Raises:
-            ValueError: If the pod or namespace is not properly selected or if the backup fails.
+            ValueError: If the pod or namespace is not properly selected, if the backup fails, or if a
+                        backup that is not a snapshot targets a folder holding a snapshot store.
             subprocess.CalledProcessError: If the backup command fails during execution.
+
+        Returns:
+            dict: The files written ('files') and the bytes received ('bytes').
         """
+        from azure.backup import archive_suffix, retired_path, remove_tree_async
+        from azure.snapshots import SnapshotStore
+
+        namespace = namespace or self.namespace_selected
+        pod = pod or self.pod_selected
+        filters = {key: value for key, value in (filters or {}).items() if value} or None
 
         # Set the backup path
-        if not folder:
-            current_path = Path(__file__).resolve().parent
-            backup_path = current_path.parent / 'backups' / sanitize_folder_name(self.pod_selected)
+        backup_path = self.backupPath(folder, pod)
+
+        # The other modes replace or clear the backup folder, which would destroy every snapshot
+        if snapshots is None and not archive and SnapshotStore(backup_path).exists():
+            raise ValueError(
+                f"The backup folder '{backup_path}' holds a snapshot store. Run with --snapshot, "
+                f"or set another backup.folder for plain backups."
+            )
+
+        # Save the whole folder as a single archive file (e.g. backups/pod.tar.gz)
+        if archive:
+            backup_path.parent.mkdir(parents=True, exist_ok=True)
+            archive_path = backup_path.parent / f"{backup_path.name}{archive_suffix(compression)}"
+            return self.runStreamBackup(namespace, pod, origin, compression=compression, level=level,
+                                        archive_path=archive_path, progress=progress, filters=filters)
+
+        # Ensure the backup directory exists or create it; full copies are staged next to it
+        if snapshots is not None or resumable or resume or incremental:
+            backup_path.mkdir(parents=True, exist_ok=True)
         else:
-            backup_path = Path(folder).resolve()
+            backup_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Keep dated snapshots instead of replacing the previous backup
+        if snapshots is not None:
+            return self.runSnapshotBackup(namespace, pod, backup_path, origin, snapshots, hashes, compression, level, progress, filters)
+
+        # Transfer in checkpointed units that survive dropped connections
+        if resumable or resume:
+            return self.runResumableBackup(namespace, pod, backup_path, origin, incremental, hashes,
+                                           compression, level, resume, unit_size, retries, progress, filters)
+
+        # Transfer only the differences with the previous backup
+        if incremental:
+            return self.runIncrementalBackup(namespace, pod, backup_path, origin, hashes, compression, level, progress, filters)
+
+        # Write the new copy next to the backup; the previous one stays intact until the copy succeeds
+        staging = self.prepareStaging(backup_path)
+        try:
+            # Stream the folder with tar and extract it as it arrives; `kubectl cp` cannot filter files
+            if transport == 'tar' or filters:
+                result = self.runStreamBackup(namespace, pod, origin, compression=compression, level=level,
+                                              backup_path=staging, progress=progress, filters=filters)
+            else:
+                result = self.runCopyBackup(namespace, pod, origin, staging)
+        except Exception:
+            retired = retired_path(backup_path)
+            os.replace(staging, retired)
+            self.cleanups.append(remove_tree_async(retired, "Failed staging copy"))
+            raise
+
+        self.swapBackup(staging, backup_path, pod)
+        return result
+
+    @traced
+    def prepareStaging(self, backup_path: Path) -> Path:
+        """
+        Creates an empty staging folder next to a backup folder.
+
+        Copies left by interrupted runs are renamed aside and deleted in the background.
+
+        Args:
+            backup_path (Path): The backup folder.
+
+        Returns:
+            Path: The staging folder.
+        """
+        from azure.backup import staging_path, retired_path, stale_paths, remove_tree_async
+
+        for path in stale_paths(backup_path):
+            retired = path if '.old-' in path.name else retired_path(backup_path)
+            if retired != path:
+                os.replace(path, retired)
+            self.cleanups.append(remove_tree_async(retired, "Stale copy from an interrupted backup"))
+
+        staging = staging_path(backup_path)
+        staging.mkdir()
+        return staging
+
+    @traced
+    def swapBackup(self, staging: Path, backup_path: Path, pod: str):
+        """
+        Swaps a completed staged copy into place and deletes the previous backup in the background.
+
+        Args:
+            staging (Path): The completed staging folder.
+            backup_path (Path): The backup folder.
+            pod (str): The pod name, used in the messages.
+        """
+        from azure.backup import swap_into_place, remove_tree_async
+
+        start = time.perf_counter()
+        retired = swap_into_place(staging, backup_path)
+        elapsed = time.perf_counter() - start
+
+        Console.info(
+            message=f"Backup of pod '{pod}' swapped into place in {elapsed * 1000:.1f} ms.",
+            timestamp=True
+        )
 
-        # Ensure the backup directory exists or create it
-        backup_path.mkdir(parents=True, exist_ok=True)
+        if retired:
+            self.cleanups.append(remove_tree_async(retired, f"Previous backup of pod '{pod}'"))
 
-        # Clear the folder if it contains any files
-        if any(backup_path.iterdir()):
-            self.clear_folder(backup_path)
+    @traced
+    def runCopyBackup(self, namespace: str, pod: str, origin: str, backup_path: Path) -> dict:
+        """
+        Copies the origin folder of the pod with `kubectl cp`.
 
-        # Get the absolute path for backup
-        backup_path = backup_path.as_posix()
+        Args:
+            namespace (str): The namespace of the pod.
+            pod (str): The pod to back up.
+            origin (str): The folder inside the pod.
+            backup_path (Path): The folder to copy into.
 
-        # Save the current working directory
-        original_dir = Path.cwd()
+        Raises:
+            ValueError: If the copy fails.
 
+        Returns:
+            dict: The files copied ('files') and their bytes ('bytes').
+        """
         # Prepare the kubectl command to copy files from the pod
         kubectl_cmd = [
             "kubectl", "cp",
-            f"{self.namespace_selected}/{self.pod_selected}:{origin}",
-            str(backup_path)
+            f"{namespace}/{pod}:{origin}",
+            backup_path.as_posix()
         ]
 
         try:
 
             Console.info(
-                message=f"Starting backup from pod '{self.pod_selected}'...",
+                message=f"Starting backup from pod '{pod}'...",
                 timestamp=True
             )
-            result = subprocess.run(kubectl_cmd, capture_output=True, text=True, check=True)
+            result = runner.run(kubectl_cmd, timeout=None, retries=0)
+
+            # `kubectl cp` does not report what it copied, so the backup folder is measured
+            files = 0
+            size = 0
+            for current, _, names in os.walk(backup_path):
+                for name in names:
+                    files += 1
+                    size += os.lstat(os.path.join(current, name)).st_size
+
             Console.info(
-                message=f"Backup completed successfully: {result.stdout}",
+                message=f"Backup of pod '{pod}' completed successfully: {result.stdout.strip() or f'{files} files copied ({format_bytes(size)})'}",
                 timestamp=True
             )
+            return {"files": files, "bytes": size}
 
         except subprocess.CalledProcessError as e:
-            raise ValueError(f"Backup failed for pod '{self.pod_selected}'. Please check the error above.") from e
+            raise ValueError(f"Backup failed for pod '{pod}'. Error: {e.stderr.strip()}") from e
 
-        finally:
-            os.chdir(original_dir)
+    @traced
+    def runStreamBackup(self, namespace: str, pod: str, origin: str, compression: str = 'none', level: int = None,
+                        backup_path: Path = None, archive_path: Path = None, progress: bool = True,
+                        filters: dict = None) -> dict:
+        """
+        Backs up the origin folder with a tar stream over `kubectl exec`.
+
+        The archive is produced (and optionally compressed) inside the pod and read from the exec
+        stdout, so files are extracted as soon as they arrive and the bytes received and throughput
+        are shown while the transfer runs.
+
+        Args:
+            namespace (str): The namespace of the pod.
+            pod (str): The pod to back up.
+            origin (str): The folder inside the pod.
+            compression (str, optional): 'none', 'gzip' or 'zstd'. Defaults to 'none'.
+            level (int, optional): The compression level. Defaults to the compressor's default.
+            backup_path (Path, optional): The folder to extract into.
+            archive_path (Path, optional): If provided, the stream is saved to this file instead.
+            progress (bool, optional): If True, the throughput is shown live. Defaults to True.
+            filters (dict, optional): If provided, the files are first selected on the pod with these filters. Defaults to None.
+
+        Raises:
+            ValueError: If the backup fails.
+
+        Returns:
+            dict: The files extracted ('files') and the bytes received ('bytes').
+        """
+        import tarfile
+        from azure.backup import remote_manifest, stream_tar
+
+        try:
+            Console.info(
+                message=f"Starting backup from pod '{pod}' (tar, compression: {compression or 'none'})...",
+                timestamp=True
+            )
+
+            start = time.monotonic()
+
+            # With filters, the files are selected on the pod and only their list is archived
+            selected = remote_manifest(namespace, pod, origin, filters=filters) if filters else None
+            result = stream_tar(
+                namespace, pod, origin,
+                destination=backup_path, files=sorted(selected) if filters else None,
+                compression=compression, level=level,
+                archive=archive_path, progress="Receiving" if progress else None
+            )
+            elapsed = time.monotonic() - start
+
+            target = f"archive saved to {archive_path}" if archive_path else f"{result['files']} files extracted"
+            Console.info(
+                message=(
+                    f"Backup of pod '{pod}' completed successfully: {target}, {format_bytes(result['bytes'])} received "
+                    f"in {elapsed:.1f}s ({format_bytes(result['bytes'] / max(elapsed, 1e-6))}/s){self.excludedMessage(selected)}."
+                ),
+                timestamp=True
+            )
+            return result
+
+        except subprocess.CalledProcessError as e:
+            raise ValueError(f"Backup failed for pod '{pod}'. Error: {e.stderr.strip()}") from e
+
+        except (RuntimeError, OSError, tarfile.TarError) as e:
+            raise ValueError(f"Backup failed for pod '{pod}'. Error: {e}") from e
+
+    def excludedMessage(self, listing) -> str:
+        """
+        Describes the files excluded on the pod by the backup filters.
+
+        Args:
+            listing (RemoteFiles): The remote manifest, or None when no filters were applied.
+
+        Returns:
+            str: The text appended to the backup summary, or an empty string.
+        """
+        if not listing or not (listing.excluded_files or listing.excluded_bytes):
+            return ''
+        return f", {listing.excluded_files} files excluded on the pod ({format_bytes(listing.excluded_bytes)})"
+
+    @traced
+    def runIncrementalBackup(self, namespace: str, pod: str, backup_path: Path, origin: str, hashes: bool = False,
+                             compression: str = 'none', level: int = None, progress: bool = True,
+                             filters: dict = None) -> dict:
+        """
+        Updates a backup folder with the files that changed on the pod since the previous backup.
+
+        The pod's files are listed with a single remote command and compared with the manifest
+        stored by the previous backup. New and changed files are streamed with `tar` over
+        `kubectl exec`, and files deleted on the pod are removed locally.
+
+        Args:
+            namespace (str): The namespace of the pod.
+            pod (str): The pod to back up.
+            backup_path (Path): The backup folder.
+            origin (str): The folder inside the pod.
+            hashes (bool, optional): If True, SHA-256 checksums are compared too. Defaults to False.
+            compression (str, optional): Compression of the transfer ('none', 'gzip' or 'zstd'). Defaults to 'none'.
+            level (int, optional): The compression level. Defaults to the compressor's default.
+            progress (bool, optional): If True, the throughput is shown live. Defaults to True.
+            filters (dict, optional): The include/exclude filters applied on the pod. Defaults to None.
+
+        Raises:
+            ValueError: If the backup fails.
+
+        Returns:
+            dict: The files transferred ('files') and the bytes received ('bytes').
+        """
+        import tarfile
+        from azure.backup import manifest_path, load_manifest, save_manifest, remote_manifest, diff_manifest, stream_tar, remove_files, unsettled
+
+        manifest_file = manifest_path(backup_path)
+
+        try:
+            Console.info(
+                message=f"Starting incremental backup from pod '{pod}'...",
+                timestamp=True
+            )
+
+            # Compare the pod with the previous backup
+            current = remote_manifest(namespace, pod, origin, hashes, filters)
+            previous = load_manifest(manifest_file, origin)
+            changed, deleted, skipped_bytes = diff_manifest(previous, current, backup_path)
+
+            # Transfer the new and changed files and drop the deleted ones
+            result = stream_tar(
+                namespace, pod, origin, destination=backup_path, files=changed,
+                compression=compression, level=level, progress="Receiving" if changed and progress else None
+            )
+            received = result['bytes']
+            remove_files(deleted + result['vanished'], backup_path)
+
+            # Files that changed or vanished while they were read are checked again by the next backup
+            save_manifest(manifest_file, origin, unsettled(current, result['changed']))
+
+            changed_bytes = sum(current[path][0] for path in changed)
+            Console.info(
+                message=(
+                    f"Backup of pod '{pod}' completed successfully: {len(changed)} files transferred ({format_bytes(changed_bytes)}, "
+                    f"{format_bytes(received)} received), {len(current) - len(changed)} unchanged files skipped "
+                    f"({format_bytes(skipped_bytes)}), {len(deleted)} deleted files removed{self.excludedMessage(current)}."
+                ),
+                timestamp=True
+            )
+            return {"files": len(changed), "bytes": received}
+
+        except subprocess.CalledProcessError as e:
+            raise ValueError(f"Backup failed for pod '{pod}'. Error: {e.stderr.strip()}") from e
+
+        except (RuntimeError, OSError, tarfile.TarError) as e:
+            raise ValueError(f"Backup failed for pod '{pod}'. Error: {e}") from e
+
+    @traced
+    def runResumableBackup(self, namespace: str, pod: str, backup_path: Path, origin: str, incremental: bool = False,
+                           hashes: bool = False, compression: str = 'none', level: int = None, resume: bool = False,
+                           unit_size: int = 64, retries: int = 3, progress: bool = True, filters: dict = None) -> dict:
+        """
+        Backs up the pod in checkpointed units, so an interrupted backup can be resumed.
+
+        The files to transfer (all of them, or only the changed ones for incremental backups) are
+        split into units of about `unit_size` MiB. Each unit is streamed with `tar` over `kubectl exec`
+        and retried with exponential backoff when the stream fails; completed units are appended to a
+        journal next to the backup folder. With `resume`, a run continues from the journal of the
+        interrupted one without clearing what was already fetched.
+
+        Incremental backups update the backup folder in place. Full backups are written to a partial
+        folder next to it (`.<folder>.partial`), swapped into place once every unit is complete, so the
+        previous backup stays intact until then.
+
+        Args:
+            namespace (str): The namespace of the pod.
+            pod (str): The pod to back up.
+            backup_path (Path): The backup folder.
+            origin (str): The folder inside the pod.
+            incremental (bool, optional): If True, only new or changed files are planned. Defaults to False.
+            hashes (bool, optional): If True, incremental backups also compare SHA-256 checksums. Defaults to False.
+            compression (str, optional): Compression of the transfer ('none', 'gzip' or 'zstd'). Defaults to 'none'.
+            level (int, optional): The compression level. Defaults to the compressor's default.
+            resume (bool, optional): If True, continues the interrupted backup recorded in the journal. Defaults to False.
+            unit_size (int, optional): Target size of a unit in MiB. Defaults to 64.
+            retries (int, optional): Retries of a failed unit. Defaults to 3.
+            progress (bool, optional): If True, the throughput is shown live. Defaults to True.
+            filters (dict, optional): The include/exclude filters applied on the pod. Defaults to None.
+
+        Raises:
+            ValueError: If the backup fails after all retries.
+
+        Returns:
+            dict: The files transferred ('files') and the bytes received ('bytes').
+        """
+        import tarfile
+        from azure.backup import manifest_path, load_manifest, save_manifest, remote_manifest, diff_manifest, stream_tar, remove_files, plan_units, with_retries, partial_path, unsettled, BackupJournal
+
+        journal = BackupJournal(backup_path)
+        manifest_file = manifest_path(backup_path)
+        partial = partial_path(backup_path)
+        plan, done = journal.load() if resume else (None, set())
+        current = None
+
+        # A full backup can only be resumed while its partial folder is still there
+        if plan and plan.get('staged') and not partial.is_dir():
+            plan = None
+
+        try:
+            if plan and plan.get('origin') == origin:
+                Console.info(
+                    message=f"Resuming backup from pod '{pod}': {len(done)} of {len(plan['units'])} units already completed...",
+                    timestamp=True
+                )
+            else:
+                if journal.exists() and not resume:
+                    Console.textWarning("An interrupted backup was found and will be restarted. Use --resume to continue it instead.")
+
+                Console.info(
+                    message=f"Starting resumable backup from pod '{pod}'...",
+                    timestamp=True
+                )
+
+                # Plan the transfer from the pod manifest
+                current = with_retries(lambda: remote_manifest(namespace, pod, origin, hashes, filters), retries, label="Listing")
+                if incremental:
+                    changed, deleted, _ = diff_manifest(load_manifest(manifest_file, origin), current, backup_path)
+                else:
+                    # Start a new partial copy; the backup folder is only replaced once it is complete
+                    changed, deleted = list(current), []
+                    if partial.exists():
+                        shutil.rmtree(partial)
+                    partial.mkdir(parents=True)
+
+                plan = {
+                    "origin": origin,
+                    "staged": not incremental,
+                    "manifest": current,
+                    "units": plan_units({path: current[path] for path in changed}, int(unit_size) * 1024 * 1024),
+                    "deleted": deleted,
+                    "changed": []
+                }
+                done = set()
+                journal.start(plan)
+
+            # Transfer the pending units, checkpointing each one
+            destination = partial if plan.get('staged') else backup_path
+            units = plan['units']
+            received = 0
+            transferred = 0
+            for index, unit in enumerate(units):
+                if index in done:
+                    continue
+
+                label = f"Unit {index + 1}/{len(units)}"
+                result = with_retries(
+                    lambda: stream_tar(
+                        namespace, pod, origin, destination=destination, files=unit,
+                        compression=compression, level=level, progress=label if progress else None
+                    ),
+                    retries, label=label
+                )
+                received += result['bytes']
+                transferred += len(unit)
+                remove_files(result['vanished'], destination)
+                plan['changed'].extend(result['changed'])
+                journal.complete(index, result['changed'])
+
+            remove_files(plan['deleted'], backup_path)
+            if plan.get('staged'):
+                self.swapBackup(partial, backup_path, pod)
+            # Files that changed or vanished while they were read are checked again by the next backup
+            save_manifest(manifest_file, origin, unsettled(plan['manifest'], plan['changed']))
+            journal.remove()
+
+            Console.info(
+                message=(
+                    f"Backup of pod '{pod}' completed successfully: {transferred} files transferred in "
+                    f"{len(units) - len(done)} units ({format_bytes(received)} received), "
+                    f"{len(plan['deleted'])} deleted files removed{self.excludedMessage(current)}."
+                ),
+                timestamp=True
+            )
+            return {"files": transferred, "bytes": received}
+
+        except subprocess.CalledProcessError as e:
+            raise ValueError(f"Backup failed for pod '{pod}'. Run again with --resume to continue. Error: {e.stderr.strip()}") from e
+
+        except (RuntimeError, OSError, tarfile.TarError) as e:
+            raise ValueError(f"Backup failed for pod '{pod}'. Run again with --resume to continue. Error: {e}") from e
+
+    @traced
+    def runSnapshotBackup(self, namespace: str, pod: str, store_path: Path, origin: str, retention: dict = None,
+                          hashes: bool = False, compression: str = 'none', level: int = None, progress: bool = True,
+                          filters: dict = None) -> dict:
+        """
+        Creates a dated snapshot of the pod in a content-addressed store and applies the retention policy.
+
+        Files unchanged since the latest snapshot are hard linked to it without being transferred; the
+        others are streamed with `tar` over `kubectl exec`, hashed and stored once per distinct content.
+        Snapshots outside the retention policy are then removed, and the contents no snapshot references
+        (theirs, or the ones left by an interrupted run) are garbage collected.
+
+        Args:
+            namespace (str): The namespace of the pod.
+            pod (str): The pod to back up.
+            store_path (Path): The store folder.
+            origin (str): The folder inside the pod.
+            retention (dict, optional): The 'keep-last', 'keep-daily' and 'keep-weekly' limits. Defaults to keeping every snapshot.
+            hashes (bool, optional): If True, SHA-256 checksums are compared too. Defaults to False.
+            compression (str, optional): Compression of the transfer ('none', 'gzip' or 'zstd'). Defaults to 'none'.
+            level (int, optional): The compression level. Defaults to the compressor's default.
+            progress (bool, optional): If True, the throughput is shown live. Defaults to True.
+            filters (dict, optional): The include/exclude filters applied on the pod. Defaults to None.
+
+        Raises:
+            ValueError: If the backup fails.
+
+        Returns:
+            dict: The files transferred ('files') and the bytes received ('bytes').
+        """
+        import tarfile
+        from azure.backup import remote_manifest, diff_manifest, stream_tar
+        from azure.snapshots import SnapshotStore
+
+        retention = retention or {}
+        store = SnapshotStore(store_path)
+
+        try:
+            Console.info(
+                message=f"Starting snapshot backup from pod '{pod}'...",
+                timestamp=True
+            )
+
+            # Compare the pod with the latest snapshot
+            names = store.snapshots()
+            previous_name = names[-1] if names else None
+            previous = store.manifest(previous_name) if previous_name else {}
+            current = remote_manifest(namespace, pod, origin, hashes, filters)
+            changed, _, skipped_bytes = diff_manifest(previous, current, store.path(previous_name) if previous_name else store_path)
+
+            # Link the unchanged files and transfer the others
+            name, partial = store.begin()
+            changed_set = set(changed)
+            unchanged = [path for path in current if path not in changed_set]
+            if unchanged:
+                store.link(store.path(previous_name), partial, unchanged)
+
+            result = stream_tar(
+                namespace, pod, origin, destination=partial, files=changed,
+                compression=compression, level=level, progress="Receiving" if changed and progress else None
+            )
+            received = result['bytes']
+
+            # Files removed while they were read are left out; the ones that changed get no time,
+            # so the next snapshot transfers them again
+            unstable = set(result['changed'])
+            changed = [path for path in changed if path not in unstable or (partial / path).is_file()]
+            digests, new_objects, new_bytes = store.ingest(partial, changed)
+
+            files = {path: previous[path] for path in unchanged}
+            files.update({
+                path: [current[path][0], None if path in unstable else current[path][1], digests[path]]
+                for path in changed
+            })
+            store.commit(name, partial, origin, files)
+
+            # Apply the retention policy and drop the contents no snapshot references, including the
+            # ones stored by interrupted runs that never committed their snapshot
+            removed = store.prune(retention.get('keep-last', 0), retention.get('keep-daily', 0), retention.get('keep-weekly', 0))
+            collected, freed = store.collect_garbage()
+
+            Console.info(
+                message=(
+                    f"Snapshot {name} of pod '{pod}' completed successfully: {len(changed)} files transferred "
+                    f"({format_bytes(received)} received, {new_objects} new contents stored, {format_bytes(new_bytes)}), "
+                    f"{len(unchanged)} unchanged files linked ({format_bytes(skipped_bytes)}){self.excludedMessage(current)}."
+                ),
+                timestamp=True
+            )
+            Console.info(
+                message=(
+                    f"Retention: {len(store.snapshots())} snapshots kept, {len(removed)} removed, "
+                    f"{collected} unreferenced contents collected ({format_bytes(freed)}). Store size: {format_bytes(store.size())}."
+                ),
+                timestamp=True
+            )
+            return {"files": len(changed), "bytes": received}
+
+        except subprocess.CalledProcessError as e:
+            raise ValueError(f"Backup failed for pod '{pod}'. Error: {e.stderr.strip()}") from e
+
+        except (RuntimeError, OSError, tarfile.TarError) as e:
+            raise ValueError(f"Backup failed for pod '{pod}'. Error: {e}") from e
+
+    @traced
+    def verifyBackup(self, folder: str = None, origin: str = '/var/www/app', namespace: str = None, pod: str = None,
+                     filters: dict = None, snapshots: bool = False, archive: bool = False, compression: str = 'none',
+                     workers: int = None) -> dict:
+        """
+        Verifies a completed backup against the files on the pod.
+
+        The SHA-256 of every file is computed on the pod in a single batched command while the local
+        files are hashed concurrently in a thread pool (large files are memory-mapped), so the check is
+        bound by disk bandwidth. Archives are hashed member by member in a single read of the file.
+        Missing, extra and mismatched files are reported.
+
+        Args:
+            folder (str, optional): The backup folder. If not specified, the default backup path is used.
+            origin (str, optional): The folder inside the pod. Defaults to '/var/www/app'.
+            namespace (str, optional): The namespace of the pod. Defaults to the selected namespace.
+            pod (str, optional): The pod. Defaults to the selected pod.
+            filters (dict, optional): The include/exclude filters the backup was made with. Defaults to None.
+            snapshots (bool, optional): If True, the latest snapshot of the store is verified. Defaults to False.
+            archive (bool, optional): If True, the archive saved next to the backup folder is verified. Defaults to False.
+            compression (str, optional): The compression the archive was saved with. Defaults to 'none'.
+            workers (int, optional): The number of local hashing threads. Defaults to the number of CPUs plus 4.
+
+        Raises:
+            ValueError: If the backup cannot be verified or does not match the pod.
+
+        Returns:
+            dict: The 'missing', 'extra' and 'mismatched' paths and the number of 'files' verified.
+        """
+        import tarfile
+        from concurrent.futures import ThreadPoolExecutor
+        from azure.backup import remote_manifest, local_digests, archive_digests, archive_suffix, compare_digests
+        from azure.snapshots import SnapshotStore
+
+        namespace = namespace or self.namespace_selected
+        pod = pod or self.pod_selected
+        filters = {key: value for key, value in (filters or {}).items() if value} or None
+        backup_path = self.backupPath(folder, pod)
+
+        # Archives are saved next to the backup folder, whatever the other modes (see `runBackup`)
+        if archive:
+            backup_path = backup_path.parent / f"{backup_path.name}{archive_suffix(compression)}"
+            if not backup_path.is_file():
+                raise ValueError(f"The backup archive '{backup_path}' does not exist.")
+        elif snapshots:
+            store = SnapshotStore(backup_path)
+            names = store.snapshots()
+            if not names:
+                raise ValueError(f"No snapshot to verify in '{backup_path}'.")
+            backup_path = store.path(names[-1])
+
+        if not archive and not backup_path.is_dir():
+            raise ValueError(f"The backup folder '{backup_path}' does not exist.")
+
+        Console.info(
+            message=f"Verifying backup '{backup_path}' against pod '{pod}'...",
+            timestamp=True
+        )
+
+        try:
+            start = time.monotonic()
+
+            # Hash on the pod and locally at the same time
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                remote_future = executor.submit(remote_manifest, namespace, pod, origin, True, filters)
+                local = archive_digests(backup_path, compression) if archive else local_digests(backup_path, workers)
+                remote = remote_future.result()
+
+            elapsed = time.monotonic() - start
+
+        except subprocess.CalledProcessError as e:
+            raise ValueError(f"Verification failed for pod '{pod}'. Error: {e.stderr.strip()}") from e
+
+        except (RuntimeError, OSError, tarfile.TarError) as e:
+            raise ValueError(f"Verification failed for pod '{pod}'. Error: {e}") from e
+
+        missing, extra, mismatched = compare_digests(remote, local)
+        local_bytes = sum(entry[0] for entry in local.values())
+
+        # List the differences, a few of each kind
+        rows = [[path, kind] for kind, paths in (("Missing", missing), ("Extra", extra), ("Mismatched", mismatched)) for path in paths[:20]]
+        if rows:
+            Console.newLine()
+            Console.textDanger(f"Differences between the backup and pod '{pod}':")
+            Console.table(headers=['Path', 'Problem'], rows=rows, name='verify-problem')
+            Console.newLine()
+
+        summary = (
+            f"{len(local)} local files hashed ({format_bytes(local_bytes)}) in {elapsed:.1f}s "
+            f"({format_bytes(local_bytes / max(elapsed, 1e-6))}/s): {len(missing)} missing, "
+            f"{len(extra)} extra, {len(mismatched)} mismatched."
+        )
+        if missing or extra or mismatched:
+            raise ValueError(f"Verification failed for pod '{pod}': {summary}")
+
+        Console.info(
+            message=f"Verification of pod '{pod}' succeeded: {summary}",
+            timestamp=True
+        )
+        return {"missing": missing, "extra": extra, "mismatched": mismatched, "files": len(local)}
+
+    @traced
+    def resolveBackupTargets(self, targets: list, origin: str = '/var/www/app') -> list:
+        """
+        Expands the configured backup targets into the list of pods to back up.
+
+        A target names a pod (`{"namespace": "prod", "pod": "api-7d9f-x2k"}`) or a deployment
+        (`{"namespace": "prod", "deployment": "api"}`), in which case every running pod matching
+        the deployment's label selector is backed up. A target may override the `origin` folder;
+        without a namespace, the selected namespace is used.
+
+        Args:
+            targets (list): The targets from the `backup.targets` configuration.
+            origin (str, optional): The default folder inside the pods. Defaults to '/var/www/app'.
+
+        Raises:
+            ValueError: If a target is incomplete.
+            RuntimeError: If the pods of a deployment cannot be listed.
+
+        Returns:
+            list: One dictionary per pod with its 'namespace', 'pod', 'origin' and 'label'.
+        """
+        pods = []
+
+        for target in targets:
+            namespace = target.get('namespace') or getattr(self, 'namespace_selected', None)
+            if not namespace or not (target.get('pod') or target.get('deployment')):
+                raise ValueError(f"Invalid backup target {json.dumps(target)}: a namespace and a pod or deployment are required.")
+
+            target_origin = target.get('origin') or origin
+
+            if target.get('pod'):
+                pods.append({"namespace": namespace, "pod": target['pod'], "origin": target_origin, "label": target['pod']})
+                continue
+
+            # Every running replica of the deployment
+            deployment = target['deployment']
+            query = {"fieldSelector": "status.phase=Running"}
+            selector = self.deploymentSelector(namespace, deployment)
+            if selector:
+                query['labelSelector'] = selector
+
+            try:
+                records = self.loadListing(kind='pods', parser=parse_pods, record_class=Pod, namespace=namespace, query=query, refresh=True)
+            except subprocess.CalledProcessError as e:
+                raise RuntimeError(f"Failed to retrieve pods for deployment [{deployment}] in namespace [{namespace}]. Error: {e.stderr.strip()}") from e
+            except ValueError as e:
+                raise RuntimeError(f"Invalid JSON response while retrieving pods for deployment [{deployment}].") from e
+
+            if not records:
+                Console.textWarning(f"No running pods found for deployment [{deployment}] in namespace [{namespace}].")
+
+            for record in records:
+                pods.append({"namespace": namespace, "pod": record.name, "origin": target_origin, "label": f"{deployment}/{record.name}"})
+
+        return pods
+
+    @traced
+    def runTargetBackups(self, targets: list, folder: str = None, origin: str = '/var/www/app', workers: int = 4,
+                         verify: bool = False, **options) -> list:
+        """
+        Backs up several pods concurrently with a bounded pool of workers.
+
+        Each pod is backed up into its own folder (`<folder>/<namespace>_<pod>`), reusing the current
+        login and listings. The folder must not be the backup folder of a single pod: a full backup
+        replaces that folder, and the target backups with it. A failing pod does not stop the others; a summary with the duration and
+        bytes of every target is printed at the end.
+
+        Args:
+            targets (list): The targets from the `backup.targets` configuration (see `resolveBackupTargets`).
+            folder (str, optional): The base folder of the target backups (`backup.targets-folder`, by default the
+                                    parent of `backup.folder`). Defaults to the `backups` folder of the project.
+            origin (str, optional): The default folder inside the pods. Defaults to '/var/www/app'.
+            workers (int, optional): The maximum number of concurrent backups. Defaults to 4.
+            verify (bool, optional): If True, each backup is verified against its pod. Defaults to False.
+            **options: The backup options accepted by `runBackup` (incremental, hashes, transport, ...).
+
+        Raises:
+            ValueError: If no pod could be resolved or if any backup failed.
+
+        Returns:
+            list: One result per pod with its 'label', 'status', 'seconds', 'files', 'bytes' and 'error'.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        pods = self.resolveBackupTargets(targets, origin)
+        if not pods:
+            raise ValueError("No pods to back up were found for the configured targets.")
+
+        base_path = Path(folder).resolve() if folder else Path(__file__).resolve().parent.parent / 'backups'
+        workers = max(1, min(int(workers or 1), len(pods)))
+
+        Console.info(
+            message=f"Starting backup of {len(pods)} pods with {workers} workers...",
+            timestamp=True
+        )
+
+        def backup(target: dict) -> dict:
+            start = time.monotonic()
+            result = {"label": target['label'], "status": "OK", "files": 0, "bytes": 0, "error": None}
+            try:
+                target_folder = str(base_path / sanitize_folder_name(f"{target['namespace']}_{target['pod']}"))
+                stats = self.runBackup(
+                    folder=target_folder,
+                    origin=target['origin'],
+                    namespace=target['namespace'],
+                    pod=target['pod'],
+                    progress=workers == 1,
+                    **options
+                )
+                result.update(stats)
+                if verify:
+                    result['status'] = "VERIFYING"
+                    self.verifyBackup(
+                        folder=target_folder,
+                        origin=target['origin'],
+                        namespace=target['namespace'],
+                        pod=target['pod'],
+                        filters=options.get('filters'),
+                        snapshots=options.get('snapshots') is not None,
+                        archive=options.get('archive', False),
+                        compression=options.get('compression', 'none'),
+                        workers=2
+                    )
+                    result['status'] = "VERIFIED"
+            except Exception as e:
+                result['status'] = "MISMATCH" if result['status'] == "VERIFYING" else "FAILED"
+                result['error'] = str(e)
+                Console.error(message=str(e), timestamp=True)
+            result['seconds'] = time.monotonic() - start
+            return result
+
+        start = time.monotonic()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(backup, pods))
+        elapsed = time.monotonic() - start
+
+        Console.newLine()
+        Console.textSuccess("Backup summary:")
+        Console.table(
+            headers=['Target', 'Status', 'Duration', 'Files', 'Bytes'],
+            rows=[
+                [item['label'], item['status'], f"{item['seconds']:.1f}s", str(item['files']), format_bytes(item['bytes'])]
+                for item in results
+            ],
+            name='target'
+        )
+        Console.newLine()
+
+        failed = [item for item in results if item['status'] not in ("OK", "VERIFIED")]
+        total_bytes = sum(item['bytes'] for item in results)
+        Console.info(
+            message=f"{len(results) - len(failed)} of {len(results)} backups completed in {elapsed:.1f}s ({format_bytes(total_bytes)}).",
+            timestamp=True
+        )
+
+        if failed:
+            raise ValueError(f"{len(failed)} backups failed: {', '.join(item['label'] for item in failed)}.")
+
+        return results
+
+    @traced
+    def clusterKubeconfig(self, cluster: dict, timeout: int = 60, refresh: bool = False) -> Path:
+        """
+        Prepares the kubeconfig of one cluster of the inventory.
+
+        AKS clusters (`resource-group` and `name`) get their credentials in their own kubeconfig file,
+        fetched with an explicit `--subscription`, so the shared `az account set` context and the
+        user's kubeconfig are never modified. Credentials that are still valid are reused (see `fetchCredentials`).
+
+        Args:
+            cluster (dict): The cluster entry.
+            timeout (int, optional): Seconds allowed to fetch the credentials. Defaults to 60.
+            refresh (bool, optional): If True, AKS credentials are fetched even if still valid. Defaults to False.
+
+        Raises:
+            RuntimeError: If the credentials cannot be fetched.
+
+        Returns:
+            Path: The kubeconfig file, or None to use kubectl's default one.
+        """
+        if cluster.get('kubeconfig') or not (cluster.get('resource-group') and cluster.get('name')):
+            return kubeconfig_path(cluster)
+
+        path, _ = self.fetchCredentials(
+            resource_group=cluster['resource-group'],
+            name=cluster['name'],
+            subscription_id=cluster.get('subscription_id'),
+            refresh=refresh,
+            timeout=timeout
+        )
+        return path
+
+    @traced
+    def collectCluster(self, cluster: dict, timeout: int = 60, refresh: bool = False) -> list:
+        """
+        Collects the namespaces, deployments and pod health of one cluster of the inventory.
+
+        The three listings are requested at the same time, each from a single API call covering
+        every namespace.
+
+        Args:
+            cluster (dict): The cluster entry.
+            timeout (int, optional): Seconds allowed for each request. Defaults to 60.
+            refresh (bool, optional): If True, AKS credentials are fetched even if still valid. Defaults to False.
+
+        Raises:
+            RuntimeError: If a listing fails or times out.
+
+        Returns:
+            list: The health summary of each namespace (see `summarize_cluster`).
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        kubeconfig = self.clusterKubeconfig(cluster, timeout, refresh)
+        paths = ["/api/v1/namespaces", "/apis/apps/v1/deployments", "/api/v1/pods"]
+
+        def fetch(path: str) -> dict:
+            command = kubectl_command(cluster, kubeconfig, path, timeout)
+            try:
+                result = runner.run(command, timeout=timeout + 5)
+                return json.loads(result.stdout)
+            except subprocess.CalledProcessError as e:
+                raise RuntimeError(f"Failed to retrieve [{path}]. Error: {e.stderr.strip()}") from e
+            except ValueError as e:
+                raise RuntimeError(f"Invalid JSON response while retrieving [{path}].") from e
+
+        with ThreadPoolExecutor(max_workers=len(paths)) as executor:
+            namespaces, deployments, pods = executor.map(fetch, paths)
+
+        return summarize_cluster(namespaces, deployments, pods, only=cluster.get('namespaces'))
+
+    @traced
+    def runInventory(self, clusters: list, workers: int = 0, timeout: int = 60, refresh: bool = False) -> list:
+        """
+        Collects namespaces, deployments and pod health from several clusters concurrently.
+
+        Every cluster is queried through its own kubeconfig and context (see `clusterKubeconfig`), so
+        the runs are isolated from each other and the total time is close to that of the slowest
+        cluster. A failing cluster does not stop the others. The namespaces of every cluster are
+        printed in one merged table, followed by a summary per cluster.
+
+        Args:
+            clusters (list): The entries of `inventory.clusters`. Each one has a `context` and/or
+                             `kubeconfig`, or the `resource-group` and `name` of an AKS cluster, plus
+                             optional `subscription_id`, `label` and `namespaces` (a filter).
+            workers (int, optional): The maximum number of clusters queried at once. Defaults to 0 (all).
+            timeout (int, optional): Seconds allowed for each request. Defaults to 60.
+            refresh (bool, optional): If True, AKS credentials are fetched even if still valid. Defaults to False.
+
+        Raises:
+            ValueError: If no cluster is configured, an entry is incomplete, or any cluster failed.
+
+        Returns:
+            list: One result per cluster with its 'cluster', 'status', 'seconds', 'namespaces' and 'error'.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        if not clusters:
+            raise ValueError("No clusters are configured in inventory.clusters.")
+
+        for cluster in clusters:
+            if not (cluster.get('context') or cluster.get('kubeconfig') or (cluster.get('resource-group') and cluster.get('name'))):
+                raise ValueError(f"Invalid inventory cluster {json.dumps(cluster)}: a context, a kubeconfig or an AKS resource-group and name are required.")
+
+        workers = max(1, min(int(workers or len(clusters)), len(clusters)))
+        Console.info(
+            message=f"Collecting the inventory of {len(clusters)} clusters with {workers} workers...",
+            timestamp=True
+        )
+
+        def collect(cluster: dict) -> dict:
+            start = time.monotonic()
+            result = {"cluster": cluster_label(cluster), "status": "OK", "namespaces": [], "error": None}
+            try:
+                result['namespaces'] = self.collectCluster(cluster, timeout, refresh)
+            except Exception as e:
+                result['status'] = "FAILED"
+                result['error'] = str(e)
+                Console.error(message=f"[{result['cluster']}] {e}", timestamp=True)
+            result['seconds'] = time.monotonic() - start
+            return result
+
+        start = time.monotonic()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(collect, clusters))
+        elapsed = time.monotonic() - start
+
+        rows = [
+            [
+                item['cluster'], entry['namespace'], entry['status'], f"{entry['available']}/{entry['deployments']}",
+                f"{entry['healthy']}/{entry['pods']}", str(entry['restarts']), problems_cell(entry['problems'])
+            ]
+            for item in results for entry in item['namespaces']
+        ]
+        if rows:
+            Console.newLine()
+            Console.textSuccess("Inventory:")
+            Console.table(headers=['Cluster', 'Namespace', 'Status', 'Deployments', 'Healthy Pods', 'Restarts', 'Problems'], rows=rows, name='inventory')
+
+        Console.newLine()
+        Console.textSuccess("Clusters:")
+        Console.table(
+            headers=['Cluster', 'Status', 'Namespaces', 'Deployments', 'Pods', 'Unhealthy', 'Duration'],
+            rows=[
+                [
+                    item['cluster'], item['status'], str(len(item['namespaces'])),
+                    str(sum(entry['deployments'] for entry in item['namespaces'])),
+                    str(sum(entry['pods'] for entry in item['namespaces'])),
+                    str(sum(entry['pods'] - entry['healthy'] for entry in item['namespaces'])),
+                    f"{item['seconds']:.1f}s"
+                ]
+                for item in results
+            ],
+            name='cluster'
+        )
+        Console.newLine()
+
+        failed = [item for item in results if item['status'] != "OK"]
+        slowest = max(item['seconds'] for item in results)
+        Console.info(
+            message=f"{len(results) - len(failed)} of {len(results)} clusters collected in {elapsed:.1f}s (slowest cluster: {slowest:.1f}s).",
+            timestamp=True
+        )
+
+        if failed:
+            raise ValueError(f"{len(failed)} clusters failed: {', '.join(item['cluster'] for item in failed)}.")
+
+        return results
 
+    @traced
     def startBash(self):
         """
         Starts an interactive bash session inside the selected pod in the specified namespace.
@@ -565,7 +2298,7 @@ class Azure:
             Console.textWarning("Initiating session...")
 
             # Start the bash session
-            subprocess.run(cmd, check=True, text=True)
+            runner.interactive(cmd)
 
             Console.textSuccess("Session started successfully.")
 
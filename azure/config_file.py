@@ -21,6 +21,10 @@ class Config:
         self.resource_group = None
         self.name = None
         self.overwrite_existing = None
+        self.listing = None
+        self.listing_chunk_size = None
+        self.listing_column_width = 60
+        self.listing_cache_ttl = 0
         self.namespaces = None
         self.namespace_select = None
         self.namespace_echo = True
@@ -30,9 +34,30 @@ class Config:
         self.pods = None
         self.pods_select = None
         self.pods_echo = True
+        self.pods_running_only = False
+        self.pods_namespace_wide = False
         self.backup = None
         self.backup_folder = None
         self.backup_origin = None
+        self.backup_incremental = False
+        self.backup_hash = False
+        self.backup_transport = 'cp'
+        self.backup_compression = 'none'
+        self.backup_compression_level = None
+        self.backup_archive = False
+        self.backup_targets = []
+        self.backup_targets_folder = None
+        self.backup_workers = 4
+        self.backup_snapshots = None
+        self.backup_resumable = False
+        self.backup_unit_size = 64
+        self.backup_retries = 3
+        self.backup_filters = None
+        self.commands_timeout = 60
+        self.commands_retries = 2
+        self.inventory_clusters = []
+        self.inventory_workers = 0
+        self.inventory_timeout = 60
 
         # Load configuration settings
         self.load()
@@ -48,8 +73,8 @@ class Config:
             ValueError: If there is an error reading or parsing the configuration file.
         """
         try:
-            # Define the path for the configuration file
-            config_file_path = os.path.join(os.path.dirname(__file__), '..', 'config.json')
+            # Define the path for the configuration file (AZURE_CLI_CONFIG overrides it)
+            config_file_path = os.environ.get('AZURE_CLI_CONFIG') or os.path.join(os.path.dirname(__file__), '..', 'config.json')
 
             # Load the JSON content from the config file
             with open(config_file_path, 'r') as file:
@@ -65,6 +90,12 @@ class Config:
             self.name = self.credentials.get('name')
             self.overwrite_existing = self.credentials.get('overwrite-existing')
 
+            # Listing configuration
+            self.listing = config_data.get('listing', {})
+            self.listing_chunk_size = self.listing.get('chunk-size') or None
+            self.listing_column_width = self.listing.get('max-column-width', 60)
+            self.listing_cache_ttl = self.listing.get('cache-ttl', 0)
+
             # Namespace configuration
             self.namespaces = config_data.get('namespace', {})
             self.namespace_select = self.namespaces.get('select')
@@ -79,11 +110,46 @@ class Config:
             self.pods = config_data.get('pods', {})
             self.pods_select = self.pods.get('select')
             self.pods_echo = self.pods.get('echo', True)
+            self.pods_running_only = self.pods.get('running-only', False)
+            self.pods_namespace_wide = self.pods.get('namespace-wide', False)
 
             # Backup configuration
             self.backup = config_data.get('backup', {})
             self.backup_folder = self.backup.get('folder')
             self.backup_origin = self.backup.get('origin')
+            self.backup_incremental = self.backup.get('incremental', False)
+            self.backup_hash = self.backup.get('hash', False)
+            self.backup_transport = self.backup.get('transport', 'cp')
+            self.backup_compression = self.backup.get('compression', 'none')
+            self.backup_compression_level = self.backup.get('compression-level')
+            self.backup_archive = self.backup.get('archive', False)
+            self.backup_targets = self.backup.get('targets', [])
+            # Target backups never go inside the single-pod folder, which is replaced by each full backup
+            self.backup_targets_folder = self.backup.get('targets-folder') or (
+                os.path.dirname(os.path.abspath(self.backup_folder)) if self.backup_folder else None
+            )
+            self.backup_workers = self.backup.get('workers', 4)
+            snapshots = self.backup.get('snapshots') or {}
+            self.backup_snapshots = snapshots if snapshots.get('enabled', False) else None
+            self.backup_resumable = self.backup.get('resumable', False)
+            self.backup_unit_size = self.backup.get('unit-size', 64)
+            self.backup_retries = self.backup.get('retries', 3)
+            self.backup_filters = {
+                "include": self.backup.get('include', []),
+                "exclude": self.backup.get('exclude', []),
+                "max-file-size": self.backup.get('max-file-size', 0)
+            }
+
+            # Command execution policy
+            self.commands = config_data.get('commands', {})
+            self.commands_timeout = self.commands.get('timeout', 60)
+            self.commands_retries = self.commands.get('retries', 2)
+
+            # Multi-cluster inventory configuration
+            self.inventory = config_data.get('inventory', {})
+            self.inventory_clusters = self.inventory.get('clusters', [])
+            self.inventory_workers = self.inventory.get('workers', 0)
+            self.inventory_timeout = self.inventory.get('timeout', 60)
 
         except (FileNotFoundError, json.JSONDecodeError) as e:
             raise ValueError(f"Failed to read or parse the config file: {str(e)}")
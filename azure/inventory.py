@@ -0,0 +1,118 @@
+from pathlib import Path
+from azure.kubeconfig import aks_kubeconfig_path
+from azure.resources import parse_namespaces, parse_deployment, parse_pod
+
+# Pod statuses of workloads that finished on purpose
+FINISHED_STATUSES = ('Completed', 'Succeeded')
+
+def cluster_label(cluster: dict) -> str:
+    """Returns the name a cluster is displayed with: its label, context or AKS name."""
+    return cluster.get('label') or cluster.get('context') or cluster.get('name') or ''
+
+def kubeconfig_path(cluster: dict) -> Path:
+    """
+    Returns the kubeconfig file used for a cluster.
+
+    A configured `kubeconfig` is used as is; AKS clusters get their own file under
+    `.cache/kubeconfig`, so concurrent runs never share or rewrite the same kubeconfig.
+
+    Args:
+        cluster (dict): The cluster entry of the inventory.
+
+    Returns:
+        Path: The kubeconfig file, or None to use kubectl's default one.
+    """
+    if cluster.get('kubeconfig'):
+        return Path(cluster['kubeconfig']).expanduser()
+    if cluster.get('resource-group') and cluster.get('name'):
+        return aks_kubeconfig_path(cluster['resource-group'], cluster['name'])
+    return None
+
+def kubectl_command(cluster: dict, kubeconfig: Path, path: str, timeout: int = 0) -> list:
+    """
+    Builds the command that reads an API path from one cluster of the inventory.
+
+    Args:
+        cluster (dict): The cluster entry.
+        kubeconfig (Path): The kubeconfig of the cluster, or None for the default one.
+        path (str): The API path (e.g. '/api/v1/pods').
+        timeout (int, optional): The request timeout in seconds. Defaults to 0 (none).
+
+    Returns:
+        list: The kubectl command.
+    """
+    command = ["kubectl", "get", "--raw", path]
+    if kubeconfig:
+        command += ["--kubeconfig", str(kubeconfig)]
+    if cluster.get('context'):
+        command += ["--context", cluster['context']]
+    if timeout:
+        command += ["--request-timeout", f"{int(timeout)}s"]
+    return command
+
+def pod_healthy(pod) -> bool:
+    """Returns True if the pod runs with every container ready, or finished successfully."""
+    if pod.status in FINISHED_STATUSES:
+        return True
+    return pod.status == 'Running' and pod.ready == pod.containers
+
+def summarize_cluster(namespaces: dict, deployments: dict, pods: dict, only: list = None) -> list:
+    """
+    Aggregates the listings of a cluster into one health summary per namespace.
+
+    Args:
+        namespaces (dict): The decoded namespaces listing.
+        deployments (dict): The decoded deployments listing of every namespace.
+        pods (dict): The decoded pods listing of every namespace.
+        only (list, optional): The namespaces to keep. Defaults to None (all of them).
+
+    Returns:
+        list: One dictionary per namespace, sorted by name, with its 'namespace', 'status',
+              'deployments', 'available', 'pods', 'healthy', 'restarts' and 'problems'
+              (the unhealthy pods as '<pod> (<status>)').
+    """
+    summary = {}
+    for record in parse_namespaces(namespaces):
+        if not only or record.name in only:
+            summary[record.name] = {
+                "namespace": record.name, "status": record.status, "deployments": 0, "available": 0,
+                "pods": 0, "healthy": 0, "restarts": 0, "problems": []
+            }
+
+    # Records do not keep their namespace, so it is read from each item
+    for item in deployments.get('items') or []:
+        entry = summary.get(item.get('metadata', {}).get('namespace'))
+        if entry is None:
+            continue
+        record = parse_deployment(item)
+        entry['deployments'] += 1
+        if record.available >= record.replicas:
+            entry['available'] += 1
+
+    for item in pods.get('items') or []:
+        entry = summary.get(item.get('metadata', {}).get('namespace'))
+        if entry is None:
+            continue
+        record = parse_pod(item)
+        entry['pods'] += 1
+        entry['restarts'] += record.restarts
+        if pod_healthy(record):
+            entry['healthy'] += 1
+        else:
+            state = f"{record.ready}/{record.containers} ready" if record.status == 'Running' else record.status
+            entry['problems'].append(f"{record.name} ({state})")
+
+    return [summary[name] for name in sorted(summary)]
+
+def problems_cell(problems: list, limit: int = 2) -> str:
+    """
+    Formats the unhealthy pods of a namespace for the inventory table.
+
+    Example:
+        >>> problems_cell(['api-1 (CrashLoopBackOff)', 'api-2 (Pending)', 'web-1 (Error)'])
+        'api-1 (CrashLoopBackOff), api-2 (Pending) +1 more'
+    """
+    text = ', '.join(problems[:limit])
+    if len(problems) > limit:
+        text += f" +{len(problems) - limit} more"
+    return text or '-'
@@ -0,0 +1,116 @@
+import re
+import time
+import base64
+import shutil
+from pathlib import Path
+from datetime import datetime, timezone
+from lib.cache import CACHE_DIR
+from lib.helpers import sanitize_folder_name
+
+# Folder of the kubeconfig files fetched with `az aks get-credentials`, one per cluster
+KUBECONFIG_DIR = CACHE_DIR / 'kubeconfig'
+
+def aks_kubeconfig_path(resource_group: str, name: str) -> Path:
+    """Returns the dedicated kubeconfig file of an AKS cluster."""
+    return KUBECONFIG_DIR / sanitize_folder_name(f"{resource_group}_{name}")
+
+def section_items(text: str, section: str) -> list:
+    """
+    Splits a top-level list of a kubeconfig (e.g. 'users') into the text of its items.
+
+    Only the block style written by `az aks get-credentials` and `kubectl config` is supported.
+
+    Args:
+        text (str): The kubeconfig content.
+        section (str): The name of the list.
+
+    Returns:
+        list: The text of each item.
+    """
+    match = re.search(rf'^{section}:[ \t]*\n((?:[ \t-].*\n?)*)', text, re.MULTILINE)
+    if not match:
+        return []
+    return [item for item in re.split(r'^- ', match.group(1), flags=re.MULTILINE) if item.strip()]
+
+def item_value(item: str, key: str) -> str:
+    """Returns the first scalar value of a key in a kubeconfig item, without quotes."""
+    match = re.search(rf'^[ \t-]*{re.escape(key)}:[ \t]*["\']?([^"\'\s]+)', item, re.MULTILINE)
+    return match.group(1) if match else None
+
+def certificate_expiry(data: str) -> float:
+    """
+    Reads the expiry (notAfter) of a base64 encoded PEM certificate, without any X.509 library.
+
+    The validity period holds the first two time values of the DER encoding.
+
+    Args:
+        data (str): The `client-certificate-data` of a kubeconfig user.
+
+    Returns:
+        float: The expiry in epoch seconds, or None if it cannot be read.
+    """
+    try:
+        pem = base64.b64decode(data).decode('ascii')
+        der = base64.b64decode(''.join(line for line in pem.splitlines() if line and not line.startswith('-----')))
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+    times = re.findall(rb'\x17\x0d(\d{12})Z|\x18\x0f(\d{14})Z', der)
+    if len(times) < 2:
+        return None
+
+    utc_time, generalized_time = times[1]
+    value, pattern = (utc_time, '%y%m%d%H%M%S') if utc_time else (generalized_time, '%Y%m%d%H%M%S')
+    return datetime.strptime(value.decode('ascii'), pattern).replace(tzinfo=timezone.utc).timestamp()
+
+def credential_valid(path: Path, min_validity: int = 300) -> bool:
+    """
+    Checks, without running any command, whether a kubeconfig can still authenticate to its cluster.
+
+    The user of the current context is inspected:
+    - an exec plugin (e.g. kubelogin) gets its tokens itself, so it is valid if installed;
+    - a legacy `azure` auth provider is valid while its cached access token is;
+    - a client certificate is valid until it expires;
+    - a static token has no expiry and is always valid.
+
+    Args:
+        path (Path): The kubeconfig file.
+        min_validity (int, optional): Minimum remaining lifetime in seconds. Defaults to 300.
+
+    Returns:
+        bool: True if the credential can be used, False if it is missing, unknown or expired.
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as file:
+            text = file.read()
+    except OSError:
+        return False
+
+    context = item_value(text, 'current-context')
+    contexts = [item for item in section_items(text, 'contexts') if item_value(item, 'name') == context]
+    if not context or not contexts:
+        return False
+
+    user = item_value(contexts[0], 'user')
+    users = [item for item in section_items(text, 'users') if item_value(item, 'name') == user]
+    if not users:
+        return False
+
+    credential = users[0]
+    deadline = time.time() + min_validity
+
+    if re.search(r'^[ \t]+exec:', credential, re.MULTILINE):
+        command = item_value(credential, 'command')
+        return bool(command and shutil.which(command))
+
+    if re.search(r'^[ \t]+auth-provider:', credential, re.MULTILINE):
+        try:
+            return float(item_value(credential, 'expires-on') or 0) > deadline
+        except ValueError:
+            return False
+
+    if item_value(credential, 'client-certificate-data'):
+        expiry = certificate_expiry(item_value(credential, 'client-certificate-data'))
+        return expiry is not None and expiry > deadline
+
+    return bool(item_value(credential, 'token'))
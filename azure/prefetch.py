@@ -0,0 +1,132 @@
+import time
+import subprocess
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from azure.runner import runner
+
+class _Entry:
+    """A scheduled prefetch: the command, its running process and its future result."""
+
+    __slots__ = ('command', 'process', 'future', 'cancelled')
+
+    def __init__(self, command: tuple):
+        self.command = command
+        self.process = None
+        self.future = None
+        self.cancelled = False
+
+class Prefetcher:
+    """
+    Runs listing commands speculatively in background workers while the user answers a prompt.
+
+    Results are kept in a small bounded cache keyed by the exact command, so a later call
+    with the same command is served without waiting on a new round trip. Each result is served
+    once: later calls run the command again.
+    """
+
+    def __init__(self, max_entries: int = 8, workers: int = 3):
+        """
+        Initializes the prefetch engine.
+
+        Args:
+            max_entries (int, optional): Maximum number of cached or in-flight commands. Defaults to 8.
+            workers (int, optional): Number of background workers. Defaults to 3.
+        """
+        self.max_entries = max_entries
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='prefetch')
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _run(self, entry: _Entry):
+        """
+        Executes a prefetch command in a worker.
+
+        Returns:
+            str: The command output, or None if it failed or was cancelled.
+        """
+        with self._lock:
+            if entry.cancelled:
+                return None
+            started = time.perf_counter()
+            entry.process = runner.popen(
+                list(entry.command), stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
+            )
+
+        stdout, _ = entry.process.communicate()
+        runner.record(list(entry.command), time.perf_counter() - started, entry.process.returncode, len(stdout or ''), started=started)
+        if entry.cancelled or entry.process.returncode != 0:
+            return None
+        return stdout
+
+    def _cancel(self, entry: _Entry):
+        """Cancels an entry, killing its process if it is already running."""
+        entry.cancelled = True
+        if entry.future:
+            entry.future.cancel()
+        if entry.process and entry.process.poll() is None:
+            entry.process.kill()
+
+    def schedule(self, command: list):
+        """
+        Starts fetching a command in the background unless it is already cached or in flight.
+
+        Args:
+            command (list): The command to execute.
+        """
+        key = tuple(command)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return
+
+            entry = _Entry(key)
+            self._entries[key] = entry
+
+            # Evict the oldest entries to keep the cache bounded
+            while len(self._entries) > self.max_entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._cancel(evicted)
+
+        entry.future = self._executor.submit(self._run, entry)
+
+    def take(self, command: list):
+        """
+        Returns the prefetched output of a command, waiting for it if it is still running.
+
+        The entry is removed, so an output fetched during a prompt is never served again to a
+        later listing, such as the reconciliations of a watch.
+
+        Args:
+            command (list): The command to look up.
+
+        Returns:
+            str: The command output, or None if it was not prefetched or failed.
+        """
+        with self._lock:
+            entry = self._entries.pop(tuple(command), None)
+        if entry is None or entry.cancelled or entry.future is None:
+            return None
+
+        try:
+            return entry.future.result()
+        except Exception:
+            return None
+
+    def cancel(self, keep: list = None):
+        """
+        Cancels every prefetch that is not in `keep`, such as the choices the user did not pick.
+
+        Args:
+            keep (list, optional): Commands to preserve. Defaults to None (cancel everything).
+        """
+        keep = {tuple(command) for command in (keep or [])}
+        with self._lock:
+            for key in list(self._entries):
+                if key not in keep:
+                    self._cancel(self._entries.pop(key))
+
+    def shutdown(self):
+        """Cancels every pending prefetch and stops the workers."""
+        self.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,102 @@
+import json
+import os
+import time
+from pathlib import Path
+
+class AzureProfile:
+    """
+    Read-only view over the local Azure CLI profile and MSAL token cache.
+
+    It allows checking whether an existing `az login` session can be reused without
+    spawning the Azure CLI at all.
+    """
+
+    def __init__(self, config_dir: str = None):
+        """
+        Initializes the profile reader.
+
+        Args:
+            config_dir (str, optional): The Azure CLI configuration directory. Defaults to
+                                        `AZURE_CONFIG_DIR` or `~/.azure`.
+        """
+        self.config_dir = Path(config_dir or os.environ.get('AZURE_CONFIG_DIR') or Path.home() / '.azure')
+
+    def _read_json(self, file_name: str) -> dict:
+        """
+        Reads a JSON file from the configuration directory.
+
+        Args:
+            file_name (str): The file name inside the configuration directory.
+
+        Returns:
+            dict: The parsed content, or an empty dictionary if the file is missing, encrypted or invalid.
+        """
+        try:
+            # The Azure CLI writes its profile with a UTF-8 BOM
+            with open(self.config_dir / file_name, 'r', encoding='utf-8-sig') as file:
+                data = json.load(file)
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def find_account(self, tenant_id: str = None, subscription_id: str = None):
+        """
+        Finds an enabled subscription record in the profile matching the tenant and subscription.
+
+        Args:
+            tenant_id (str, optional): The expected tenant ID. Any tenant matches if not provided.
+            subscription_id (str, optional): The expected subscription ID or name. The default
+                                             subscription is used if not provided.
+
+        Returns:
+            dict: The account record as returned by `az account show`, or None if no record matches.
+        """
+        for account in self._read_json('azureProfile.json').get('subscriptions', []):
+            if account.get('state') != 'Enabled':
+                continue
+            if tenant_id and tenant_id not in (account.get('tenantId'), account.get('tenantDefaultDomain')):
+                continue
+            if subscription_id:
+                if subscription_id.lower() not in (str(account.get('id')).lower(), str(account.get('name')).lower()):
+                    continue
+            elif not account.get('isDefault'):
+                continue
+            return account
+
+        return None
+
+    def has_valid_token(self, account: dict, min_validity: int = 300) -> bool:
+        """
+        Checks whether the MSAL token cache holds an access token for the account that is still valid.
+
+        Args:
+            account (dict): The account record returned by `find_account`.
+            min_validity (int, optional): Minimum remaining lifetime of the token in seconds. Defaults to 300.
+
+        Returns:
+            bool: True if a token for the account's user and tenant expires after the required margin.
+        """
+        cache = self._read_json('msal_token_cache.json')
+        username = str(account.get('user', {}).get('name', '')).lower()
+        tenant_id = account.get('tenantId')
+
+        # Map the user name of the profile to the MSAL home account IDs
+        home_accounts = {
+            entry.get('home_account_id')
+            for entry in cache.get('Account', {}).values()
+            if str(entry.get('username', '')).lower() == username
+        }
+        if not home_accounts:
+            return False
+
+        deadline = time.time() + min_validity
+        for token in cache.get('AccessToken', {}).values():
+            if token.get('home_account_id') not in home_accounts or token.get('realm') != tenant_id:
+                continue
+            try:
+                if int(token.get('expires_on', 0)) > deadline:
+                    return True
+            except (TypeError, ValueError):
+                continue
+
+        return False
@@ -0,0 +1,295 @@
+import json
+import time
+from datetime import datetime
+from lib.helpers import format_age
+
+def parse_timestamp(value: str) -> float:
+    """
+    Converts a Kubernetes RFC 3339 timestamp (e.g. '2025-01-07T10:00:00Z') to epoch seconds.
+
+    Args:
+        value (str): The timestamp.
+
+    Returns:
+        float: The epoch seconds, or the current time if the value is missing or invalid.
+    """
+    if not value:
+        return time.time()
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+    except ValueError:
+        return time.time()
+
+# Record type of each listed kind in the structured output modes
+RECORD_TYPES = {'namespaces': 'namespace', 'deployments': 'deployment', 'pods': 'pod'}
+
+def format_timestamp(seconds: float) -> str:
+    """Formats epoch seconds as an RFC 3339 UTC timestamp, as the API server does."""
+    return time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(seconds))
+
+class Namespace:
+    """A Kubernetes namespace."""
+
+    __slots__ = ('name', 'status', 'created')
+
+    headers = ['Name', 'Status', 'Age']
+
+    def __init__(self, name: str, status: str, created: float):
+        self.name = name
+        self.status = status
+        self.created = created
+
+    @property
+    def age(self) -> float:
+        """Age of the namespace in seconds."""
+        return time.time() - self.created
+
+    def row(self) -> list:
+        """Returns the values displayed in the namespaces table."""
+        return [self.name, self.status, format_age(self.age)]
+
+    def data(self) -> dict:
+        """Returns the typed values written in the structured output modes."""
+        return {"name": self.name, "status": self.status, "created": format_timestamp(self.created), "age": int(self.age)}
+
+class Deployment:
+    """A Kubernetes deployment and its replica counters."""
+
+    __slots__ = ('name', 'ready', 'replicas', 'up_to_date', 'available', 'created', 'selector')
+
+    headers = ['Name', 'Ready', 'Up-to-date', 'Available', 'Age']
+
+    def __init__(self, name: str, ready: int, replicas: int, up_to_date: int, available: int, created: float, selector: str = ''):
+        self.name = name
+        self.ready = ready
+        self.replicas = replicas
+        self.up_to_date = up_to_date
+        self.available = available
+        self.created = created
+        self.selector = selector
+
+    @property
+    def age(self) -> float:
+        """Age of the deployment in seconds."""
+        return time.time() - self.created
+
+    def row(self) -> list:
+        """Returns the values displayed in the deployments table."""
+        return [self.name, f"{self.ready}/{self.replicas}", str(self.up_to_date), str(self.available), format_age(self.age)]
+
+    def data(self) -> dict:
+        """Returns the typed values written in the structured output modes."""
+        return {
+            "name": self.name, "ready": self.ready, "replicas": self.replicas, "up_to_date": self.up_to_date,
+            "available": self.available, "selector": self.selector, "created": format_timestamp(self.created), "age": int(self.age)
+        }
+
+class Pod:
+    """A Kubernetes pod with its readiness and restart counters."""
+
+    __slots__ = ('name', 'ready', 'containers', 'status', 'restarts', 'created')
+
+    headers = ['Name', 'Ready', 'Status', 'Restarts', 'Age']
+
+    def __init__(self, name: str, ready: int, containers: int, status: str, restarts: int, created: float):
+        self.name = name
+        self.ready = ready
+        self.containers = containers
+        self.status = status
+        self.restarts = restarts
+        self.created = created
+
+    @property
+    def age(self) -> float:
+        """Age of the pod in seconds."""
+        return time.time() - self.created
+
+    def row(self) -> list:
+        """Returns the values displayed in the pods table."""
+        return [self.name, f"{self.ready}/{self.containers}", self.status, str(self.restarts), format_age(self.age)]
+
+    def data(self) -> dict:
+        """Returns the typed values written in the structured output modes."""
+        return {
+            "name": self.name, "ready": self.ready, "containers": self.containers, "status": self.status,
+            "restarts": self.restarts, "created": format_timestamp(self.created), "age": int(self.age)
+        }
+
+def record_values(record) -> list:
+    """
+    Serializes a record into the list of its slot values, in constructor order.
+
+    Args:
+        record (Namespace | Deployment | Pod): The record.
+
+    Returns:
+        list: The values, so that `type(record)(*values)` rebuilds it.
+    """
+    return [getattr(record, name) for name in record.__slots__]
+
+def _items(document) -> list:
+    """
+    Returns the items of a `kubectl get -o json` list.
+
+    Args:
+        document (str | dict): The raw JSON output or the already decoded document.
+
+    Raises:
+        ValueError: If the output is not valid JSON.
+    """
+    if isinstance(document, str):
+        document = json.loads(document)
+    return document.get('items') or []
+
+def parse_namespace(item: dict) -> Namespace:
+    """Builds a Namespace record from a namespace object."""
+    metadata = item.get('metadata', {})
+    return Namespace(
+        metadata.get('name', ''),
+        item.get('status', {}).get('phase', 'Unknown'),
+        parse_timestamp(metadata.get('creationTimestamp'))
+    )
+
+def label_selector(selector: dict) -> str:
+    """
+    Converts a Kubernetes `LabelSelector` into the string syntax accepted by `kubectl -l`.
+
+    Args:
+        selector (dict): The selector with `matchLabels` and/or `matchExpressions`.
+
+    Returns:
+        str: The selector string (e.g. 'app=api,tier in (web,worker)'), or an empty string.
+
+    Example:
+        >>> label_selector({'matchLabels': {'app': 'api'}})
+        'app=api'
+    """
+    terms = [f"{key}={value}" for key, value in (selector.get('matchLabels') or {}).items()]
+
+    for expression in selector.get('matchExpressions') or []:
+        key = expression.get('key')
+        operator = expression.get('operator')
+        values = ','.join(expression.get('values') or [])
+        if operator == 'In':
+            terms.append(f"{key} in ({values})")
+        elif operator == 'NotIn':
+            terms.append(f"{key} notin ({values})")
+        elif operator == 'Exists':
+            terms.append(key)
+        elif operator == 'DoesNotExist':
+            terms.append(f"!{key}")
+
+    return ','.join(terms)
+
+def parse_deployment(item: dict) -> Deployment:
+    """Builds a Deployment record from a deployment object."""
+    metadata = item.get('metadata', {})
+    spec = item.get('spec', {})
+    status = item.get('status', {})
+    return Deployment(
+        metadata.get('name', ''),
+        int(status.get('readyReplicas', 0)),
+        int(spec.get('replicas', status.get('replicas', 0))),
+        int(status.get('updatedReplicas', 0)),
+        int(status.get('availableReplicas', 0)),
+        parse_timestamp(metadata.get('creationTimestamp')),
+        label_selector(spec.get('selector') or {})
+    )
+
+def pod_status(item: dict) -> str:
+    """
+    Computes the status shown for a pod, following the same precedence as `kubectl get pods`.
+
+    Args:
+        item (dict): The pod object.
+
+    Returns:
+        str: The pod status (e.g. 'Running', 'CrashLoopBackOff', 'Init:0/1' or 'Terminating').
+    """
+    status = item.get('status', {})
+    reason = status.get('reason') or status.get('phase') or 'Unknown'
+
+    # Init containers that did not complete take precedence
+    init_statuses = status.get('initContainerStatuses') or []
+    for index, container in enumerate(init_statuses):
+        state = container.get('state', {})
+        terminated = state.get('terminated')
+        if terminated and terminated.get('exitCode') == 0:
+            continue
+        if terminated:
+            reason = f"Init:{terminated.get('reason') or 'ExitCode:' + str(terminated.get('exitCode'))}"
+        elif state.get('waiting', {}).get('reason', 'PodInitializing') != 'PodInitializing':
+            reason = f"Init:{state['waiting']['reason']}"
+        else:
+            reason = f"Init:{index}/{len(init_statuses)}"
+        break
+    else:
+        # Then the last container that is waiting or terminated
+        for container in reversed(status.get('containerStatuses') or []):
+            state = container.get('state', {})
+            if state.get('waiting', {}).get('reason'):
+                reason = state['waiting']['reason']
+            elif state.get('terminated'):
+                terminated = state['terminated']
+                reason = terminated.get('reason') or f"ExitCode:{terminated.get('exitCode')}"
+
+    if item.get('metadata', {}).get('deletionTimestamp'):
+        reason = 'Terminating'
+
+    return reason
+
+def parse_pod(item: dict) -> Pod:
+    """Builds a Pod record from a pod object."""
+    metadata = item.get('metadata', {})
+    statuses = item.get('status', {}).get('containerStatuses') or []
+
+    ready = 0
+    restarts = 0
+    for container in statuses:
+        ready += 1 if container.get('ready') else 0
+        restarts += int(container.get('restartCount', 0))
+
+    return Pod(
+        metadata.get('name', ''),
+        ready,
+        len(item.get('spec', {}).get('containers') or statuses),
+        pod_status(item),
+        restarts,
+        parse_timestamp(metadata.get('creationTimestamp'))
+    )
+
+def parse_namespaces(document) -> list:
+    """
+    Parses the output of `kubectl get namespaces -o json`.
+
+    Args:
+        document (str | dict): The raw JSON output or the decoded document.
+
+    Returns:
+        list: The Namespace records.
+    """
+    return [parse_namespace(item) for item in _items(document)]
+
+def parse_deployments(document) -> list:
+    """
+    Parses the output of `kubectl get deployments -o json`.
+
+    Args:
+        document (str | dict): The raw JSON output or the decoded document.
+
+    Returns:
+        list: The Deployment records.
+    """
+    return [parse_deployment(item) for item in _items(document)]
+
+def parse_pods(document) -> list:
+    """
+    Parses the output of `kubectl get pods -o json`.
+
+    Args:
+        document (str | dict): The raw JSON output or the decoded document.
+
+    Returns:
+        list: The Pod records.
+    """
+    return [parse_pod(item) for item in _items(document)]
@@ -0,0 +1,255 @@
+import os
+import re
+import time
+import random
+import shutil
+import threading
+import subprocess
+from lib.output import Console
+from lib.helpers import format_bytes
+from lib.tracing import tracer
+
+# Errors of the API server or the network that usually succeed when the request is repeated
+TRANSIENT_ERRORS = re.compile(
+    r'connection (refused|reset)|i/o timeout|TLS handshake timeout|Unable to connect to the server'
+    r'|server is currently unable to handle the request|etcdserver: (request timed out|leader changed)'
+    r'|GOAWAY|unexpected EOF|Too ?Many ?Requests|Service ?Unavailable|Bad Gateway|Gateway Time-?out|InternalError'
+    r'|context deadline exceeded|net/http: request canceled'
+    # Status codes only count when they follow a status label, never as part of a name or a number
+    r'|\b(status( code)?|HTTP(/[\d.]+)?)[ :=]+\(?(429|502|503|504)\b',
+    re.IGNORECASE
+)
+
+def command_name(command: list) -> str:
+    """
+    Returns the name a command is grouped under in the statistics: the program and its sub-commands.
+
+    Example:
+        >>> command_name(['kubectl', 'get', '--raw', '/api/v1/namespaces'])
+        'kubectl get'
+        >>> command_name(['az', 'aks', 'get-credentials', '--name', 'aks'])
+        'az aks get-credentials'
+    """
+    words = [os.path.splitext(os.path.basename(command[0]))[0]]
+    for argument in command[1:3]:
+        if not re.fullmatch(r'[a-z][a-z-]*', argument):
+            break
+        words.append(argument)
+    return ' '.join(words)
+
+class CommandStats:
+    """Calls, failures, retries, time and output size of one command name."""
+
+    __slots__ = ('name', 'calls', 'failures', 'retries', 'seconds', 'slowest', 'output', 'exit_codes')
+
+    headers = ['Command', 'Calls', 'Failures', 'Retries', 'Total', 'Slowest', 'Average', 'Output']
+
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.failures = 0
+        self.retries = 0
+        self.seconds = 0.0
+        self.slowest = 0.0
+        self.output = 0
+        self.exit_codes = {}
+
+    def row(self) -> list:
+        """Returns the values displayed in the statistics table."""
+        average = self.seconds / self.calls if self.calls else 0.0
+        return [
+            self.name, str(self.calls), str(self.failures), str(self.retries),
+            f"{self.seconds:.2f}s", f"{self.slowest:.2f}s", f"{average:.2f}s", format_bytes(self.output)
+        ]
+
+class CommandRunner:
+    """
+    Single execution layer for the `az` and `kubectl` commands.
+
+    Commands are argument lists executed directly, without a shell. The programs are resolved once
+    on the PATH (so `az.cmd` works on Windows), each call has a timeout, failures that look transient
+    are retried with jittered exponential backoff, and the duration, exit code and output size of
+    every call are recorded per command name. A program can be validated just before its first call
+    (see `require`), so a run only pays for checking the tools it actually uses.
+    """
+
+    def __init__(self, timeout: float = 60, retries: int = 2, delay: float = 1.0):
+        """
+        Initializes the runner.
+
+        Args:
+            timeout (float, optional): Default seconds allowed per attempt. Defaults to 60.
+            retries (int, optional): Default retries of a transient failure. Defaults to 2.
+            delay (float, optional): Seconds before the first retry, doubled on each retry. Defaults to 1.0.
+        """
+        self.timeout = timeout
+        self.retries = retries
+        self.delay = delay
+        self.stats = {}
+        self._programs = {}
+        self._checks = {}
+        self._lock = threading.Lock()
+        self._checking = threading.RLock()
+
+    def configure(self, timeout: float = None, retries: int = None, delay: float = None):
+        """Changes the defaults of the following calls; None keeps the current value."""
+        if timeout is not None:
+            self.timeout = timeout
+        if retries is not None:
+            self.retries = retries
+        if delay is not None:
+            self.delay = delay
+
+    def require(self, program: str, check):
+        """
+        Registers the validation of a program, run once before its first call.
+
+        Args:
+            program (str): The program (e.g. 'az' or 'kubectl').
+            check (callable): Called without arguments; it may run the program itself and raises to
+                              stop the call. A failed check is run again by the next call.
+        """
+        self._checks[program] = check
+
+    def validate(self, program: str):
+        """Runs the pending validation of a program, if any, waiting for one already running in another thread."""
+        with self._checking:
+            check = self._checks.pop(program, None)
+            if check is None:
+                return
+            try:
+                check()
+            except BaseException:
+                self._checks[program] = check
+                raise
+
+    def resolve(self, command: list) -> list:
+        """
+        Replaces the program of a command by its full path on the PATH, validating it on its first call.
+
+        Raises:
+            subprocess.CalledProcessError: With exit code 127, as a shell would, if the program is not found.
+
+        Returns:
+            list: The command to execute.
+        """
+        program = command[0]
+        if program in self._checks:
+            self.validate(program)
+        if program not in self._programs:
+            self._programs[program] = shutil.which(program)
+        if not self._programs[program]:
+            raise subprocess.CalledProcessError(127, command, '', f"{program}: command not found")
+        return [self._programs[program]] + list(command[1:])
+
+    def record(self, command: list, seconds: float, returncode: int, output: int = 0, retries: int = 0,
+               started: float = None):
+        """
+        Adds a finished call to the statistics.
+
+        Args:
+            command (list): The command.
+            seconds (float): The duration of the call, including its retries.
+            returncode (int): The exit code of the last attempt.
+            output (int, optional): The bytes written to the standard output. Defaults to 0.
+            retries (int, optional): The number of retries. Defaults to 0.
+            started (float, optional): The `time.perf_counter()` at which the call started.
+        """
+        name = command_name(command)
+        if started is None:
+            started = time.perf_counter() - seconds
+        tracer.complete(name, started, seconds, command=' '.join(command)[:200], exit_code=returncode, output=output, retries=retries)
+
+        with self._lock:
+            stats = self.stats.get(name)
+            if stats is None:
+                stats = self.stats[name] = CommandStats(name)
+            stats.calls += 1
+            stats.failures += 1 if returncode != 0 else 0
+            stats.retries += retries
+            stats.seconds += seconds
+            stats.slowest = max(stats.slowest, seconds)
+            stats.output += output
+            stats.exit_codes[returncode] = stats.exit_codes.get(returncode, 0) + 1
+
+    def run(self, command: list, timeout: float = 0, retries: int = None, check: bool = True,
+            input: str = None) -> subprocess.CompletedProcess:
+        """
+        Executes a command and captures its text output.
+
+        Args:
+            command (list): The program and its arguments.
+            timeout (float, optional): Seconds allowed per attempt; 0 uses the runner's default and None
+                                       disables it. Defaults to 0.
+            retries (int, optional): Retries of a transient failure or timeout. Defaults to the runner's.
+            check (bool, optional): If True, a non-zero exit code raises an error. Defaults to True.
+            input (str, optional): Text sent to the standard input. Defaults to None.
+
+        Raises:
+            subprocess.CalledProcessError: If the command fails, is not found or times out (exit code -1).
+
+        Returns:
+            subprocess.CompletedProcess: The result of the last attempt.
+        """
+        timeout = self.timeout if timeout == 0 else timeout
+        retries = self.retries if retries is None else retries
+        argv = self.resolve(command)
+        started = time.perf_counter()
+        attempt = 0
+
+        while True:
+            try:
+                result = subprocess.run(argv, capture_output=True, text=True, input=input, timeout=timeout)
+            except subprocess.TimeoutExpired as e:
+                stdout = e.stdout.decode('utf-8', 'replace') if isinstance(e.stdout, bytes) else e.stdout or ''
+                result = subprocess.CompletedProcess(argv, -1, stdout, f"Command timed out after {timeout}s")
+
+            transient = result.returncode == -1 or (result.returncode != 0 and TRANSIENT_ERRORS.search(result.stderr or ''))
+            if not transient or attempt >= retries:
+                break
+
+            wait = self.delay * (2 ** attempt) * random.uniform(0.5, 1.5)
+            attempt += 1
+            message = (result.stderr or '').strip().splitlines() or ['no output']
+            Console.textWarning(f"{command_name(command)} failed ({message[-1]}). Retry {attempt}/{retries} in {wait:.1f}s...")
+            time.sleep(wait)
+
+        self.record(command, time.perf_counter() - started, result.returncode, len(result.stdout or ''), attempt, started)
+
+        if check and result.returncode != 0:
+            raise subprocess.CalledProcessError(result.returncode, command, result.stdout, result.stderr)
+        return result
+
+    def popen(self, command: list, **kwargs) -> subprocess.Popen:
+        """
+        Starts a streaming command (watch, tar) without a shell; its caller records it with `record`.
+
+        Raises:
+            subprocess.CalledProcessError: With exit code 127 if the program is not found.
+        """
+        return subprocess.Popen(self.resolve(command), **kwargs)
+
+    def interactive(self, command: list) -> int:
+        """
+        Runs a command attached to the terminal, such as a shell session.
+
+        Raises:
+            subprocess.CalledProcessError: If the command fails.
+
+        Returns:
+            int: The exit code.
+        """
+        started = time.perf_counter()
+        returncode = subprocess.run(self.resolve(command)).returncode
+        self.record(command, time.perf_counter() - started, returncode, 0, 0, started)
+        if returncode != 0:
+            raise subprocess.CalledProcessError(returncode, command)
+        return returncode
+
+    def summary(self) -> list:
+        """Returns the statistics of every command name, the most time consuming first."""
+        with self._lock:
+            return sorted(self.stats.values(), key=lambda stats: stats.seconds, reverse=True)
+
+# Runner shared by every module, configured once by `Azure`
+runner = CommandRunner()
@@ -0,0 +1,282 @@
+import os
+import json
+import time
+import shutil
+from pathlib import Path
+from datetime import datetime, timezone
+from lib.output import Console
+from azure.backup import file_digest
+
+# Snapshot names are UTC timestamps, sortable and valid folder names on every platform
+SNAPSHOT_FORMAT = '%Y-%m-%dT%H-%M-%SZ'
+
+def link_or_copy(source: Path, target: Path):
+    """
+    Hard links a file, copying it when the filesystem does not support hard links.
+
+    Args:
+        source (Path): The existing file.
+        target (Path): The new path.
+    """
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copy2(source, target)
+
+def snapshot_time(name: str) -> datetime:
+    """Returns the UTC creation time encoded in a snapshot name."""
+    return datetime.strptime(name, SNAPSHOT_FORMAT).replace(tzinfo=timezone.utc)
+
+def retained_snapshots(names: list, keep_last: int = 0, keep_daily: int = 0, keep_weekly: int = 0) -> set:
+    """
+    Applies a retention policy to a list of snapshots.
+
+    The newest `keep_last` snapshots are kept, then the newest snapshot of each of the last
+    `keep_daily` days and of each of the last `keep_weekly` ISO weeks that have snapshots.
+    The newest snapshot is always kept. Without any policy, every snapshot is kept.
+
+    Args:
+        names (list): The snapshot names.
+        keep_last (int, optional): Number of most recent snapshots to keep. Defaults to 0.
+        keep_daily (int, optional): Number of days to keep one snapshot for. Defaults to 0.
+        keep_weekly (int, optional): Number of weeks to keep one snapshot for. Defaults to 0.
+
+    Returns:
+        set: The names of the snapshots to keep.
+
+    Example:
+        >>> retained_snapshots(['2025-01-06T10-00-00Z', '2025-01-07T09-00-00Z', '2025-01-07T18-00-00Z'], keep_daily=2)
+        {'2025-01-06T10-00-00Z', '2025-01-07T18-00-00Z'}
+    """
+    if not (keep_last or keep_daily or keep_weekly):
+        return set(names)
+
+    newest_first = sorted(names, reverse=True)
+    keep = set(newest_first[:max(int(keep_last or 0), 1)])
+
+    for limit, bucket in ((keep_daily, lambda moment: moment.date()), (keep_weekly, lambda moment: moment.isocalendar()[:2])):
+        seen = set()
+        for name in newest_first:
+            if len(seen) >= int(limit or 0):
+                break
+            key = bucket(snapshot_time(name))
+            if key not in seen:
+                seen.add(key)
+                keep.add(name)
+
+    return keep
+
+class SnapshotStore:
+    """
+    A folder of dated backups whose file contents are stored once.
+
+    Every file content lives in `objects/<aa>/<sha256>`; each snapshot is a regular folder tree in
+    `snapshots/<timestamp>/` whose files are hard links to those objects, described by the manifest
+    `snapshots/<timestamp>.json`. Unchanged files cost no extra space, so the store grows only with
+    the content that actually changed.
+    """
+
+    def __init__(self, root: Path):
+        """
+        Initializes the store.
+
+        Args:
+            root (Path): The store folder (e.g. backups/<pod>).
+        """
+        self.root = Path(root)
+        self.objects = self.root / 'objects'
+        self.folder = self.root / 'snapshots'
+
+    def exists(self) -> bool:
+        """Returns True if the folder holds a store, even one whose snapshots were all interrupted."""
+        return self.folder.is_dir() or self.objects.is_dir()
+
+    def snapshots(self) -> list:
+        """Returns the names of the completed snapshots, oldest first."""
+        if not self.folder.is_dir():
+            return []
+        return sorted(path.stem for path in self.folder.glob('*.json'))
+
+    def path(self, name: str) -> Path:
+        """Returns the folder of a snapshot."""
+        return self.folder / name
+
+    def manifest(self, name: str, strict: bool = False) -> dict:
+        """
+        Loads the files of a snapshot.
+
+        Args:
+            name (str): The snapshot name.
+            strict (bool, optional): If True, an unreadable manifest raises instead of reading as empty. Defaults to False.
+
+        Raises:
+            ValueError: In strict mode, if the manifest cannot be read or is malformed.
+
+        Returns:
+            dict: The files ({path: [size, mtime, sha256]}), or an empty dictionary if unreadable.
+        """
+        try:
+            with open(self.folder / f"{name}.json", 'r', encoding='utf-8') as file:
+                files = json.load(file)['files']
+            if not isinstance(files, dict) or not all(isinstance(entry, list) and len(entry) == 3 for entry in files.values()):
+                raise ValueError("malformed file list")
+            return files
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            if strict:
+                raise ValueError(f"The manifest of snapshot {name} cannot be read: {e}") from e
+            return {}
+
+    def begin(self) -> tuple:
+        """
+        Starts a new snapshot, discarding the ones left incomplete by interrupted runs.
+
+        Returns:
+            tuple: The snapshot name and the temporary folder to fill.
+        """
+        self.folder.mkdir(parents=True, exist_ok=True)
+        for partial in self.folder.glob('*.partial'):
+            shutil.rmtree(partial, ignore_errors=True)
+
+        name = datetime.now(timezone.utc).strftime(SNAPSHOT_FORMAT)
+        while (self.folder / f"{name}.json").exists():
+            # Snapshot names have a one second resolution
+            time.sleep(1)
+            name = datetime.now(timezone.utc).strftime(SNAPSHOT_FORMAT)
+
+        partial = self.folder / f"{name}.partial"
+        partial.mkdir()
+        return name, partial
+
+    def link(self, source: Path, target: Path, paths: list):
+        """
+        Adds unchanged files to a snapshot as hard links to the same files of a previous one.
+
+        Args:
+            source (Path): The folder of the previous snapshot.
+            target (Path): The folder of the new snapshot.
+            paths (list): The relative paths to link.
+        """
+        folders = set()
+        for path in paths:
+            destination = target / path
+            if destination.parent not in folders:
+                destination.parent.mkdir(parents=True, exist_ok=True)
+                folders.add(destination.parent)
+            link_or_copy(source / path, destination)
+
+    def ingest(self, folder: Path, paths: list) -> tuple:
+        """
+        Moves the contents of new files into the object store.
+
+        Each file is hashed; if its content is already stored, the file is replaced by a link to
+        the object, otherwise the file becomes the object.
+
+        Args:
+            folder (Path): The folder of the new snapshot.
+            paths (list): The relative paths of the files written by the transfer.
+
+        Returns:
+            tuple: The digest of every path ({path: sha256}), the new objects and their bytes.
+        """
+        digests = {}
+        new_objects = 0
+        new_bytes = 0
+
+        for path in paths:
+            file = folder / path
+            digest = file_digest(file)
+            stored = self.objects / digest[:2] / digest
+
+            if stored.exists():
+                file.unlink()
+                link_or_copy(stored, file)
+            else:
+                stored.parent.mkdir(parents=True, exist_ok=True)
+                link_or_copy(file, stored)
+                new_objects += 1
+                new_bytes += file.stat().st_size
+
+            digests[path] = digest
+
+        return digests, new_objects, new_bytes
+
+    def commit(self, name: str, partial: Path, origin: str, files: dict):
+        """
+        Completes a snapshot: the folder is renamed and its manifest written last.
+
+        Args:
+            name (str): The snapshot name.
+            partial (Path): The temporary folder returned by `begin`.
+            origin (str): The folder inside the pod.
+            files (dict): The files of the snapshot ({path: [size, mtime, sha256]}).
+        """
+        os.replace(partial, self.path(name))
+
+        manifest = self.folder / f"{name}.json"
+        tmp_path = manifest.with_name(manifest.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump({"origin": origin, "created": name, "files": files}, file)
+        os.replace(tmp_path, manifest)
+
+    def prune(self, keep_last: int = 0, keep_daily: int = 0, keep_weekly: int = 0) -> list:
+        """
+        Removes the snapshots that fall outside the retention policy.
+
+        Args:
+            keep_last (int, optional): Number of most recent snapshots to keep. Defaults to 0.
+            keep_daily (int, optional): Number of days to keep one snapshot for. Defaults to 0.
+            keep_weekly (int, optional): Number of weeks to keep one snapshot for. Defaults to 0.
+
+        Returns:
+            list: The names of the removed snapshots.
+        """
+        names = self.snapshots()
+        keep = retained_snapshots(names, keep_last, keep_daily, keep_weekly)
+        removed = [name for name in names if name not in keep]
+
+        for name in removed:
+            # The manifest goes first, so a half removed snapshot is never listed
+            (self.folder / f"{name}.json").unlink()
+            shutil.rmtree(self.path(name), ignore_errors=True)
+
+        return removed
+
+    def collect_garbage(self) -> tuple:
+        """
+        Deletes the objects no longer referenced by any snapshot manifest.
+
+        Nothing is deleted when a manifest cannot be read: the objects of that snapshot would all look
+        unreferenced, and collecting them would destroy it.
+
+        Returns:
+            tuple: The number of objects deleted and the bytes freed.
+        """
+        referenced = set()
+        for name in self.snapshots():
+            try:
+                referenced.update(entry[2] for entry in self.manifest(name, strict=True).values())
+            except ValueError as e:
+                Console.textWarning(f"Garbage collection skipped: {e}")
+                return 0, 0
+
+        deleted = 0
+        freed = 0
+        if not self.objects.is_dir():
+            return deleted, freed
+
+        for bucket in self.objects.iterdir():
+            for stored in bucket.iterdir():
+                if stored.name not in referenced:
+                    freed += stored.stat().st_size
+                    stored.unlink()
+                    deleted += 1
+            if not any(bucket.iterdir()):
+                bucket.rmdir()
+
+        return deleted, freed
+
+    def size(self) -> int:
+        """Returns the bytes used by the stored objects."""
+        if not self.objects.is_dir():
+            return 0
+        return sum(stored.stat().st_size for bucket in self.objects.iterdir() for stored in bucket.iterdir())
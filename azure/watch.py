@@ -0,0 +1,30 @@
+import json
+
+def iter_watch_events(stream):
+    """
+    Decodes the events of `kubectl get --watch --output-watch-events -o json` as they arrive.
+
+    kubectl writes one pretty-printed JSON object per event, whose closing brace is the only
+    line starting at column zero. Lines are buffered until that brace, so each event is decoded
+    exactly once and the buffer never holds more than a single event.
+
+    Args:
+        stream (file): The text stream of the kubectl process.
+
+    Yields:
+        tuple: The event type ('ADDED', 'MODIFIED', 'DELETED', 'BOOKMARK' or 'ERROR') and its object.
+    """
+    buffer = []
+    for line in stream:
+        buffer.append(line)
+        if not line.startswith('}') and not (line.startswith('{') and line.rstrip().endswith('}')):
+            continue
+
+        try:
+            event = json.loads(''.join(buffer))
+        except ValueError:
+            # The brace belonged to a nested value; keep reading
+            continue
+
+        buffer.clear()
+        yield event.get('type', ''), event.get('object') or {}
@@ -0,0 +1,75 @@
+"""
+Benchmark of the backup transports on a synthetic tree of small files.
+
+It compares the `kubectl cp` path of `Azure.runBackup` with the tar stream over
+`kubectl exec` (`stream_tar`), uncompressed and compressed, using the fake kubectl in
+`benchmarks/shims` so no cluster is needed. The link to the API server is emulated with
+a bandwidth limit.
+
+Usage:
+    python -B benchmarks/bench_backup_transport.py [--files 100000] [--size 1024] [--bandwidth 20]
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent))
+
+from azure.backup import stream_tar
+from harness import build_tree
+
+ORIGIN = '/var/www/app'
+
+def run_cp(destination: Path) -> None:
+    """The `kubectl cp` command issued by `Azure.runBackup`; the shim does not report the bytes sent."""
+    subprocess.run(["kubectl", "cp", f"bench/pod:{ORIGIN}", str(destination)], check=True, capture_output=True)
+    return None
+
+def run_tar(destination: Path, compression: str, level: int = None) -> int:
+    """The tar stream over `kubectl exec`; returns the bytes received."""
+    return stream_tar("bench", "pod", ORIGIN, destination=destination, compression=compression, level=level)['bytes']
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--files", type=int, default=100000)
+    parser.add_argument("--size", type=int, default=1024, help="Average file size in bytes")
+    parser.add_argument("--bandwidth", type=float, default=20, help="Emulated link in MiB/s (0 = unlimited)")
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="bench-backup-"))
+    os.environ['BENCH_POD_ROOT'] = str(workdir / 'pod')
+    os.environ['BENCH_BANDWIDTH'] = str(int(args.bandwidth * 1024 * 1024))
+    os.environ['PATH'] = f"{BENCH_DIR / 'shims'}{os.pathsep}{os.environ['PATH']}"
+
+    try:
+        start = time.perf_counter()
+        build_tree(workdir / 'pod' / ORIGIN.lstrip('/'), args.files, args.size)
+        print(f"files: {args.files} | avg size: {args.size} B | link: {args.bandwidth or 'unlimited'} MiB/s "
+              f"| tree built in {time.perf_counter() - start:.1f}s")
+
+        cases = [
+            ("kubectl cp", run_cp),
+            ("tar over exec", lambda destination: run_tar(destination, 'none')),
+            ("tar over exec + gzip -1", lambda destination: run_tar(destination, 'gzip', 1)),
+            ("tar over exec + gzip -6", lambda destination: run_tar(destination, 'gzip', 6)),
+        ]
+
+        for name, function in cases:
+            destination = workdir / 'backup'
+            destination.mkdir()
+            start = time.perf_counter()
+            received = function(destination)
+            elapsed = time.perf_counter() - start
+            wire = f"{received / 1e6:8.1f} MB" if received is not None else "       - "
+            print(f"{name:<24}: {elapsed:7.2f} s | on the wire: {wire}")
+            shutil.rmtree(destination)
+
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
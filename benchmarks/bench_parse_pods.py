@@ -0,0 +1,79 @@
+"""
+Micro-benchmark of the pod listing parser on a synthetic 20k-pod namespace.
+
+It compares the JSON parser used by `Azure.listPods` with the previous whitespace
+splitting of the `kubectl get pods` table.
+
+Usage:
+    python -B benchmarks/bench_parse_pods.py [--pods 20000] [--repeat 5]
+"""
+
+import argparse
+import json
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from azure.resources import parse_pods
+
+def build_json(total: int) -> str:
+    """Builds a `kubectl get pods -o json` listing with `total` pods."""
+    items = []
+    for index in range(total):
+        items.append({
+            "metadata": {"name": f"app-deployment-{index:06d}-x7k2p", "creationTimestamp": "2025-01-07T10:00:00Z"},
+            "spec": {"containers": [{"name": "app"}, {"name": "sidecar"}]},
+            "status": {
+                "phase": "Running",
+                "containerStatuses": [
+                    {"name": "app", "ready": True, "restartCount": index % 7, "state": {"running": {}}},
+                    {"name": "sidecar", "ready": True, "restartCount": 0, "state": {"running": {}}},
+                ],
+            },
+        })
+    return json.dumps({"apiVersion": "v1", "kind": "List", "items": items}, indent=4)
+
+def build_table(total: int) -> str:
+    """Builds the equivalent `kubectl get pods` table."""
+    lines = ["NAME                              READY   STATUS    RESTARTS      AGE"]
+    for index in range(total):
+        lines.append(f"app-deployment-{index:06d}-x7k2p   2/2     Running   {index % 7} (3d ago)   283d")
+    return "\n".join(lines)
+
+def legacy_parse(stdout: str) -> list:
+    """The table parsing previously done by `Azure.listPods`."""
+    cleaned_output = re.sub(r"\([^)]* ago\)", "", stdout)
+    all_pods = []
+    for line in cleaned_output.splitlines()[1:]:
+        columns = line.split()
+        columns[-1] = columns[-1].replace('y', ' Years ').replace('d', ' Days ').replace('h', ' Hours ').replace('m', ' Minutes ').strip()
+        all_pods.append(columns)
+    return all_pods
+
+def measure(function, payload, repeat: int) -> float:
+    """Returns the best wall time of `repeat` runs."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(payload)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pods", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    json_payload = build_json(args.pods)
+    table_payload = build_table(args.pods)
+
+    json_time = measure(parse_pods, json_payload, args.repeat)
+    table_time = measure(legacy_parse, table_payload, args.repeat)
+
+    print(f"pods: {args.pods} | json payload: {len(json_payload) / 1e6:.1f} MB | table payload: {len(table_payload) / 1e6:.1f} MB")
+    print(f"parse_pods (json)      : {json_time * 1000:8.1f} ms")
+    print(f"legacy table splitting : {table_time * 1000:8.1f} ms")
@@ -0,0 +1,108 @@
+"""
+Start-up budget check: time to the first useful output of azure-cli.py, driven by the fake `az` and `kubectl`.
+
+Cases:
+    help            azure-cli.py --help, until the usage is printed and the process exits.
+    first-output    A run with a reused session and cached credentials (--no-banner --output plain),
+                    until the header of the namespace listing is printed.
+
+The median of each case must stay under its budget, otherwise the check fails (exit code 1). The
+budgets are absolute and generous, so the check catches start-up regressions (an eager import of a
+heavy module, a tool check or a command added before the first listing) rather than machine noise.
+What is imported and run before the first output is checked without timings by `tests/test_startup.py`.
+
+Usage:
+    python -B benchmarks/bench_startup.py [--repeat 7] [--help-budget 0.3] [--first-output-budget 1.0]
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import statistics
+import subprocess
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+ROOT_DIR = BENCH_DIR.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+import fixtures
+from harness import shim_environment
+from bench_suite import write_config, running_pod
+
+# Beginning of the first line worth waiting for in a run
+FIRST_OUTPUT = "Available Kubernetes namespaces"
+
+def time_to_output(command: list, environment: dict, marker: str = None) -> float:
+    """
+    Runs azure-cli.py and measures the seconds until a line starting with the marker is printed.
+
+    Args:
+        command (list): The arguments of azure-cli.py.
+        environment (dict): The environment of the process.
+        marker (str, optional): The beginning of the awaited line. Defaults to None (until the process exits).
+
+    Raises:
+        RuntimeError: If the process ends without printing the marker, or fails.
+
+    Returns:
+        float: The elapsed seconds.
+    """
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, '-B', str(ROOT_DIR / 'azure-cli.py'), *command], env=environment,
+        stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True
+    )
+    elapsed = None
+    output = []
+    for line in process.stdout:
+        output.append(line)
+        if marker and elapsed is None and line.startswith(marker):
+            elapsed = time.perf_counter() - start
+    returncode = process.wait()
+    if marker is None:
+        elapsed = time.perf_counter() - start
+    if returncode != 0 or elapsed is None:
+        raise RuntimeError(f"azure-cli.py {' '.join(command)} did not reach its first output ({returncode}):\n{''.join(output)[-2000:]}")
+    return elapsed
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=7, help="Runs per case")
+    parser.add_argument("--help-budget", type=float, default=0.3, help="Seconds allowed to print --help")
+    parser.add_argument("--first-output-budget", type=float, default=1.0, help="Seconds allowed to print the first listing")
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds added to every kubectl call")
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="bench-startup-"))
+    environment = {**os.environ, **shim_environment(workdir, latency=args.latency)}
+    environment["AZURE_CLI_CONFIG"] = str(write_config(workdir, running_pod(fixtures.build_cluster())))
+    run = ['--no-banner', '--output', 'plain']
+
+    cases = [
+        ("help", ['--help'], None, args.help_budget),
+        ("first-output", run, FIRST_OUTPUT, args.first_output_budget),
+    ]
+
+    failures = 0
+    try:
+        # A first run logs in and caches the credentials and the tool detection, as on a workstation
+        time_to_output(run, environment, FIRST_OUTPUT)
+
+        print(f"kubectl latency: {args.latency}s | runs: {args.repeat}")
+        for case, command, marker, budget in cases:
+            times = [time_to_output(command, environment, marker) for _ in range(args.repeat)]
+            median = statistics.median(times)
+            failures += median > budget
+            print(f"{case:<14} best {min(times) * 1000:7.1f} ms | median {median * 1000:7.1f} ms "
+                  f"| budget {budget * 1000:7.1f} ms{'  OVER BUDGET' if median > budget else ''}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
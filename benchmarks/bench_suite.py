@@ -0,0 +1,213 @@
+"""
+Benchmark suite of the whole tool, driven by the fake `az` and `kubectl` in `benchmarks/shims`.
+
+Cases:
+    flow-cold       azure-cli.py --backup --transport tar from scratch: login, tool detection, credentials,
+                    listings, selections and backup, in a subprocess.
+    flow-warm       The same run again, reusing the session, the credentials and the caches.
+    parse-*         The namespace, deployment and pod parsers on large JSON listings.
+    table           Console.table rendering of a large pod table.
+    backup-tar/cp   Azure.runBackup throughput with each transport, in process.
+
+The medians are compared with `benchmarks/baseline.json` and the run fails (exit code 1) when a case
+is slower than its baseline by more than the tolerance. Baselines depend on the machine: record one
+on the host that runs the comparison.
+
+Usage:
+    python -B benchmarks/bench_suite.py [--quick] [--only flow,parse] [--latency 0.05] [--save-baseline]
+"""
+
+import io
+import os
+import sys
+import json
+import shutil
+import argparse
+import tempfile
+import subprocess
+import contextlib
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+ROOT_DIR = BENCH_DIR.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+import fixtures
+from harness import shim_environment, build_tree, measure, load_baseline, save_baseline, compare
+
+ORIGIN = '/var/www/app'
+
+# Sizes of each profile: the cluster served to the flow, the parser listings, the table and the backup tree
+PROFILES = {
+    "quick": {"cluster": [10, 5, 3], "listing": [20, 20, 10], "table": 2000, "files": 1000, "size": 1024, "repeat": 3},
+    "full": {"cluster": [30, 10, 5], "listing": [40, 50, 10], "table": 20000, "files": 10000, "size": 1024, "repeat": 5},
+}
+
+def running_pod(cluster: dict, namespace: str = 'default') -> str:
+    """Returns the first running pod of the 'api' deployment, the one selected by the flow."""
+    for item in cluster['pods'][namespace]:
+        if item['metadata']['labels']['app'] == 'api' and item['status']['phase'] == 'Running':
+            return item['metadata']['name']
+    return cluster['pods'][namespace][0]['metadata']['name']
+
+def write_config(workdir: Path, pod: str) -> Path:
+    """Writes the configuration of the flow: every selection preset, a tar backup into the workdir."""
+    path = workdir / 'config.json'
+    path.write_text(json.dumps({
+        "tenant": "bench-tenant",
+        "subscription_id": "bench-subscription",
+        "credentials": {"resource-group": "bench-rg", "name": "bench-aks", "overwrite-existing": True},
+        "namespace": {"select": "default", "echo": True},
+        "deployments": {"select": "api", "echo": True},
+        "pods": {"select": pod, "echo": True},
+        "backup": {"folder": str(workdir / 'backups' / 'flow'), "origin": ORIGIN, "transport": "tar"},
+    }, indent=4))
+    return path
+
+def run_flow(environment: dict):
+    """Runs azure-cli.py end to end in a subprocess."""
+    result = subprocess.run(
+        [sys.executable, '-B', str(ROOT_DIR / 'azure-cli.py'), '--backup', '--transport', 'tar'],
+        env=environment, capture_output=True, text=True, stdin=subprocess.DEVNULL
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"azure-cli.py failed ({result.returncode}):\n{(result.stdout + result.stderr)[-2000:]}")
+
+def listing_json(kind: str, items: list) -> str:
+    """Serializes a listing like `kubectl get -o json`, which is what the parsers receive."""
+    return json.dumps(fixtures.listing(kind, items), indent=4)
+
+def table_rows(cluster: dict, total: int) -> list:
+    """Returns `total` pod rows of the synthetic cluster, as displayed by the pod listing."""
+    rows = []
+    for items in cluster['pods'].values():
+        for item in items:
+            statuses = item['status']['containerStatuses']
+            rows.append([
+                item['metadata']['name'], f"{sum(status['ready'] for status in statuses)}/{len(statuses)}",
+                item['status']['phase'], str(sum(status['restartCount'] for status in statuses)), "3 Days"
+            ])
+            if len(rows) == total:
+                return rows
+    return rows
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="Smaller sizes and fewer repetitions")
+    parser.add_argument("--only", help="Comma separated case prefixes to run (e.g. flow,parse)")
+    parser.add_argument("--repeat", type=int, help="Runs per case (default: 3 quick, 5 full)")
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds added to every kubectl call")
+    parser.add_argument("--az-latency", type=float, default=0.2, help="Seconds added to every az call")
+    parser.add_argument("--bandwidth", type=float, default=0, help="Emulated API server link in MiB/s (0 = unlimited)")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown against the baseline (0.25 = 25%%)")
+    parser.add_argument("--save-baseline", action="store_true", help="Store the results as the baseline of the profile")
+    args = parser.parse_args()
+
+    profile = "quick" if args.quick else "full"
+    sizes = PROFILES[profile]
+    repeat = args.repeat or sizes['repeat']
+    settings = {**sizes, "latency": args.latency, "az_latency": args.az_latency, "bandwidth": args.bandwidth}
+    selected = lambda case: not args.only or case.startswith(tuple(args.only.split(',')))
+
+    workdir = Path(tempfile.mkdtemp(prefix="bench-suite-"))
+    environment = shim_environment(workdir, *sizes['cluster'], latency=args.latency, az_latency=args.az_latency,
+                                   bandwidth=args.bandwidth * 1024 * 1024)
+    os.environ.update(environment)
+
+    # The project modules read the cache folder when imported, so they are loaded once the environment is set
+    from lib.output import Console
+    from azure.cli_manager import Azure
+    from azure.resources import parse_namespaces, parse_deployments, parse_pods
+
+    results = {}
+
+    def run(case: str, function, setup=None, runs: int = repeat):
+        if not selected(case):
+            return
+        results[case] = measure(function, runs, setup)
+        print(f"{case:<20} best {results[case]['best'] * 1000:9.1f} ms | median {results[case]['median'] * 1000:9.1f} ms")
+
+    try:
+        build_tree(workdir / 'pod' / ORIGIN.lstrip('/'), sizes['files'], sizes['size'])
+        print(f"profile: {profile} | cluster: {'x'.join(map(str, sizes['cluster']))} | files: {sizes['files']} "
+              f"| kubectl latency: {args.latency}s | az latency: {args.az_latency}s | runs: {repeat}")
+
+        # End to end flow in a subprocess
+        flow_environment = {**os.environ, "AZURE_CLI_CONFIG": str(write_config(workdir, running_pod(fixtures.build_cluster(*sizes['cluster']))))}
+
+        def clear_state():
+            for folder in ('azure', 'cache', 'backups'):
+                shutil.rmtree(workdir / folder, ignore_errors=True)
+
+        run("flow-cold", lambda: run_flow(flow_environment), setup=clear_state)
+        if selected("flow-warm"):
+            run_flow(flow_environment)
+        run("flow-warm", lambda: run_flow(flow_environment))
+
+        # Parsers, on the JSON text as returned by kubectl
+        if selected("parse"):
+            cluster = fixtures.build_cluster(*sizes['listing'])
+            namespaces = listing_json('NamespaceList', cluster['namespaces'])
+            deployments = listing_json('DeploymentList', [item for items in cluster['deployments'].values() for item in items])
+            pods = listing_json('PodList', [item for items in cluster['pods'].values() for item in items])
+            run("parse-namespaces", lambda: parse_namespaces(namespaces))
+            run("parse-deployments", lambda: parse_deployments(deployments))
+            run("parse-pods", lambda: parse_pods(pods))
+
+        # Table rendering, into memory so the terminal speed is not measured
+        if selected("table"):
+            rows = table_rows(fixtures.build_cluster(*sizes['listing']), sizes['table'])
+            headers = ["Pod Name", "Ready", "Status", "Restarts", "Age"]
+
+            def render():
+                with contextlib.redirect_stdout(io.StringIO()):
+                    Console.table(headers=headers, rows=rows)
+
+            run("table", render)
+
+        # Backup throughput, in process
+        if selected("backup"):
+            with contextlib.redirect_stdout(io.StringIO()):
+                azure = Azure()
+            folder = workdir / 'backups' / 'inprocess'
+
+            def backup(transport: str):
+                with contextlib.redirect_stdout(io.StringIO()):
+                    azure.runBackup(folder=str(folder), origin=ORIGIN, transport=transport, namespace='bench', pod='pod', progress=False)
+                    azure.close()
+
+            try:
+                run("backup-tar", lambda: backup('tar'))
+                run("backup-cp", lambda: backup('cp'))
+            finally:
+                azure.close()
+
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.save_baseline:
+        save_baseline(profile, settings, results)
+        print(f"baseline of the '{profile}' profile saved")
+        return 0
+
+    reference = load_baseline().get(profile)
+    if not reference:
+        print(f"no '{profile}' baseline, run with --save-baseline to record one")
+        return 0
+    if reference.get('settings') != settings:
+        print(f"the '{profile}' baseline was recorded with other settings, comparison skipped")
+        return 0
+
+    regressions = 0
+    print(f"\ncompared with the baseline of {reference.get('recorded')} (tolerance {args.tolerance:.0%}):")
+    for case, seconds, previous, ratio, regressed in compare(results, reference['results'], args.tolerance):
+        if previous is None:
+            print(f"{case:<20} {seconds * 1000:9.1f} ms | no baseline")
+            continue
+        regressions += regressed
+        print(f"{case:<20} {seconds * 1000:9.1f} ms | baseline {previous * 1000:9.1f} ms | {ratio:5.2f}x{'  REGRESSION' if regressed else ''}")
+
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,165 @@
+"""
+Synthetic cluster content shared by the fake `kubectl` and the benchmarks.
+
+The cluster is deterministic for a given size: N namespaces, each with the same number of
+deployments, each with the same number of pods. A few pods are unhealthy (restarting, pending
+or crashing) so the listings look like the ones of a real cluster.
+"""
+
+import random
+from datetime import datetime, timedelta, timezone
+
+CREATED = datetime(2025, 1, 7, 10, 0, 0, tzinfo=timezone.utc)
+RESOURCE_VERSION = "4815162342"
+
+def timestamp(days: int = 0) -> str:
+    """Returns an RFC 3339 creation timestamp `days` after the reference date."""
+    return (CREATED + timedelta(days=days)).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+def namespace_names(namespaces: int) -> list:
+    """Returns the namespace names of a cluster, the usual system ones first."""
+    names = ['default', 'kube-system', 'monitoring']
+    names += [f"team-{index:03d}" for index in range(max(namespaces - len(names), 0))]
+    return names[:namespaces]
+
+def namespace_item(name: str, index: int = 0) -> dict:
+    """Builds a namespace object."""
+    return {
+        "apiVersion": "v1", "kind": "Namespace",
+        "metadata": {
+            "name": name, "uid": f"ns-{index:08d}", "resourceVersion": str(1000 + index),
+            "creationTimestamp": timestamp(index), "labels": {"kubernetes.io/metadata.name": name}
+        },
+        "spec": {"finalizers": ["kubernetes"]},
+        "status": {"phase": "Active"}
+    }
+
+def deployment_item(namespace: str, name: str, replicas: int, index: int = 0) -> dict:
+    """Builds a deployment object whose pods are labelled `app=<name>`."""
+    ready = replicas - (1 if replicas and index % 7 == 3 else 0)
+    return {
+        "apiVersion": "apps/v1", "kind": "Deployment",
+        "metadata": {
+            "name": name, "namespace": namespace, "uid": f"dp-{index:08d}", "generation": 3,
+            "resourceVersion": str(2000 + index), "creationTimestamp": timestamp(index % 300),
+            "labels": {"app": name}, "annotations": {"deployment.kubernetes.io/revision": "3"}
+        },
+        "spec": {
+            "replicas": replicas,
+            "selector": {"matchLabels": {"app": name}},
+            "strategy": {"type": "RollingUpdate", "rollingUpdate": {"maxSurge": "25%", "maxUnavailable": "25%"}},
+            "template": {
+                "metadata": {"labels": {"app": name}},
+                "spec": {"containers": [{"name": "app", "image": f"registry.example.com/{name}:1.4.2", "ports": [{"containerPort": 8080}]}]}
+            }
+        },
+        "status": {
+            "observedGeneration": 3, "replicas": replicas, "updatedReplicas": replicas,
+            "readyReplicas": ready, "availableReplicas": ready,
+            "conditions": [{"type": "Available", "status": "True" if ready == replicas else "False", "reason": "MinimumReplicasAvailable"}]
+        }
+    }
+
+def pod_item(namespace: str, deployment: str, index: int, generator: random.Random) -> dict:
+    """Builds a pod object of a deployment, most of them running and ready."""
+    roll = generator.random()
+    phase, ready, waiting, restarts = "Running", True, None, generator.choice([0, 0, 0, 1, 2])
+    if roll < 0.02:
+        phase, ready, waiting, restarts = "Running", False, "CrashLoopBackOff", generator.randint(5, 90)
+    elif roll < 0.04:
+        phase, ready, waiting, restarts = "Pending", False, "ContainerCreating", 0
+
+    state = {"waiting": {"reason": waiting}} if waiting else {"running": {"startedAt": timestamp(index % 30)}}
+    suffix = ''.join(generator.choice('bcdfghjklmnpqrstvwxz2456789') for _ in range(5))
+    return {
+        "apiVersion": "v1", "kind": "Pod",
+        "metadata": {
+            "name": f"{deployment}-7d9f8c6b5-{suffix}", "namespace": namespace, "uid": f"pod-{index:08d}",
+            "resourceVersion": str(3000 + index), "creationTimestamp": timestamp(index % 30),
+            "labels": {"app": deployment, "pod-template-hash": "7d9f8c6b5"},
+            "ownerReferences": [{"apiVersion": "apps/v1", "kind": "ReplicaSet", "name": f"{deployment}-7d9f8c6b5", "controller": True}]
+        },
+        "spec": {
+            "nodeName": f"aks-nodepool1-{index % 12:08d}-vmss00000{index % 9}",
+            "containers": [{"name": "app", "image": f"registry.example.com/{deployment}:1.4.2"}, {"name": "proxy", "image": "envoyproxy/envoy:v1.31"}]
+        },
+        "status": {
+            "phase": phase, "podIP": f"10.244.{index // 250 % 250}.{index % 250}", "startTime": timestamp(index % 30),
+            "containerStatuses": [
+                {"name": "app", "ready": ready, "restartCount": restarts, "state": state, "image": f"registry.example.com/{deployment}:1.4.2"},
+                {"name": "proxy", "ready": phase == "Running", "restartCount": 0, "state": {"running": {"startedAt": timestamp(index % 30)}}, "image": "envoyproxy/envoy:v1.31"}
+            ]
+        }
+    }
+
+def build_cluster(namespaces: int = 10, deployments: int = 5, pods: int = 3) -> dict:
+    """
+    Builds the objects of a synthetic cluster.
+
+    Args:
+        namespaces (int, optional): Number of namespaces. Defaults to 10.
+        deployments (int, optional): Deployments per namespace. Defaults to 5.
+        pods (int, optional): Pods per deployment. Defaults to 3.
+
+    Returns:
+        dict: The 'namespaces' list and the 'deployments' and 'pods' lists of every namespace.
+    """
+    generator = random.Random(42)
+    cluster = {"namespaces": [], "deployments": {}, "pods": {}}
+    pod_index = 0
+
+    for ns_index, namespace in enumerate(namespace_names(namespaces)):
+        cluster['namespaces'].append(namespace_item(namespace, ns_index))
+        cluster['deployments'][namespace] = []
+        cluster['pods'][namespace] = []
+        names = ['api'] + [f"service-{index:03d}" for index in range(deployments - 1)] if deployments else []
+        for dp_index, name in enumerate(names):
+            cluster['deployments'][namespace].append(deployment_item(namespace, name, pods, ns_index * 100 + dp_index))
+            for _ in range(pods):
+                cluster['pods'][namespace].append(pod_item(namespace, name, pod_index, generator))
+                pod_index += 1
+
+    return cluster
+
+def listing(kind: str, items: list, limit: int = 0, start: int = 0) -> dict:
+    """
+    Wraps objects in an API list response, paginated like the API server.
+
+    Args:
+        kind (str): The list kind (e.g. 'PodList').
+        items (list): The objects.
+        limit (int, optional): The page size. Defaults to 0 (everything).
+        start (int, optional): The offset encoded in the `continue` token. Defaults to 0.
+
+    Returns:
+        dict: The list response.
+    """
+    end = min(start + limit, len(items)) if limit else len(items)
+    metadata = {"resourceVersion": RESOURCE_VERSION}
+    if end < len(items):
+        metadata['continue'] = str(end)
+        metadata['remainingItemCount'] = len(items) - end
+    return {"apiVersion": "v1", "kind": kind, "metadata": metadata, "items": items[start:end]}
+
+def table(kind: str, items: list) -> str:
+    """Renders objects like the default `kubectl get` table output."""
+    if kind == 'namespaces':
+        rows = [["NAME", "STATUS", "AGE"]] + [[item['metadata']['name'], item['status']['phase'], "283d"] for item in items]
+    elif kind == 'deployments':
+        rows = [["NAME", "READY", "UP-TO-DATE", "AVAILABLE", "AGE"]] + [
+            [item['metadata']['name'], f"{item['status']['readyReplicas']}/{item['spec']['replicas']}",
+             str(item['status']['updatedReplicas']), str(item['status']['availableReplicas']), "283d"]
+            for item in items
+        ]
+    else:
+        rows = [["NAME", "READY", "STATUS", "RESTARTS", "AGE"]]
+        for item in items:
+            statuses = item['status']['containerStatuses']
+            waiting = [status['state']['waiting']['reason'] for status in statuses if 'waiting' in status['state']]
+            rows.append([
+                item['metadata']['name'], f"{sum(status['ready'] for status in statuses)}/{len(statuses)}",
+                waiting[0] if waiting else item['status']['phase'], str(sum(status['restartCount'] for status in statuses)), "3d"
+            ])
+
+    widths = [max(len(row[column]) for row in rows) for column in range(len(rows[0]))]
+    return '\n'.join('   '.join(value.ljust(width) for value, width in zip(row, widths)).rstrip() for row in rows)
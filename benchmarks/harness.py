@@ -0,0 +1,132 @@
+"""
+Helpers shared by the benchmarks: the environment of the fake `az` / `kubectl`, synthetic backup
+trees, timing of repeated runs and the stored baseline.
+"""
+
+import os
+import json
+import random
+import platform
+import statistics
+import time
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+SHIMS_DIR = BENCH_DIR / 'shims'
+BASELINE_PATH = BENCH_DIR / 'baseline.json'
+
+def shim_environment(workdir: Path, namespaces: int = 10, deployments: int = 5, pods: int = 3,
+                     latency: float = 0.0, az_latency: float = 0.0, bandwidth: float = 0) -> dict:
+    """
+    Builds the environment variables that route the project to the fake `az` and `kubectl`.
+
+    Everything the run writes (Azure CLI profile, caches, the emulated pod) stays inside `workdir`.
+
+    Args:
+        workdir (Path): The scratch folder of the benchmark.
+        namespaces (int, optional): Namespaces of the synthetic cluster. Defaults to 10.
+        deployments (int, optional): Deployments per namespace. Defaults to 5.
+        pods (int, optional): Pods per deployment. Defaults to 3.
+        latency (float, optional): Seconds added to every `kubectl` call. Defaults to 0.
+        az_latency (float, optional): Seconds added to every `az` call but `az version`. Defaults to 0.
+        bandwidth (float, optional): Bytes per second of the emulated API server link, 0 = unlimited. Defaults to 0.
+
+    Returns:
+        dict: The variables to add to `os.environ` or to pass to a subprocess.
+    """
+    return {
+        "PATH": f"{SHIMS_DIR}{os.pathsep}{os.environ.get('PATH', '')}",
+        "AZURE_CONFIG_DIR": str(workdir / 'azure'),
+        "AZURE_CLI_CACHE_DIR": str(workdir / 'cache'),
+        "BENCH_POD_ROOT": str(workdir / 'pod'),
+        "BENCH_NAMESPACES": str(namespaces),
+        "BENCH_DEPLOYMENTS": str(deployments),
+        "BENCH_PODS": str(pods),
+        "BENCH_LATENCY": str(latency),
+        "BENCH_AZ_LATENCY": str(az_latency),
+        "BENCH_BANDWIDTH": str(int(bandwidth)),
+    }
+
+def build_tree(root: Path, total: int, size: int):
+    """Creates `total` small text files of about `size` bytes, 100 per folder."""
+    words = ['return', 'function', 'class', 'public', 'private', 'static', 'import', 'value', 'self', 'config']
+    generator = random.Random(7)
+    for index in range(total):
+        folder = root / f"module_{index // 100:04d}"
+        if index % 100 == 0:
+            folder.mkdir(parents=True, exist_ok=True)
+        length = generator.randint(size // 2, size * 3 // 2)
+        text = ' '.join(generator.choice(words) for _ in range(length // 6))
+        (folder / f"file_{index:06d}.php").write_text(text[:length])
+
+def measure(function, repeat: int = 5, setup=None) -> dict:
+    """
+    Times repeated runs of a function.
+
+    Args:
+        function (callable): The code to time, called without arguments.
+        repeat (int, optional): The number of runs. Defaults to 5.
+        setup (callable, optional): Called before every run, outside of the timing. Defaults to None.
+
+    Returns:
+        dict: The 'best' and 'median' wall times in seconds and the number of 'runs'.
+    """
+    times = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return {"best": min(times), "median": statistics.median(times), "runs": repeat}
+
+def host() -> dict:
+    """Describes the machine the results were measured on."""
+    return {"platform": platform.platform(), "python": platform.python_version(), "cpus": os.cpu_count()}
+
+def load_baseline(path: Path = BASELINE_PATH) -> dict:
+    """Reads the stored baseline, or an empty one if there is none."""
+    try:
+        with open(path, 'r', encoding='utf-8') as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+def save_baseline(profile: str, settings: dict, results: dict, path: Path = BASELINE_PATH):
+    """
+    Stores the results of a profile ('full' or 'quick') as the new baseline, keeping the other profiles.
+
+    Args:
+        profile (str): The benchmark profile.
+        settings (dict): The sizes and latencies the results were measured with.
+        results (dict): The measurements per case, as returned by `measure`.
+        path (Path, optional): The baseline file. Defaults to `benchmarks/baseline.json`.
+    """
+    baseline = load_baseline(path)
+    baseline[profile] = {"host": host(), "recorded": time.strftime('%Y-%m-%dT%H:%M:%S'),
+                        "settings": settings, "results": results}
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(baseline, file, indent=4, sort_keys=True)
+        file.write('\n')
+
+def compare(results: dict, reference: dict, tolerance: float) -> list:
+    """
+    Compares the median of every case with the baseline.
+
+    Args:
+        results (dict): The current measurements per case.
+        reference (dict): The baseline measurements per case.
+        tolerance (float): The allowed slowdown, as a fraction (0.25 = 25% slower).
+
+    Returns:
+        list: One (case, seconds, baseline seconds, ratio, regressed) tuple per case, None values if the case has no baseline.
+    """
+    rows = []
+    for case, result in results.items():
+        previous = reference.get(case)
+        if not previous:
+            rows.append((case, result['median'], None, None, False))
+            continue
+        ratio = result['median'] / previous['median'] if previous['median'] else 1.0
+        rows.append((case, result['median'], previous['median'], ratio, ratio > 1 + tolerance))
+    return rows
@@ -0,0 +1 @@
+@python "%~dp0kubectl" %*
@@ -0,0 +1,148 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+# Directory where every persistent cache of the project is stored (AZURE_CLI_CACHE_DIR overrides it)
+CACHE_DIR = Path(os.environ.get('AZURE_CLI_CACHE_DIR') or Path(__file__).resolve().parent.parent / '.cache')
+
+class FileCache:
+    """
+    Small JSON document persisted under the project `.cache` directory.
+    """
+
+    def __init__(self, name: str):
+        """
+        Initializes the cache for the given name.
+
+        Args:
+            name (str): The cache name. It may contain sub folders (e.g. 'listings/pods').
+        """
+        self.path = CACHE_DIR / f"{name}.json"
+
+    def read(self) -> dict:
+        """
+        Reads the cached document.
+
+        Returns:
+            dict: The cached data, or an empty dictionary if the cache is missing or unreadable.
+        """
+        try:
+            with open(self.path, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def write(self, data: dict):
+        """
+        Writes the document atomically, so concurrent readers never see a partial file.
+
+        Args:
+            data (dict): The data to store.
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as file:
+                json.dump(data, file)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def clear(self):
+        """Removes the cached document if it exists."""
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+
+class RecentChoices:
+    """
+    Most recently used selections (namespaces, deployments, pods), persisted between runs.
+    """
+
+    def __init__(self, limit: int = 5):
+        """
+        Initializes the store.
+
+        Args:
+            limit (int, optional): The maximum number of values kept per group. Defaults to 5.
+        """
+        self.limit = limit
+        self.cache = FileCache('recent')
+
+    def get(self, group: str) -> list:
+        """
+        Returns the recent values of a group, most recent first.
+
+        Args:
+            group (str): The group name (e.g. 'namespaces' or 'deployments/<namespace>').
+
+        Returns:
+            list: The recent values.
+        """
+        return list(self.cache.read().get(group, []))
+
+    def add(self, group: str, value: str):
+        """
+        Moves a value to the front of its group.
+
+        Args:
+            group (str): The group name.
+            value (str): The selected value.
+        """
+        data = self.cache.read()
+        values = [value] + [item for item in data.get(group, []) if item != value]
+        data[group] = values[:self.limit]
+        try:
+            self.cache.write(data)
+        except OSError:
+            pass
+
+class ListingCache:
+    """
+    Cached listing of a resource collection, keyed by cluster context, kind, namespace and filters.
+
+    Entries keep the time they were fetched at, so they are only reused within the listing TTL.
+    """
+
+    def __init__(self, context: str, kind: str, namespace: str = None, query: dict = None):
+        """
+        Initializes the cache entry.
+
+        Args:
+            context (str): The kubeconfig context of the cluster.
+            kind (str): The resource kind (e.g. 'pods').
+            namespace (str, optional): The namespace of the collection.
+            query (dict, optional): The selectors applied to the listing.
+        """
+        key = json.dumps([context, kind, namespace, sorted((query or {}).items())])
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+        self.cache = FileCache(f"listings/{kind}-{digest}")
+
+    def read(self) -> dict:
+        """
+        Returns the cached entry.
+
+        Returns:
+            dict: The entry with `fetched` and `rows`, or None if there is none.
+        """
+        entry = self.cache.read()
+        return entry if 'fetched' in entry and 'rows' in entry else None
+
+    def store(self, rows: list):
+        """
+        Stores a listing.
+
+        Args:
+            rows (list): The serialized records.
+        """
+        try:
+            self.cache.write({"fetched": time.time(), "rows": rows})
+        except OSError:
+            pass
@@ -1,10 +1,44 @@
 import datetime
 import re
+import time
+
+class CachedClock:
+    """
+    Formats the current time, reusing the formatted text until the second changes.
+
+    Formatting a datetime is much more costly than reading the clock, and output lines are
+    written many times per second, so each clock formats at most once per second.
+    """
+
+    def __init__(self, format: str = '%Y-%m-%d %H:%M:%S', utc: bool = False):
+        """
+        Initializes the clock.
+
+        Args:
+            format (str, optional): The strftime format. Defaults to '%Y-%m-%d %H:%M:%S'.
+            utc (bool, optional): If True, the time is formatted in UTC instead of local time. Defaults to False.
+        """
+        self.format = format
+        self.timezone = datetime.timezone.utc if utc else None
+        self.second = None
+        self.text = ''
+
+    def __call__(self) -> str:
+        second = int(time.time())
+        if second != self.second:
+            self.text = datetime.datetime.fromtimestamp(second, self.timezone).strftime(self.format)
+            self.second = second
+        return self.text
+
+# Clock of the console timestamps
+_console_clock = CachedClock()
 
 def strftime(format: str = '%Y-%m-%d %H:%M:%S') -> str:
     """
     Returns the current date and time as a formatted string.
 
+    The default format is served by a cached clock that formats at most once per second.
+
     Args:
         format (str): The format in which to return the date and time.
                       Default is '%Y-%m-%d %H:%M:%S'. The format follows
@@ -17,6 +51,8 @@ def strftime(format: str = '%Y-%m-%d %H:%M:%S') -> str:
         >>> strftime('%Y-%m-%d')
         '2025-01-07'
     """
+    if format == _console_clock.format:
+        return _console_clock()
 
     # Get the current date and time using the current system time
     current_datetime = datetime.datetime.now()
@@ -54,4 +90,53 @@ def sanitize_folder_name(name: str) -> str:
         sanitized_name = f"{sanitized_name}_sanitized"
 
     # If the sanitized name is empty, return a default folder name
-    return sanitized_name or "default_folder"
\ No newline at end of file
+    return sanitized_name or "default_folder"
+
+
+def format_age(seconds: float) -> str:
+    """
+    Formats an age in seconds using its two most significant units, like kubectl does.
+
+    Args:
+        seconds (float): The age in seconds.
+
+    Returns:
+        str: The human readable age.
+
+    Example:
+        >>> format_age(446400)
+        '5 Days 4 Hours'
+    """
+    remaining = max(int(seconds), 0)
+    parts = []
+
+    # Keep the first two units starting from the largest non-zero one
+    for unit, size in (('Years', 31536000), ('Days', 86400), ('Hours', 3600), ('Minutes', 60), ('Seconds', 1)):
+        value, remaining = divmod(remaining, size)
+        if parts or value:
+            parts.append((value, unit))
+        if len(parts) == 2:
+            break
+
+    return ' '.join(f"{value} {unit}" for value, unit in parts if value) or '0 Seconds'
+
+def format_bytes(size: float) -> str:
+    """
+    Formats a number of bytes with a binary unit.
+
+    Args:
+        size (float): The number of bytes.
+
+    Returns:
+        str: The human readable size.
+
+    Example:
+        >>> format_bytes(1536)
+        '1.5 KiB'
+    """
+    for unit in ('B', 'KiB', 'MiB', 'GiB'):
+        if abs(size) < 1024:
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
+
+    return f"{size:.1f} TiB"
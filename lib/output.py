@@ -5,14 +5,167 @@
 # ---------------------------------------------------------------------------- #
 
 import os
+import sys
+import json
+import heapq
+import shutil
 import getpass
-from lib.helpers import strftime
+import itertools
+from lib.helpers import strftime, CachedClock
 from lib.colors import ConsoleColor
+from lib.selector import ChoiceIndex, KeyReader
+
+def fit_cell(item, width: int) -> str:
+    """
+    Truncates a cell value to the given width.
+
+    Args:
+        item: The cell value.
+        width (int): The column width.
+
+    Returns:
+        str: The value, truncated with '...' if it is longer than the column.
+    """
+    text = str(item)
+    if len(text) <= width:
+        return text
+    return text[:width - 3] + '...' if width > 3 else text[:width]
+
+def row_formatter(widths: list):
+    """
+    Builds a function formatting table rows with fixed column widths.
+
+    Rows are formatted with a single precompiled template. Since every cell is padded to its
+    column, a line longer than the table means a cell overflowed: only then is the row formatted
+    again cell by cell, truncating the long values.
+
+    Args:
+        widths (list of int): The column widths.
+
+    Returns:
+        callable: Formats a row (list of values) into a line.
+    """
+    template = " | ".join(f"{{:<{width}}}" for width in widths)
+    expected = sum(widths) + 3 * max(len(widths) - 1, 0)
+
+    def format_row(row) -> str:
+        try:
+            line = template.format(*row)
+            if len(line) == expected:
+                return line
+        except (IndexError, TypeError, ValueError):
+            pass
+        return " | ".join(f"{fit_cell(item, width):<{width}}" for item, width in zip(row, widths))
+
+    return format_row
+
+# Output modes: coloured text (the default), text without ANSI escapes, and structured records
+OUTPUT_MODES = ['text', 'plain', 'json', 'ndjson']
+
+# Clock of the structured records, in UTC
+_record_clock = CachedClock('%Y-%m-%dT%H:%M:%SZ', utc=True)
 
 class Console:
+    # Active output mode and the records collected in 'json' mode
+    mode = 'text'
+    records = []
+
+    # Live table on screen, which shows the warnings on its status line instead of scrolling it
+    live = None
+
+    @staticmethod
+    def configure(mode: str = 'text'):
+        """
+        Selects the output mode of every Console method.
+
+        - 'text': coloured messages and tables (the default).
+        - 'plain': the same layout without ANSI escapes, for logs.
+        - 'ndjson': one JSON record per line, written as soon as it is produced.
+        - 'json': the same records, written as a single JSON array by `finish`.
+
+        In the structured modes, prompts are written to stderr so stdout only holds records.
+
+        Args:
+            mode (str, optional): The output mode. Defaults to 'text'.
+
+        Raises:
+            ValueError: If the mode is not supported.
+        """
+        if mode not in OUTPUT_MODES:
+            raise ValueError(f"Unsupported output mode '{mode}'. Use one of: {', '.join(OUTPUT_MODES)}.")
+        Console.mode = mode
+        Console.records = []
+
+    @staticmethod
+    def structured() -> bool:
+        """Returns True if the output is made of JSON records ('json' or 'ndjson')."""
+        return Console.mode in ('json', 'ndjson')
+
+    @staticmethod
+    def emit(kind: str, **fields):
+        """
+        Writes a structured record in the 'json' and 'ndjson' modes.
+
+        Args:
+            kind (str): The record type (e.g. 'info', 'pod', 'progress').
+            **fields: The values of the record.
+        """
+        record = {"type": kind, "time": _record_clock(), **fields}
+        if Console.mode == 'json':
+            Console.records.append(record)
+            return
+        sys.stdout.write(json.dumps(record, default=str, ensure_ascii=False) + "\n")
+        sys.stdout.flush()
+
+    @staticmethod
+    def finish():
+        """Writes the records collected in 'json' mode as a single JSON array."""
+        if Console.mode != 'json':
+            return
+        records, Console.records = Console.records, []
+        sys.stdout.write(json.dumps(records, default=str, ensure_ascii=False, indent=2) + "\n")
+        sys.stdout.flush()
+
+    @staticmethod
+    def message(kind: str, label: str, message: str, timestamp: bool = False):
+        """
+        Writes a status message in the 'plain' and structured modes.
+
+        Args:
+            kind (str): The record type (e.g. 'info').
+            label (str): The label printed before the message in 'plain' mode (e.g. 'INFO').
+            message (str): The message.
+            timestamp (bool, optional): Whether 'plain' mode prints a timestamp. Defaults to False.
+        """
+        if Console.mode == 'plain':
+            print(' '.join(part for part in (label, strftime() if timestamp else '', str(message)) if part))
+        else:
+            Console.emit(kind, message=str(message))
+
+    @staticmethod
+    def prompt(question: str, color: bool = True) -> str:
+        """
+        Reads an answer from the user; in the structured modes the question is written to stderr.
+
+        Args:
+            question (str): The question.
+            color (bool, optional): If True, the question is coloured in 'text' mode. Defaults to True.
+
+        Returns:
+            str: The user's input.
+        """
+        if Console.mode == 'text':
+            return input(f"{ConsoleColor.INFO_COLOR.value}{question}{ConsoleColor.DEFAULT.value} " if color else f"{question} ")
+        stream = sys.stderr if Console.structured() else sys.stdout
+        stream.write(f"{question} ")
+        stream.flush()
+        return input()
+
     @staticmethod
     def clear():
         """Clears the console screen."""
+        if Console.mode != 'text':
+            return
         os.system('cls' if os.name == 'nt' else 'clear')
 
     @staticmethod
@@ -32,6 +185,13 @@ class Console:
         if state not in states:
             raise ValueError("State not supported.")
 
+        if Console.mode == 'plain':
+            print(f"{strftime()} {command} {seconds} {state}")
+            return
+        if Console.structured():
+            Console.emit('command', command=command, state=state, seconds=seconds)
+            return
+
         width = 60
         len_str = len(state)
         len_seconds = len(seconds)
@@ -59,6 +219,9 @@ class Console:
             message (str, optional): The error message to print. Defaults to an empty string.
             timestamp (bool, optional): Whether to include a timestamp. Defaults to False.
         """
+        if Console.mode != 'text':
+            Console.message('error', 'ERROR', message, timestamp)
+            return
         str_time = f"{ConsoleColor.MUTED.value}{strftime()}{ConsoleColor.DEFAULT.value}" if timestamp else ''
         print(f"{ConsoleColor.ERROR_COLOR_BG.value}{ConsoleColor.WHITE.value} ERROR {ConsoleColor.DEFAULT.value} "
               f"{str_time} {message}{ConsoleColor.DEFAULT.value}")
@@ -71,6 +234,9 @@ class Console:
         Args:
             message (str, optional): The danger message to print. Defaults to an empty string.
         """
+        if Console.mode != 'text':
+            Console.message('danger', '', message)
+            return
         print(f"{ConsoleColor.RED_BOLD.value}{message}{ConsoleColor.DEFAULT.value}")
 
     @staticmethod
@@ -81,6 +247,9 @@ class Console:
         Args:
             message (str, optional): The success message to print. Defaults to an empty string.
         """
+        if Console.mode != 'text':
+            Console.message('success', '', message)
+            return
         print(f"{ConsoleColor.GREEN_BOLD.value}{message}{ConsoleColor.DEFAULT.value}")
 
     @staticmethod
@@ -91,6 +260,12 @@ class Console:
         Args:
             message (str, optional): The warning message to print. Defaults to an empty string.
         """
+        if Console.live is not None:
+            Console.live.status(message)
+            return
+        if Console.mode != 'text':
+            Console.message('warning', '', message)
+            return
         print(f"{ConsoleColor.YELLOW_BOLD.value}{message}{ConsoleColor.DEFAULT.value}")
 
     @staticmethod
@@ -102,6 +277,9 @@ class Console:
             message (str, optional): The failure message to print. Defaults to an empty string.
             timestamp (bool, optional): Whether to include a timestamp. Defaults to False.
         """
+        if Console.mode != 'text':
+            Console.message('fail', 'FAIL', message, timestamp)
+            return
         str_time = f"{ConsoleColor.MUTED.value}{strftime()}{ConsoleColor.DEFAULT.value}" if timestamp else ''
         print(f"{ConsoleColor.ERROR_COLOR_BG.value}{ConsoleColor.WHITE.value} FAIL {ConsoleColor.DEFAULT.value} "
               f"{str_time} {message}{ConsoleColor.DEFAULT.value}")
@@ -115,6 +293,9 @@ class Console:
             message (str, optional): The informational message to print. Defaults to an empty string.
             timestamp (bool, optional): Whether to include a timestamp. Defaults to False.
         """
+        if Console.mode != 'text':
+            Console.message('info', 'INFO', message, timestamp)
+            return
         str_time = f"{ConsoleColor.MUTED.value}{strftime()}{ConsoleColor.DEFAULT.value}" if timestamp else ''
         print(f"{ConsoleColor.INFO_COLOR_BG.value}{ConsoleColor.WHITE.value} INFO {ConsoleColor.DEFAULT.value} "
               f"{str_time} {message}{ConsoleColor.DEFAULT.value}")
@@ -130,7 +311,7 @@ class Console:
         Returns:
             str: The user's input.
         """
-        return input(f"{ConsoleColor.INFO_COLOR.value}{str(question).strip()}{ConsoleColor.DEFAULT.value} ")
+        return Console.prompt(str(question).strip())
 
     @staticmethod
     def confirm(question: str, default: bool = False):
@@ -144,7 +325,7 @@ class Console:
         Returns:
             bool: The user's response (True if 'Y', False if 'N').
         """
-        response = input(f"{ConsoleColor.INFO_COLOR.value}{str(question).strip()} (Y/n): {ConsoleColor.DEFAULT.value} ").upper()
+        response = Console.prompt(f"{str(question).strip()} (Y/n): ").upper()
         return default if not response else response == 'Y'
 
     @staticmethod
@@ -158,6 +339,8 @@ class Console:
         Returns:
             str: The user's hidden input.
         """
+        if Console.mode != 'text':
+            return getpass.getpass(f"{str(question).strip()} ", stream=sys.stderr if Console.structured() else None)
         return getpass.getpass(f"{ConsoleColor.INFO_COLOR.value}{str(question).strip()}{ConsoleColor.DEFAULT.value} ")
 
     @staticmethod
@@ -173,7 +356,7 @@ class Console:
         Returns:
             str: The chosen option or the default value.
         """
-        input_value = input(f"{ConsoleColor.INFO_COLOR.value}{str(question).strip()}{ConsoleColor.DEFAULT.value} ")
+        input_value = Console.prompt(str(question).strip())
         return next((option for option in options if option.startswith(input_value)), default or input_value)
 
     @staticmethod
@@ -191,16 +374,138 @@ class Console:
         """
         total_choices = len(choices)
 
-        print(f"{ConsoleColor.INFO_COLOR.value}{str(question).strip()} (default: {choices[default_index]}): {ConsoleColor.DEFAULT.value} ")
-        for idx, choice in enumerate(choices, 1):
-            print(f"{idx}: {choice}")
+        # The choices are part of the prompt, so they go to stderr in the structured modes
+        stream = sys.stderr if Console.structured() else sys.stdout
+        colors = (ConsoleColor.INFO_COLOR.value, ConsoleColor.DEFAULT.value) if Console.mode == 'text' else ('', '')
+        stream.write(f"{colors[0]}{str(question).strip()} (default: {choices[default_index]}): {colors[1]} \n")
+        stream.write("".join(f"{idx}: {choice}\n" for idx, choice in enumerate(choices, 1)))
+        stream.flush()
 
-        answer = input("Answer: ")
+        answer = Console.prompt("Answer:", color=False)
         while not answer.isnumeric() or not (1 <= int(answer) <= total_choices):
-            answer = input("Please select a valid number: ")
+            answer = Console.prompt("Please select a valid number:", color=False)
 
         return choices[int(answer) - 1]
 
+    @staticmethod
+    def select(question: str, choices: list, recent: list = None, limit: int = 10):
+        """
+        Lets the user pick one of many choices by typing part of it.
+
+        The choices are indexed once (see `ChoiceIndex`), so each keystroke only filters the current
+        matches and renders the best `limit` of them, recently used values first. In an interactive
+        terminal the list is filtered live: type to filter, Up/Down to move, Enter to select. Otherwise
+        a filter or the number of a shown match is read per line; an empty answer picks the first match.
+
+        Args:
+            question (str): The prompt for the user.
+            choices (list of str): The choices.
+            recent (list of str, optional): Recently selected values, most recent first. Defaults to None.
+            limit (int, optional): The number of matches shown. Defaults to 10.
+
+        Raises:
+            ValueError: If there are no choices.
+
+        Returns:
+            str: The selected choice.
+        """
+        if not choices:
+            raise ValueError("There are no options to choose from.")
+
+        index = ChoiceIndex(choices, recent)
+        question = str(question).strip()
+        if Console.mode == 'text' and KeyReader.available():
+            return Console.selectLive(question, index, limit)
+
+        # Line by line: each answer is a new filter, a shown number or an exact choice
+        stream = sys.stderr if Console.structured() else sys.stdout
+        query = ''
+        while True:
+            matches, total = index.search(query, limit)
+            stream.write("".join(f"{position}: {choice}\n" for position, choice in enumerate(matches, 1)))
+            stream.write(f"({len(matches)} of {total} shown)\n" if total > len(matches) else "")
+            stream.flush()
+
+            answer = Console.prompt(f"{question} (filter, number or Enter for [{matches[0]}]):" if matches else f"{question} (filter):").strip()
+            if not answer and matches:
+                return matches[0]
+            if answer in index:
+                return answer
+            if answer.isdigit() and 1 <= int(answer) <= len(matches):
+                return matches[int(answer) - 1]
+            query = answer
+
+    @staticmethod
+    def selectLive(question: str, index: ChoiceIndex, limit: int = 10) -> str:
+        """
+        Runs the live filtering prompt of `select` in an interactive terminal.
+
+        Args:
+            question (str): The prompt for the user.
+            index (ChoiceIndex): The indexed choices.
+            limit (int, optional): The number of matches shown. Defaults to 10.
+
+        Returns:
+            str: The selected choice.
+        """
+        query, cursor = '', 0
+        out = sys.stdout
+        with KeyReader() as keys:
+            while True:
+                matches, total = index.search(query, limit)
+                cursor = min(cursor, max(len(matches) - 1, 0))
+
+                # Redraw the prompt and the matches below it, then move back to the prompt line
+                lines = [f"\r\033[J{ConsoleColor.INFO_COLOR.value}{question}{ConsoleColor.DEFAULT.value} {query}"]
+                lines += [
+                    f"{ConsoleColor.GREEN_BOLD.value}> {choice}{ConsoleColor.DEFAULT.value}" if position == cursor else f"  {choice}"
+                    for position, choice in enumerate(matches)
+                ]
+                lines.append(f"{ConsoleColor.MUTED.value}{len(matches)} of {total} - type to filter, Up/Down to move, Enter to select{ConsoleColor.DEFAULT.value}")
+                out.write("\n".join(lines) + f"\033[{len(lines) - 1}F\033[{len(question) + len(query) + 2}G")
+                out.flush()
+
+                key = keys.read()
+                if key == 'enter' and matches:
+                    out.write(f"\r\033[J{ConsoleColor.INFO_COLOR.value}{question}{ConsoleColor.DEFAULT.value} {matches[cursor]}\n")
+                    out.flush()
+                    return matches[cursor]
+                if key == 'up':
+                    cursor = max(cursor - 1, 0)
+                elif key == 'down':
+                    cursor = min(cursor + 1, max(len(matches) - 1, 0))
+                elif key == 'backspace':
+                    query, cursor = query[:-1], 0
+                elif key == 'escape':
+                    query, cursor = '', 0
+                elif len(key) == 1 and key.isprintable():
+                    query, cursor = query + key, 0
+
+    @staticmethod
+    def progress(message: str = '', final: bool = False, **fields):
+        """
+        Prints a progress message that replaces the previous one on the same line.
+
+        In 'plain' mode only the final message is printed; in the structured modes every update is
+        a 'progress' record.
+
+        Args:
+            message (str, optional): The progress message. Defaults to an empty string.
+            final (bool, optional): If True, the line is ended so the next output starts below. Defaults to False.
+            **fields: Values added to the structured record (e.g. the bytes received).
+        """
+        if Console.structured():
+            Console.emit('progress', message=message, final=final, **fields)
+            return
+        if Console.mode == 'plain':
+            if final:
+                print(message)
+            return
+        sys.stdout.write(f"\r{ConsoleColor.MUTED.value}{message}{ConsoleColor.DEFAULT.value}\033[K")
+        if final:
+            sys.stdout.write("\n")
+        sys.stdout.flush()
+
     @staticmethod
     def line(message: str = ''):
         """
@@ -209,6 +514,9 @@ class Console:
         Args:
             message (str, optional): The message to print. Defaults to an empty string.
         """
+        if Console.structured():
+            Console.emit('line', message=message)
+            return
         print(message)
 
     @staticmethod
@@ -224,24 +532,304 @@ class Console:
         """
         if count <= 0:
             raise ValueError(f"Unsupported Value '{str(count)}'")
+        if Console.structured():
+            return
         print("\n" * count)
 
     @staticmethod
-    def table(headers: list, rows: list):
+    def table(headers: list, rows, widths: list = None, max_width: int = None, sample: int = 1000, page: bool = None,
+              name: str = 'row'):
         """
         Prints a table in the console.
 
+        Rows may be a list or any iterator, and are consumed once. Column widths are taken from `widths`
+        or computed from the headers and the first `sample` rows, capped at `max_width`; cells of later
+        rows longer than their column are truncated. The lines are written through a single buffer and,
+        when the console is interactive, paged one screen at a time.
+
         Args:
             headers (list of str): The column headers.
-            rows (list of lists of str): The rows of the table.
+            rows (iterable of lists of str): The rows of the table.
+            widths (list of int, optional): Explicit column widths. Defaults to None.
+            max_width (int, optional): The maximum width of a computed column. Defaults to None (no limit).
+            sample (int, optional): The number of rows used to compute the widths. Defaults to 1000.
+            page (bool, optional): If True, the output pauses after every screen. Defaults to whether
+                                   stdin and stdout are a TTY in 'text' mode.
+            name (str, optional): The record type of the rows in the structured modes. Defaults to 'row'.
+        """
+        if Console.structured():
+            Console.emitRows(headers, rows, name)
+            return
+
+        rows = iter(rows)
+        head = []
+
+        # Determine column widths from a bounded sample of the rows
+        if widths is None:
+            head = list(itertools.islice(rows, sample))
+            widths = [max(len(str(item)) for item in col) for col in zip(headers, *head)]
+            if max_width:
+                widths = [min(width, max_width) for width in widths]
+
+        format_row = row_formatter(widths)
+        out = sys.stdout
+        if page is None:
+            page = Console.mode == 'text' and out.isatty() and sys.stdin.isatty()
+        height = max(shutil.get_terminal_size().lines - 2, 5) if page else 0
+
+        buffer = [format_row(headers), "-+-".join("-" * width for width in widths)]
+        printed = 0
+
+        # Print the table, one screen or a block of lines at a time
+        for row in itertools.chain(head, rows):
+            buffer.append(format_row(row))
+            if height and printed + len(buffer) >= height:
+                out.write("\n".join(buffer) + "\n")
+                buffer.clear()
+                printed = 0
+
+                remaining = Console.morePrompt()
+                if remaining is None:
+                    return
+                if remaining:
+                    height = 0
+            elif len(buffer) >= 512:
+                out.write("\n".join(buffer) + "\n")
+                printed += len(buffer)
+                buffer.clear()
+
+        if buffer:
+            out.write("\n".join(buffer) + "\n")
+        out.flush()
+
+    @staticmethod
+    def emitRows(headers: list, rows, name: str = 'row'):
         """
-        # Determine column widths
-        col_widths = [max(len(str(item)) for item in col) for col in zip(headers, *rows)]
-        header_row = " | ".join(f"{header:<{col_width}}" for header, col_width in zip(headers, col_widths))
-        separator = "-+-".join("-" * col_width for col_width in col_widths)
+        Writes table rows as structured records, keyed by the headers.
 
-        # Print the table
-        print(header_row)
-        print(separator)
+        Rows given as dictionaries are written as they are, so callers can provide typed values.
+
+        Args:
+            headers (list of str): The column headers.
+            rows (iterable of lists or dicts): The rows.
+            name (str, optional): The record type. Defaults to 'row'.
+        """
         for row in rows:
-            print(" | ".join(f"{item:<{col_width}}" for item, col_width in zip(row, col_widths)))
+            Console.emit(name, **(row if isinstance(row, dict) else dict(zip(headers, row))))
+
+    @staticmethod
+    def morePrompt():
+        """
+        Pauses a paged table until the user asks for more.
+
+        Returns:
+            bool: False to show the next screen, True to show every remaining row, or None to stop.
+        """
+        sys.stdout.write(f"{ConsoleColor.MUTED.value}-- More: Enter next page, a all, q quit --{ConsoleColor.DEFAULT.value} ")
+        sys.stdout.flush()
+        try:
+            answer = input().strip().lower()
+        except EOFError:
+            answer = 'a'
+
+        # Remove the prompt line
+        sys.stdout.write("\033[F\033[2K")
+        if answer == 'q':
+            return None
+        return answer == 'a'
+
+    @staticmethod
+    def tableStream(headers: list, pages, widths: list = None, max_width: int = 60, name: str = 'row'):
+        """
+        Prints a table progressively, one page of rows at a time.
+
+        Column widths are taken from `widths` or fixed from the first non-empty page, capped at
+        `max_width`. Cells longer than their column are truncated.
+
+        Args:
+            headers (list of str): The column headers.
+            pages (iterable of lists of lists of str): The pages of rows, as they become available.
+            widths (list of int, optional): Explicit column widths. Defaults to None.
+            max_width (int, optional): The maximum width of a column. Defaults to 60.
+            name (str, optional): The record type of the rows in the structured modes. Defaults to 'row'.
+        """
+        if Console.structured():
+            for rows in pages:
+                Console.emitRows(headers, rows, name)
+            return
+
+        col_widths = widths
+        format_row = None
+
+        def print_header():
+            nonlocal format_row
+            format_row = row_formatter(col_widths)
+            print(format_row(headers))
+            print("-+-".join("-" * col_width for col_width in col_widths))
+
+        if col_widths:
+            print_header()
+
+        for rows in pages:
+            if not rows:
+                continue
+
+            # Fix the column widths from the first page
+            if col_widths is None:
+                col_widths = [min(max(len(str(item)) for item in col), max_width) for col in zip(headers, *rows)]
+                print_header()
+
+            sys.stdout.write("\n".join(format_row(row) for row in rows) + "\n")
+            sys.stdout.flush()
+
+        # Print the headers alone if no rows were received
+        if col_widths is None:
+            col_widths = [len(str(header)) for header in headers]
+            print_header()
+
+class LiveTable:
+    """
+    Table kept up to date in place: only the rows that change are redrawn.
+
+    Each key owns a line of the table. Updates rewrite that line with ANSI cursor movements,
+    removed keys blank their line and the line is reused by the next added key, so the table
+    never grows beyond the largest number of simultaneous rows. While a live table is displayed,
+    `Console.textWarning` messages are shown on a status line kept below its rows, since a printed
+    line would move the table away from the lines being rewritten. When the output is not an
+    interactive terminal or the output mode is not 'text', every change is printed as a new line
+    instead, or written as a record with its event in the structured modes.
+    """
+
+    def __init__(self, headers: list, widths: list, live: bool = None, name: str = 'row'):
+        """
+        Initializes the table and prints its headers.
+
+        Args:
+            headers (list of str): The column headers.
+            widths (list of int): The fixed column widths.
+            live (bool, optional): If True, rows are redrawn in place. Defaults to whether stdout is a TTY
+                                   in 'text' mode.
+            name (str, optional): The record type of the rows in the structured modes. Defaults to 'row'.
+        """
+        self.headers = headers
+        self.widths = widths
+        self.name = name
+        self.structured = Console.structured()
+        self.live = (Console.mode == 'text' and sys.stdout.isatty()) if live is None else live
+        self.format = row_formatter(widths)
+        self.lines = {}
+        self.free = []
+        self.total = 0
+        self.message = None
+
+        if self.structured:
+            return
+        print(self.format(headers))
+        print("-+-".join("-" * width for width in widths))
+
+        if self.live:
+            Console.live = self
+
+    def close(self):
+        """Stops routing the console warnings to the status line of the table."""
+        if Console.live is self:
+            Console.live = None
+
+    def _rewrite(self, index: int, text: str):
+        """Rewrites the line at the given index and moves the cursor back below the table."""
+        distance = self.total - index + (self.message is not None)
+        sys.stdout.write(f"\033[{distance}F\033[2K{text}\033[{distance}E")
+        sys.stdout.flush()
+
+    def status(self, message: str = ''):
+        """
+        Shows a message on the status line below the rows, replacing the previous one.
+
+        The line is reserved by the first message and kept afterwards, so the rows never move.
+        When the table is not live, the message is printed as a warning instead.
+
+        Args:
+            message (str, optional): The message. Defaults to an empty string, which clears the line.
+        """
+        if not self.live:
+            if message:
+                Console.textWarning(message)
+            return
+
+        text = f"{ConsoleColor.YELLOW_BOLD.value}{message}{ConsoleColor.DEFAULT.value}" if message else ''
+        if self.message is None:
+            sys.stdout.write(f"{text}\n")
+        else:
+            sys.stdout.write(f"\033[F\033[2K{text}\n")
+        sys.stdout.flush()
+        self.message = text
+
+    def upsert(self, key: str, row: list, event: str = 'MODIFIED', data: dict = None):
+        """
+        Adds a row or updates it if its content changed.
+
+        Args:
+            key (str): The row key (e.g. the pod name).
+            row (list of str): The row values.
+            event (str, optional): The change label printed when the table is not live. Defaults to 'MODIFIED'.
+            data (dict, optional): The typed values written instead of the row in the structured modes.
+        """
+        text = self.format(row)
+        current = self.lines.get(key)
+        if current and current[1] == text:
+            return
+
+        if self.structured:
+            self.lines[key] = (0, text)
+            Console.emit(self.name, event=event, **(data or dict(zip(self.headers, row))))
+            return
+
+        if not self.live:
+            self.lines[key] = (0, text)
+            print(f"{event:<8} {text}")
+            return
+
+        if current:
+            self._rewrite(current[0], text)
+            index = current[0]
+        elif self.free:
+            index = heapq.heappop(self.free)
+            self._rewrite(index, text)
+        else:
+            index = self.total
+            if self.message is None:
+                print(text)
+            else:
+                # Write the row over the status line and move the status line down
+                sys.stdout.write(f"\033[F\033[2K{text}\n{self.message}\n")
+                sys.stdout.flush()
+            self.total += 1
+
+        self.lines[key] = (index, text)
+
+    def remove(self, key: str, event: str = 'DELETED'):
+        """
+        Removes a row, blanking its line so it can be reused.
+
+        Args:
+            key (str): The row key.
+            event (str, optional): The change label printed when the table is not live. Defaults to 'DELETED'.
+        """
+        current = self.lines.pop(key, None)
+        if not current:
+            return
+
+        if self.structured:
+            Console.emit(self.name, event=event, key=key)
+            return
+
+        if not self.live:
+            print(f"{event:<8} {current[1]}")
+            return
+
+        self._rewrite(current[0], '')
+        heapq.heappush(self.free, current[0])
+
+    def keys(self) -> list:
+        """Returns the keys of the rows currently displayed."""
+        return list(self.lines)
@@ -0,0 +1,226 @@
+import os
+import re
+import sys
+import heapq
+import bisect
+import itertools
+import threading
+
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+try:
+    import termios
+    import tty
+    import select
+except ImportError:
+    termios = None
+
+# Characters separating the words of a resource name (e.g. 'api-7d9f8c6b5-x6wc6')
+WORD_SEPARATORS = re.compile(r'[-_./:@\s]+')
+
+def ranges(keys: list, query: str) -> tuple:
+    """Returns the bounds of the sorted keys starting with the query."""
+    low = bisect.bisect_left(keys, query)
+    return low, bisect.bisect_left(keys, query + '\uffff', low)
+
+def trigrams(text: str) -> set:
+    """Returns the three-character substrings of a text."""
+    return {text[index:index + 3] for index in range(len(text) - 2)}
+
+class ChoiceIndex:
+    """
+    Search index over the choices of a selection prompt, built once per prompt.
+
+    The matches of a query are ranked: recently used values first, then the choices starting with
+    the query, the choices with a word starting with it, and the other choices containing it. Three
+    structures keep the cost of a keystroke from growing with the number of choices:
+    - the sorted names and the sorted suffixes starting at each word are searched with bisect, so
+      the best matches are read directly from two slices and only `limit` of them are touched;
+    - the trigram posting lists find the choices containing a query of three characters or more:
+      only the shortest list of its trigrams is checked. They are the costly part of the index and
+      are built in a background thread while the prompt is displayed;
+    - the matches of the previous query are kept, so typing one more character only filters them.
+    When no choice contains the query, the choices sharing most of its trigrams are returned, which
+    tolerates typos.
+    """
+
+    def __init__(self, choices: list, recent: list = None):
+        """
+        Builds the index.
+
+        Args:
+            choices (list of str): The choices, in their display order.
+            recent (list of str, optional): The recently selected values, most recent first. Defaults to None.
+        """
+        self.choices = list(choices)
+        self.lowered = [choice.lower() for choice in self.choices]
+        self.members = {choice: index for index, choice in enumerate(self.choices)}
+        self.recent = [self.members[value] for value in dict.fromkeys(recent or []) if value in self.members]
+
+        # Sorted names, and sorted suffixes starting at every word after the first
+        names = sorted((text, index) for index, text in enumerate(self.lowered))
+        self.name_keys = [key for key, _ in names]
+        self.name_ids = [index for _, index in names]
+        words = sorted(
+            (text[match.end():], index)
+            for index, text in enumerate(self.lowered)
+            for match in WORD_SEPARATORS.finditer(text) if match.end() < len(text)
+        )
+        self.word_keys = [key for key, _ in words]
+        self.word_ids = [index for _, index in words]
+
+        # Posting list of every trigram
+        self.postings = {}
+        self.indexer = threading.Thread(target=self.index_trigrams, name='choice-index', daemon=True)
+        self.indexer.start()
+
+        self.last_query = None
+        self.last_matches = None
+
+    def __contains__(self, value: str) -> bool:
+        return value in self.members
+
+    def index_trigrams(self):
+        """Builds the posting list of every trigram."""
+        postings = {}
+        for index, text in enumerate(self.lowered):
+            for gram in trigrams(text):
+                postings.setdefault(gram, []).append(index)
+        self.postings = postings
+
+    def starts_word(self, index: int, query: str) -> bool:
+        """Returns True if the choice, or one of its words, starts with the query."""
+        text = self.lowered[index]
+        return text.startswith(query) or any(text.startswith(query, match.end()) for match in WORD_SEPARATORS.finditer(text))
+
+    def containing(self, query: str) -> list:
+        """
+        Returns the choices containing a query of three characters or more, in display order.
+
+        Args:
+            query (str): The lowercase query.
+
+        Returns:
+            list: The indexes of the matching choices.
+        """
+        self.indexer.join()
+        if self.last_query and query.startswith(self.last_query):
+            pool = self.last_matches
+        else:
+            pool = min((self.postings.get(gram, []) for gram in trigrams(query)), key=len)
+
+        found = [index for index in pool if query in self.lowered[index]]
+        self.last_query, self.last_matches = query, found
+        return found
+
+    def similar(self, query: str, limit: int) -> tuple:
+        """Returns the choices sharing most of the query trigrams (at least half) and their number."""
+        self.indexer.join()
+        grams = trigrams(query)
+        counts = {}
+        for gram in grams:
+            for index in self.postings.get(gram, []):
+                counts[index] = counts.get(index, 0) + 1
+        found = [index for index, count in counts.items() if count >= max(1, len(grams) // 2)]
+        best = heapq.nsmallest(limit, found, key=lambda index: (-counts[index], len(self.lowered[index]), index))
+        return [self.choices[index] for index in best], len(found)
+
+    def search(self, query: str, limit: int = 10) -> tuple:
+        """
+        Finds the best choices for a query.
+
+        Args:
+            query (str): The text typed by the user.
+            limit (int, optional): The maximum number of choices returned. Defaults to 10.
+
+        Returns:
+            tuple: The best choices (list of str) and the total number of matches (int).
+        """
+        query = query.strip().lower()
+        if not query:
+            order = self.recent + [index for index in range(min(len(self.choices), limit + len(self.recent))) if index not in self.recent]
+            return [self.choices[index] for index in order[:limit]], len(self.choices)
+
+        name_low, name_high = ranges(self.name_keys, query)
+        word_low, word_high = ranges(self.word_keys, query)
+
+        # Short queries only match the start of a word; longer ones match anywhere
+        if len(query) < 3:
+            recent = [index for index in self.recent if self.starts_word(index, query)]
+            rest = []
+            total = len(set(self.name_ids[name_low:name_high]).union(self.word_ids[word_low:word_high]))
+        else:
+            recent = [index for index in self.recent if query in self.lowered[index]]
+            rest = self.containing(query)
+            total = len(rest)
+            if not total:
+                return self.similar(query, limit)
+
+        # Take the best matches class by class, reading only as many as needed
+        ranked = itertools.chain(
+            recent,
+            (self.name_ids[position] for position in range(name_low, name_high)),
+            (self.word_ids[position] for position in range(word_low, word_high)),
+            rest
+        )
+        best = []
+        for index in ranked:
+            if index not in best:
+                best.append(index)
+                if len(best) == limit:
+                    break
+        return [self.choices[index] for index in best], total
+
+class KeyReader:
+    """
+    Reads single key presses from the terminal without waiting for Enter.
+
+    Used as a context manager, which switches the terminal to unbuffered input without echo and
+    restores it on exit. Keys are returned as their character, or as 'up', 'down', 'enter',
+    'backspace', 'escape' and 'tab'.
+    """
+
+    @staticmethod
+    def available() -> bool:
+        """Returns True if the standard input and output are an interactive terminal that supports key reading."""
+        return (msvcrt is not None or termios is not None) and sys.stdin.isatty() and sys.stdout.isatty()
+
+    def __enter__(self):
+        if msvcrt is None:
+            self.fd = sys.stdin.fileno()
+            self.saved = termios.tcgetattr(self.fd)
+            tty.setcbreak(self.fd)
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if msvcrt is None:
+            termios.tcsetattr(self.fd, termios.TCSADRAIN, self.saved)
+        return False
+
+    def read(self) -> str:
+        """
+        Waits for a key press.
+
+        Raises:
+            KeyboardInterrupt: On Ctrl+C.
+
+        Returns:
+            str: The key.
+        """
+        if msvcrt is not None:
+            key = msvcrt.getwch()
+            if key in ('\x00', '\xe0'):
+                return {'H': 'up', 'P': 'down'}.get(msvcrt.getwch(), '')
+        else:
+            key = os.read(self.fd, 4).decode('utf-8', 'ignore')
+            if key == '\x1b' and select.select([self.fd], [], [], 0.05)[0]:
+                key += os.read(self.fd, 8).decode('utf-8', 'ignore')
+            if key.startswith('\x1b'):
+                return {'\x1b[A': 'up', '\x1bOA': 'up', '\x1b[B': 'down', '\x1bOB': 'down'}.get(key, 'escape' if key == '\x1b' else '')
+
+        if key == '\x03':
+            raise KeyboardInterrupt
+        return {'\r': 'enter', '\n': 'enter', '\x7f': 'backspace', '\x08': 'backspace', '\t': 'tab'}.get(key, key)
@@ -0,0 +1,245 @@
+import os
+import sys
+import json
+import time
+import threading
+import functools
+
+class _Span:
+    """An open span: its name, category, arguments, start and the time spent in its children."""
+
+    __slots__ = ('name', 'category', 'args', 'start', 'children', 'path')
+
+    def __init__(self, name: str, category: str, args: dict, path: tuple):
+        self.name = name
+        self.category = category
+        self.args = args
+        self.path = path
+        self.children = 0.0
+        self.start = time.perf_counter()
+
+class Tracer:
+    """
+    Records nested timing spans of a run, for the `--profile` summary and Chrome trace files.
+
+    Spans are nested per thread: a span opened while another one is open in the same thread is its
+    child. While the tracer is disabled, opening a span costs a single attribute check.
+    """
+
+    def __init__(self):
+        """Initializes a disabled tracer."""
+        self.enabled = False
+        self.origin = time.perf_counter()
+        self.events = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def enable(self):
+        """Starts recording; the run time is measured from this call."""
+        self.enabled = True
+        self.origin = time.perf_counter()
+        self.events = []
+
+    def _stack(self) -> list:
+        """Returns the open spans of the current thread."""
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _finish(self, name: str, category: str, start: float, seconds: float, args: dict, path: tuple, children: float = 0.0):
+        """Stores a finished span and charges its time to the enclosing span."""
+        stack = self._stack()
+        if stack:
+            stack[-1].children += seconds
+
+        thread = threading.current_thread()
+        with self._lock:
+            self.events.append({
+                "name": name, "category": category, "start": start, "seconds": seconds,
+                "self": max(seconds - children, 0.0), "path": path, "args": args or {},
+                "thread": thread.ident, "thread_name": thread.name
+            })
+
+    def span(self, name: str, category: str = 'phase', **args):
+        """
+        Opens a span for the duration of a `with` block.
+
+        Args:
+            name (str): The span name (e.g. 'login').
+            category (str, optional): The span category. Defaults to 'phase'.
+            **args: Values stored with the span and shown in the trace viewer.
+
+        Returns:
+            A context manager.
+
+        Example:
+            >>> with tracer.span('listPods', namespace='prod'):
+            ...     pass
+        """
+        return _SpanContext(self, name, category, args)
+
+    def complete(self, name: str, start: float, seconds: float, category: str = 'command', **args):
+        """
+        Records a span that already finished, such as an external command timed by its caller.
+
+        Args:
+            name (str): The span name.
+            start (float): The `time.perf_counter()` at which it started.
+            seconds (float): Its duration.
+            category (str, optional): The span category. Defaults to 'command'.
+            **args: Values stored with the span.
+        """
+        if not self.enabled:
+            return
+        stack = self._stack()
+        path = (stack[-1].path if stack else ()) + (name,)
+        self._finish(name, category, start, seconds, args, path)
+
+    def elapsed(self) -> float:
+        """Returns the seconds since recording started."""
+        return time.perf_counter() - self.origin
+
+    def summary(self) -> list:
+        """
+        Aggregates the spans by their nesting path, in the order they first started.
+
+        Returns:
+            list: One dictionary per path with its 'path', 'calls', 'seconds' (total), 'self' and 'slowest'.
+        """
+        with self._lock:
+            events = sorted(self.events, key=lambda event: event['start'])
+
+        totals = {}
+        for event in events:
+            entry = totals.get(event['path'])
+            if entry is None:
+                entry = totals[event['path']] = {"path": event['path'], "calls": 0, "seconds": 0.0, "self": 0.0, "slowest": 0.0}
+            entry['calls'] += 1
+            entry['seconds'] += event['seconds']
+            entry['self'] += event['self']
+            entry['slowest'] = max(entry['slowest'], event['seconds'])
+
+        # Children are listed right after their parent
+        order = {path: index for index, path in enumerate(totals)}
+        return sorted(totals.values(), key=lambda entry: [order.get(entry['path'][:depth], 0) for depth in range(1, len(entry['path']) + 1)])
+
+    def chrome_trace(self) -> dict:
+        """
+        Builds a trace in the Chrome Trace Event format, readable by chrome://tracing and Perfetto.
+
+        Returns:
+            dict: The trace, with one complete ('X') event per span and the name of every thread.
+        """
+        # Only needed for the host description, not imported by runs without a trace
+        import socket
+        import platform
+
+        pid = os.getpid()
+        with self._lock:
+            events = list(self.events)
+
+        trace = [
+            {"name": "process_name", "ph": "M", "pid": pid, "tid": 0, "args": {"name": "azure-cli"}}
+        ]
+        for thread, name in {event['thread']: event['thread_name'] for event in events}.items():
+            trace.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": thread, "args": {"name": name}})
+
+        for event in events:
+            trace.append({
+                "name": event['name'], "cat": event['category'], "ph": "X", "pid": pid, "tid": event['thread'],
+                "ts": round((event['start'] - self.origin) * 1e6, 1), "dur": round(event['seconds'] * 1e6, 1),
+                "args": event['args']
+            })
+
+        return {
+            "traceEvents": trace,
+            "displayTimeUnit": "ms",
+            "otherData": {
+                "host": socket.gethostname(), "platform": platform.platform(), "python": platform.python_version(),
+                "argv": sys.argv[1:], "seconds": round(self.elapsed(), 6)
+            }
+        }
+
+    def write(self, path: str):
+        """
+        Writes the Chrome trace to a file.
+
+        Args:
+            path (str): The JSON file to write.
+        """
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(self.chrome_trace(), file, default=str)
+
+# Columns of the `--profile` summary table
+PROFILE_HEADERS = ['Span', 'Calls', 'Total', 'Self', 'Slowest', 'Run %']
+
+def profile_rows(summary: list, total: float) -> list:
+    """
+    Formats the aggregated spans for the `--profile` table, indenting each span under its parent.
+
+    Args:
+        summary (list): The result of `Tracer.summary`.
+        total (float): The duration of the run in seconds.
+
+    Returns:
+        list: The table rows.
+    """
+    return [
+        [
+            '  ' * (len(entry['path']) - 1) + entry['path'][-1], str(entry['calls']), f"{entry['seconds']:.3f}s",
+            f"{entry['self']:.3f}s", f"{entry['slowest']:.3f}s", f"{100 * entry['seconds'] / total:.1f}%" if total else '-'
+        ]
+        for entry in summary
+    ]
+
+class _SpanContext:
+    """Context manager returned by `Tracer.span`."""
+
+    __slots__ = ('tracer', 'name', 'category', 'args', 'span')
+
+    def __init__(self, tracer: Tracer, name: str, category: str, args: dict):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+        self.span = None
+
+    def __enter__(self):
+        if self.tracer.enabled:
+            stack = self.tracer._stack()
+            path = (stack[-1].path if stack else ()) + (self.name,)
+            self.span = _Span(self.name, self.category, self.args, path)
+            stack.append(self.span)
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        span = self.span
+        if span is None:
+            return False
+
+        seconds = time.perf_counter() - span.start
+        self.tracer._stack().pop()
+        if exc_type is not None:
+            span.args['error'] = exc_type.__name__
+        self.tracer._finish(span.name, span.category, span.start, seconds, span.args, span.path, span.children)
+        return False
+
+def traced(function):
+    """
+    Decorator that records every call of a function or method as a span named after it.
+
+    Example:
+        >>> @traced
+        ... def listPods(self): ...
+    """
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        if not tracer.enabled:
+            return function(*args, **kwargs)
+        with tracer.span(function.__name__):
+            return function(*args, **kwargs)
+    return wrapper
+
+# Tracer shared by the whole run, enabled by `--profile`
+tracer = Tracer()
@@ -0,0 +1,96 @@
+"""
+Helpers shared by the tests: runs of azure-cli.py against the fake `az` and `kubectl` of `benchmarks/shims`.
+
+Every test gets its own scratch folder holding the Azure CLI profile, the caches, the emulated pod
+and the backups, so runs never touch the real configuration or the project `.cache` folder.
+"""
+
+import os
+import sys
+import json
+import atexit
+import shutil
+import tempfile
+import unittest
+import subprocess
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+BENCH_DIR = ROOT_DIR / 'benchmarks'
+sys.path.insert(0, str(ROOT_DIR))
+sys.path.insert(0, str(BENCH_DIR))
+
+# The project modules read the cache folder when imported: the tests running in process never use the real one
+CACHE_DIR = tempfile.mkdtemp(prefix="azure-cli-test-cache-")
+atexit.register(shutil.rmtree, CACHE_DIR, True)
+os.environ['AZURE_CLI_CACHE_DIR'] = CACHE_DIR
+
+import fixtures
+from harness import shim_environment, build_tree
+
+ORIGIN = '/var/www/app'
+
+class ShimTestCase(unittest.TestCase):
+    """Base class of the tests that run the tool end to end against the fake `az` and `kubectl`."""
+
+    # Size of the synthetic cluster: namespaces, deployments per namespace and pods per deployment
+    cluster = (3, 2, 2)
+
+    def setUp(self):
+        self.workdir = Path(tempfile.mkdtemp(prefix="azure-cli-test-"))
+        self.addCleanup(shutil.rmtree, self.workdir, True)
+        self.environment = {**os.environ, **shim_environment(self.workdir, *self.cluster)}
+        build_tree(self.workdir / 'pod' / ORIGIN.lstrip('/'), 20, 256)
+
+    def running_pod(self, deployment: str = 'api', namespace: str = 'default') -> str:
+        """Returns the first running pod of a deployment of the synthetic cluster."""
+        for item in fixtures.build_cluster(*self.cluster)['pods'][namespace]:
+            if item['metadata']['labels']['app'] == deployment and item['status']['phase'] == 'Running':
+                return item['metadata']['name']
+        raise AssertionError(f"No running pod for deployment {deployment}")
+
+    def write_config(self, backup: dict = None, **sections) -> Path:
+        """
+        Writes the configuration of a run: every selection preset, the backups inside the scratch folder.
+
+        Args:
+            backup (dict, optional): Keys merged into the `backup` section. Defaults to None.
+            **sections: Top-level sections replacing the defaults (e.g. listing={...}).
+
+        Returns:
+            Path: The configuration file, also set as AZURE_CLI_CONFIG.
+        """
+        config = {
+            "tenant": "test-tenant",
+            "subscription_id": "bench-subscription",
+            "credentials": {"resource-group": "test-rg", "name": "test-aks", "overwrite-existing": True},
+            "namespace": {"select": "default", "echo": False},
+            "deployments": {"select": "api", "echo": False},
+            "pods": {"select": self.running_pod(), "echo": False},
+            "backup": {"folder": str(self.workdir / 'backups' / 'pod'), "origin": ORIGIN, "transport": "tar", **(backup or {})},
+        }
+        config.update(sections)
+
+        path = self.workdir / 'config.json'
+        path.write_text(json.dumps(config, indent=4))
+        self.environment['AZURE_CLI_CONFIG'] = str(path)
+        return path
+
+    def run_cli(self, *args: str, check: bool = True) -> subprocess.CompletedProcess:
+        """
+        Runs azure-cli.py with plain output.
+
+        Args:
+            *args (str): The arguments.
+            check (bool, optional): If True, the test fails when the run fails. Defaults to True.
+
+        Returns:
+            subprocess.CompletedProcess: The finished run, with its text output.
+        """
+        result = subprocess.run(
+            [sys.executable, '-B', str(ROOT_DIR / 'azure-cli.py'), '--no-banner', '--output', 'plain', *args],
+            env=self.environment, capture_output=True, text=True, stdin=subprocess.DEVNULL, timeout=120
+        )
+        if check and result.returncode != 0:
+            self.fail(f"azure-cli.py {' '.join(args)} failed ({result.returncode}):\n{result.stdout[-3000:]}\n{result.stderr[-3000:]}")
+        return result
@@ -0,0 +1,103 @@
+"""
+Backups of different modes sharing one configuration must never delete each other.
+"""
+
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from support import ShimTestCase, ORIGIN
+from azure.backup import stale_paths
+
+class TargetFoldersTest(ShimTestCase):
+
+    def test_full_backup_keeps_target_backups(self):
+        self.write_config(backup={"targets": [{"namespace": "default", "deployment": "api"}]})
+        backups = self.workdir / 'backups'
+
+        self.run_cli('--targets')
+        targets = sorted(path.name for path in backups.iterdir() if path.name.startswith('default_api-'))
+        self.assertEqual(len(targets), 2)
+
+        self.run_cli('--backup')
+        self.assertTrue(any((backups / 'pod').rglob('*.php')))
+        for name in targets:
+            self.assertTrue(any((backups / name).rglob('*.php')), f"{name} was removed by the full backup")
+
+    def test_targets_folder_is_configurable(self):
+        self.write_config(backup={
+            "targets": [{"namespace": "default", "pod": self.running_pod()}],
+            "targets-folder": str(self.workdir / 'targets')
+        })
+
+        self.run_cli('--targets')
+        self.assertTrue((self.workdir / 'targets' / f"default_{self.running_pod()}").is_dir())
+        self.assertFalse((self.workdir / 'backups').exists())
+
+class SnapshotStoreTest(ShimTestCase):
+
+    def test_other_modes_refuse_a_snapshot_store(self):
+        self.write_config()
+        store = self.workdir / 'backups' / 'pod'
+
+        self.run_cli('--backup', '--snapshot')
+        snapshots = sorted((store / 'snapshots').glob('*.json'))
+        self.assertEqual(len(snapshots), 1)
+
+        for arguments in (['--backup'], ['--backup', '--resume'], ['--backup', '--incremental']):
+            result = self.run_cli(*arguments, check=False)
+            self.assertNotEqual(result.returncode, 0, arguments)
+            self.assertIn("holds a snapshot store", result.stdout + result.stderr)
+            self.assertEqual(sorted((store / 'snapshots').glob('*.json')), snapshots, arguments)
+            self.assertTrue(any((store / 'objects').iterdir()), arguments)
+
+    def test_unreferenced_contents_are_collected_on_every_snapshot(self):
+        self.write_config()
+        store = self.workdir / 'backups' / 'pod'
+        self.run_cli('--backup', '--snapshot')
+
+        # Contents stored by a run interrupted before its snapshot was committed
+        orphan = store / 'objects' / 'ff' / ('f' * 64)
+        orphan.parent.mkdir(exist_ok=True)
+        orphan.write_text("never committed")
+
+        result = self.run_cli('--backup', '--snapshot')
+        self.assertFalse(orphan.exists())
+        self.assertIn("1 unreferenced contents collected", result.stdout)
+        self.assertEqual(len(list((store / 'snapshots').glob('*.json'))), 2)
+
+    def test_unreadable_manifest_stops_the_collection(self):
+        self.write_config()
+        store = self.workdir / 'backups' / 'pod'
+        self.run_cli('--backup', '--snapshot')
+        objects = sorted((store / 'objects').rglob('*'))
+
+        # A manifest cut in the middle: its snapshot's contents must not look unreferenced
+        manifest = next((store / 'snapshots').glob('*.json'))
+        manifest.write_text(manifest.read_text()[:40])
+        for path in (self.workdir / 'pod' / ORIGIN.lstrip('/')).rglob('*.php'):
+            path.write_text("new content")
+
+        result = self.run_cli('--backup', '--snapshot')
+        self.assertIn("Garbage collection skipped", result.stdout)
+        self.assertTrue(set(objects) <= set((store / 'objects').rglob('*')))
+
+class StalePathsTest(unittest.TestCase):
+
+    def test_only_copies_of_the_backup_are_stale(self):
+        parent = Path(tempfile.mkdtemp(prefix="azure-cli-test-"))
+        self.addCleanup(shutil.rmtree, parent, True)
+        for name in ('app', '.app.staging', '.app.old-1700000000000000000', '.app.partial',
+                     '.app.v2.staging', '.app.v2.old-1700000000000000000', '.app.staging.old-1', '.app.old-x'):
+            (parent / name).mkdir()
+        for name in ('.app.journal', '.app.manifest.json'):
+            (parent / name).write_text('{}')
+
+        self.assertEqual(
+            sorted(path.name for path in stale_paths(parent / 'app')),
+            ['.app.old-1700000000000000000', '.app.staging']
+        )
+        self.assertEqual(stale_paths(parent / 'missing' / 'app'), [])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,29 @@
+"""
+The sample configuration: the optional backup features are off, so a plain backup is a complete `kubectl cp` copy.
+"""
+
+import os
+import unittest
+from unittest import mock
+from support import ROOT_DIR
+from azure.config_file import Config
+
+class SampleConfigTest(unittest.TestCase):
+
+    def setUp(self):
+        with mock.patch.dict(os.environ, {'AZURE_CLI_CONFIG': str(ROOT_DIR / 'config.json')}):
+            self.config = Config()
+
+    def test_backup_filters_are_opt_in(self):
+        self.assertEqual(self.config.backup_filters['include'], [])
+        self.assertEqual(self.config.backup_filters['exclude'], [])
+        self.assertFalse(self.config.backup_filters['max-file-size'])
+
+    def test_plain_backup_uses_kubectl_cp(self):
+        self.assertEqual(self.config.backup_transport, 'cp')
+        self.assertFalse(self.config.backup_incremental)
+        self.assertFalse(self.config.backup_archive)
+        self.assertIsNone(self.config.backup_snapshots)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+"""
+The `find` expression selecting the files of a filtered backup: quoting of the patterns and pruning of the excluded folders.
+"""
+
+import shutil
+import tempfile
+import unittest
+import subprocess
+from pathlib import Path
+import support  # noqa: F401 (project paths)
+from azure.backup import find_filters
+
+FILES = [
+    'index.php', 'app.log', 'public/app.js', 'public/app.js.map', 'storage/logs/laravel.log',
+    'node_modules/lib/index.js', 'src/node_modules/lib/index.js', "docs/it's here.txt", 'docs/$(touch pwned).txt',
+]
+
+class FindFiltersTest(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = Path(tempfile.mkdtemp(prefix="azure-cli-test-"))
+        self.addCleanup(shutil.rmtree, self.folder, True)
+        for name in FILES:
+            path = self.folder / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(b'x' * (4096 if name == 'index.php' else 16))
+
+    def select(self, **filters) -> list:
+        """Runs the expression with `sh`, as on the pod, and returns the selected files."""
+        result = subprocess.run(
+            ['sh', '-c', f"find . {find_filters(**filters)} -print"],
+            cwd=self.folder, capture_output=True, text=True, check=True
+        )
+        return sorted(line[2:] for line in result.stdout.splitlines())
+
+    def test_no_filter_selects_every_file(self):
+        self.assertEqual(find_filters(), "-type f")
+        self.assertEqual(find_filters(include=[' '], exclude=['/']), "-type f")
+        self.assertEqual(self.select(), sorted(FILES))
+
+    def test_excluded_names_are_pruned_anywhere(self):
+        self.assertEqual(
+            find_filters(exclude=['node_modules', '*.log']),
+            "\\( -name node_modules -o -name '*.log' \\) -prune -o -type f"
+        )
+        self.assertEqual(
+            self.select(exclude=['node_modules/', '*.log']),
+            sorted(name for name in FILES if 'node_modules' not in name and not name.endswith('.log'))
+        )
+
+    def test_paths_are_relative_to_the_origin(self):
+        self.assertEqual(find_filters(exclude=['/storage/logs']), "\\( -path ./storage/logs \\) -prune -o -type f")
+        self.assertEqual(find_filters(exclude=['./storage/logs']), find_filters(exclude=['storage/logs']))
+
+        selected = self.select(exclude=['storage/logs', 'public/*.map'])
+        self.assertNotIn('storage/logs/laravel.log', selected)
+        self.assertNotIn('public/app.js.map', selected)
+        self.assertIn('public/app.js', selected)
+        self.assertIn('app.log', selected)
+
+    def test_include_only_matching_files(self):
+        self.assertEqual(self.select(include=['*.js'], exclude=['node_modules']), ['public/app.js'])
+
+    def test_patterns_are_quoted_for_the_shell(self):
+        self.assertEqual(self.select(include=["it's here.txt", '$(touch pwned).txt']),
+                         ['docs/$(touch pwned).txt', "docs/it's here.txt"])
+        self.assertFalse((self.folder / 'pwned').exists())
+
+    def test_max_size_in_mib(self):
+        self.assertEqual(find_filters(max_size=1), "-type f -size -1048577c")
+        self.assertEqual(find_filters(max_size='0.5'), "-type f -size -524289c")
+        self.assertEqual(self.select(max_size=0.001), sorted(name for name in FILES if name != 'index.php'))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+"""
+Health summary of a cluster of the inventory, aggregated per namespace from its listings.
+"""
+
+import unittest
+import support  # noqa: F401 (project paths)
+from azure.inventory import summarize_cluster, problems_cell
+
+def namespace(name: str, phase: str = "Active") -> dict:
+    return {"metadata": {"name": name}, "status": {"phase": phase}}
+
+def deployment(namespace: str, name: str, replicas: int, available: int) -> dict:
+    return {"metadata": {"namespace": namespace, "name": name}, "spec": {"replicas": replicas},
+            "status": {"availableReplicas": available}}
+
+def pod(namespace: str, name: str, status: dict, containers: int = 1) -> dict:
+    return {"metadata": {"namespace": namespace, "name": name}, "spec": {"containers": [{}] * containers}, "status": status}
+
+def running(*ready: bool, restarts: int = 0) -> dict:
+    return {"phase": "Running", "containerStatuses": [
+        {"ready": flag, "restartCount": restarts, "state": {"running": {}}} for flag in ready
+    ]}
+
+class SummarizeClusterTest(unittest.TestCase):
+
+    def setUp(self):
+        self.namespaces = {"items": [namespace("web"), namespace("api"), namespace("old", "Terminating")]}
+        self.deployments = {"items": [
+            deployment("api", "api", 3, 3),
+            deployment("api", "worker", 2, 1),
+            deployment("web", "front", 0, 0),
+            deployment("kube-system", "coredns", 2, 2),
+        ]}
+        self.pods = {"items": [
+            pod("api", "api-1", running(True, restarts=2)),
+            pod("api", "api-2", running(True, False, restarts=1), containers=2),
+            pod("api", "worker-1", {"phase": "Running", "containerStatuses": [
+                {"ready": False, "restartCount": 7, "state": {"waiting": {"reason": "CrashLoopBackOff"}}}
+            ]}),
+            pod("api", "migrate-1", {"phase": "Succeeded", "containerStatuses": [
+                {"ready": False, "restartCount": 0, "state": {"terminated": {"exitCode": 0, "reason": "Completed"}}}
+            ]}),
+            pod("web", "front-1", {"phase": "Pending"}),
+            pod("kube-system", "coredns-1", running(True)),
+        ]}
+
+    def test_summary_per_namespace(self):
+        summary = summarize_cluster(self.namespaces, self.deployments, self.pods)
+
+        self.assertEqual([entry['namespace'] for entry in summary], ["api", "old", "web"])
+        api, old, web = summary
+        self.assertEqual(
+            {key: api[key] for key in ('status', 'deployments', 'available', 'pods', 'healthy', 'restarts')},
+            {"status": "Active", "deployments": 2, "available": 1, "pods": 4, "healthy": 2, "restarts": 11}
+        )
+        self.assertEqual(api['problems'], ["api-2 (1/2 ready)", "worker-1 (CrashLoopBackOff)"])
+        self.assertEqual(web['available'], 1)
+        self.assertEqual(web['problems'], ["front-1 (Pending)"])
+        self.assertEqual((old['status'], old['deployments'], old['pods'], old['problems']), ("Terminating", 0, 0, []))
+
+    def test_only_selected_namespaces(self):
+        summary = summarize_cluster(self.namespaces, self.deployments, self.pods, only=["web", "missing"])
+        self.assertEqual([entry['namespace'] for entry in summary], ["web"])
+        self.assertEqual(summary[0]['deployments'], 1)
+
+    def test_empty_listings(self):
+        self.assertEqual(summarize_cluster({}, {}, {}), [])
+        (entry,) = summarize_cluster({"items": [namespace("api")]}, {"items": None}, {})
+        self.assertEqual((entry['deployments'], entry['pods']), (0, 0))
+
+    def test_problems_cell(self):
+        self.assertEqual(problems_cell([]), '-')
+        self.assertEqual(problems_cell(['a (Error)', 'b (Pending)']), 'a (Error), b (Pending)')
+        self.assertEqual(problems_cell(['a (Error)', 'b (Pending)', 'c (Error)']), 'a (Error), b (Pending) +1 more')
+
+if __name__ == "__main__":
+    unittest.main()
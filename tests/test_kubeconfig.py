@@ -0,0 +1,119 @@
+"""
+Offline check of the credential of a kubeconfig, and the expiry read from a client certificate.
+"""
+
+import os
+import time
+import base64
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+import support  # noqa: F401 (project paths)
+from azure.kubeconfig import certificate_expiry, credential_valid
+
+DAY = 86400
+
+def certificate_data(not_after: float) -> str:
+    """
+    Encodes a certificate as in `client-certificate-data`: only its validity period is real DER.
+
+    Times up to 2049 use UTCTime and later ones GeneralizedTime, as RFC 5280 requires.
+    """
+    def der_time(seconds: float) -> bytes:
+        moment = time.gmtime(seconds)
+        if moment.tm_year < 2050:
+            return b'\x17\x0d' + time.strftime('%y%m%d%H%M%S', moment).encode() + b'Z'
+        return b'\x18\x0f' + time.strftime('%Y%m%d%H%M%S', moment).encode() + b'Z'
+
+    validity = der_time(not_after - 365 * DAY) + der_time(not_after)
+    der = b'\x30\x82\x01\x00\xa0\x03\x02\x01\x02\x02\x01\x01' + b'\x30' + bytes([len(validity)]) + validity + b'\x00' * 32
+    body = base64.encodebytes(der).decode('ascii')
+    pem = f"-----BEGIN CERTIFICATE-----\n{body}-----END CERTIFICATE-----\n"
+    return base64.b64encode(pem.encode('ascii')).decode('ascii')
+
+def kubeconfig(user: str, current: str = "aks-dev") -> str:
+    """A kubeconfig as written by `az aks get-credentials`, with the given user entry."""
+    return f"""apiVersion: v1
+clusters:
+- cluster:
+    certificate-authority-data: LS0tLS1CRUdJTg==
+    server: https://aks-dev.hcp.westeurope.azmk8s.io:443
+  name: aks-dev
+contexts:
+- context:
+    cluster: aks-dev
+    user: clusterUser_rg_aks-dev
+  name: aks-dev
+current-context: {current}
+kind: Config
+preferences: {{}}
+users:
+- name: clusterAdmin_rg_aks-dev
+  user:
+    token: admin-token
+- name: clusterUser_rg_aks-dev
+  user:
+{user}"""
+
+class CertificateExpiryTest(unittest.TestCase):
+
+    def test_utc_time(self):
+        not_after = int(time.time()) + 30 * DAY
+        self.assertEqual(certificate_expiry(certificate_data(not_after)), not_after)
+
+    def test_generalized_time(self):
+        not_after = 2556144000  # 2051-01-01
+        self.assertEqual(certificate_expiry(certificate_data(not_after)), not_after)
+
+    def test_unreadable_certificate(self):
+        self.assertIsNone(certificate_expiry("not base64!"))
+        self.assertIsNone(certificate_expiry(base64.b64encode(b'\xff\xfe').decode()))
+        self.assertIsNone(certificate_expiry(base64.b64encode(b'-----BEGIN CERTIFICATE-----\nAAAA\n').decode()))
+
+class CredentialValidTest(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = Path(tempfile.mkdtemp(prefix="azure-cli-test-"))
+        self.addCleanup(shutil.rmtree, self.folder, True)
+        self.path = self.folder / 'config'
+
+    def valid(self, user: str, **kwargs) -> bool:
+        self.path.write_text(kubeconfig(user, **kwargs))
+        return credential_valid(self.path)
+
+    def test_client_certificate(self):
+        self.assertTrue(self.valid(f"    client-certificate-data: {certificate_data(time.time() + 30 * DAY)}\n"))
+        self.assertFalse(self.valid(f"    client-certificate-data: {certificate_data(time.time() + 60)}\n"))
+        self.assertFalse(self.valid("    client-certificate-data: garbage\n"))
+
+    def test_exec_plugin_must_be_installed(self):
+        plugin = "    exec:\n      apiVersion: client.authentication.k8s.io/v1beta1\n      command: kubelogin\n      args:\n      - get-token\n"
+        binary = self.folder / 'kubelogin'
+        binary.write_text("#!/bin/sh\n")
+
+        with mock.patch.dict(os.environ, {'PATH': str(self.folder)}):
+            self.assertFalse(self.valid(plugin))
+            binary.chmod(0o755)
+            self.assertTrue(self.valid(plugin))
+
+    def test_legacy_auth_provider(self):
+        provider = "    auth-provider:\n      config:\n        access-token: eyJ0eXAi\n        expires-on: \"{}\"\n      name: azure\n"
+        self.assertTrue(self.valid(provider.format(int(time.time()) + 3600)))
+        self.assertFalse(self.valid(provider.format(int(time.time()) + 60)))
+        self.assertFalse(self.valid(provider.format("soon")))
+
+    def test_static_token(self):
+        self.assertTrue(self.valid("    token: 0123456789abcdef\n"))
+
+    def test_missing_file_context_or_user(self):
+        self.assertFalse(credential_valid(self.folder / 'missing'))
+        self.assertFalse(self.valid("    token: 0123456789abcdef\n", current="other"))
+        self.assertFalse(self.valid("    username: admin\n"))
+
+        self.path.write_text(kubeconfig("    token: abc\n").replace("user: clusterUser_rg_aks-dev", "user: removed"))
+        self.assertFalse(credential_valid(self.path))
+
+if __name__ == "__main__":
+    unittest.main()
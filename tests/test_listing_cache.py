@@ -0,0 +1,40 @@
+"""
+Listings cached between runs: reused only within the TTL, and labelled as cached when displayed.
+"""
+
+import json
+import unittest
+from support import ShimTestCase
+
+TITLE = "Available Kubernetes namespaces"
+
+class ListingCacheTest(ShimTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.write_config(
+            listing={"cache-ttl": 60},
+            namespace={"select": "default", "echo": True}
+        )
+
+    def title(self, output: str) -> str:
+        return next(line for line in output.splitlines() if line.startswith(TITLE))
+
+    def test_cached_table_is_labelled(self):
+        self.assertEqual(self.title(self.run_cli().stdout), f"{TITLE}:")
+        self.assertIn("(cached", self.title(self.run_cli().stdout))
+        self.assertEqual(self.title(self.run_cli('--refresh').stdout), f"{TITLE}:")
+
+    def test_expired_listing_is_fetched_again(self):
+        self.run_cli()
+
+        # Age every cached listing past the TTL
+        for path in (self.workdir / 'cache' / 'listings').glob('*.json'):
+            entry = json.loads(path.read_text())
+            entry['fetched'] -= 120
+            path.write_text(json.dumps(entry))
+
+        self.assertEqual(self.title(self.run_cli().stdout), f"{TITLE}:")
+
+if __name__ == "__main__":
+    unittest.main()
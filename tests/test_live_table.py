@@ -0,0 +1,90 @@
+"""
+Live pod table: rows rewritten in place, and warnings kept on a status line so they never shift the rows.
+"""
+
+import io
+import re
+import unittest
+from contextlib import redirect_stdout
+import support  # noqa: F401 (project paths)
+from lib.output import Console, LiveTable
+
+# Cursor movements, line erasing and SGR colours written by the live table
+ESCAPE = re.compile(r'\033\[([\d;]*)([EFKm])|\n|[^\033\n]+')
+
+def screen(output: str) -> list:
+    """Replays the output on a terminal model and returns its lines, without colours."""
+    lines, row = [''], 0
+    for match in ESCAPE.finditer(output):
+        code = match.group(2)
+        count = int(match.group(1) or 1) if code in ('E', 'F') else 1
+        if code == 'F':
+            row -= count
+        elif code == 'E' or match.group() == '\n':
+            row += 1 if code is None else count
+            lines += [''] * (row + 1 - len(lines))
+        elif code == 'K':
+            lines[row] = ''
+        elif code is None:
+            lines[row] += match.group()
+    return [line.rstrip() for line in lines[:-1]]
+
+class LiveTableTest(unittest.TestCase):
+
+    def setUp(self):
+        Console.configure('text')
+        self.output = io.StringIO()
+        with redirect_stdout(self.output):
+            self.table = LiveTable(headers=['Name', 'Status'], widths=[5, 7], live=True)
+        self.addCleanup(self.table.close)
+
+    def draw(self, action, *args):
+        with redirect_stdout(self.output):
+            action(*args)
+        return screen(self.output.getvalue())
+
+    def test_rows_are_rewritten_in_place(self):
+        self.draw(self.table.upsert, 'a', ['pod-a', 'Pending'])
+        self.draw(self.table.upsert, 'b', ['pod-b', 'Pending'])
+        self.draw(self.table.upsert, 'a', ['pod-a', 'Running'])
+        self.draw(self.table.remove, 'b')
+
+        self.assertEqual(self.draw(self.table.upsert, 'c', ['pod-c', 'Running']),
+                         ['Name  | Status', '------+--------', 'pod-a | Running', 'pod-c | Running'])
+
+    def test_warnings_use_the_status_line(self):
+        self.draw(self.table.upsert, 'a', ['pod-a', 'Pending'])
+        self.draw(Console.textWarning, "Pod watch failed (i/o timeout). Restarting in 1s...")
+        self.draw(Console.textWarning, "Pod watch failed (i/o timeout). Restarting in 2s...")
+        self.draw(self.table.upsert, 'a', ['pod-a', 'Running'])
+
+        self.assertEqual(self.draw(self.table.upsert, 'b', ['pod-b', 'Pending']), [
+            'Name  | Status', '------+--------', 'pod-a | Running', 'pod-b | Pending',
+            'Pod watch failed (i/o timeout). Restarting in 2s...',
+        ])
+
+        self.draw(self.table.remove, 'a')
+        self.assertEqual(self.draw(self.table.status), [
+            'Name  | Status', '------+--------', '', 'pod-b | Pending', '',
+        ])
+
+    def test_closed_table_stops_routing_warnings(self):
+        self.assertIs(Console.live, self.table)
+        self.table.close()
+        self.assertIsNone(Console.live)
+
+        self.draw(Console.textWarning, "Done")
+        self.assertEqual(screen(self.output.getvalue())[-1], "Done")
+
+    def test_table_without_terminal_prints_warnings(self):
+        self.table.close()
+        output = io.StringIO()
+        with redirect_stdout(output):
+            table = LiveTable(headers=['Name'], widths=[5], live=False)
+            table.status("Restarting in 1s...")
+            table.status()
+        self.assertIsNone(Console.live)
+        self.assertTrue(output.getvalue().endswith("Restarting in 1s...\033[0m\n"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+"""
+Prefetched listings: each output is served once, and never to a listing that must be fetched live
+or that is streamed page by page.
+"""
+
+import sys
+import unittest
+from unittest import mock
+import support  # noqa: F401 (project paths)
+from azure.prefetch import Prefetcher
+from azure.cli_manager import Azure
+
+# Prints a new value on every run, so a reused output is told apart from a fresh one
+COMMAND = [sys.executable, '-c', 'import time; print(time.time_ns())']
+
+class PrefetcherTest(unittest.TestCase):
+
+    def setUp(self):
+        self.prefetcher = Prefetcher()
+        self.addCleanup(self.prefetcher.shutdown)
+
+    def test_output_is_served_once(self):
+        self.prefetcher.schedule(COMMAND)
+        self.assertIsNotNone(self.prefetcher.take(COMMAND))
+        self.assertIsNone(self.prefetcher.take(COMMAND))
+
+    def test_refresh_runs_the_command(self):
+        azure = Azure.__new__(Azure)
+        azure.prefetcher = self.prefetcher
+
+        self.prefetcher.schedule(COMMAND)
+        prefetched = self.prefetcher._entries[tuple(COMMAND)].future.result()
+
+        with mock.patch.object(self.prefetcher, 'take', wraps=self.prefetcher.take) as take:
+            self.assertNotEqual(azure.fetch(COMMAND, refresh=True), prefetched)
+            take.assert_not_called()
+            self.assertEqual(azure.fetch(COMMAND), prefetched)
+            self.assertNotEqual(azure.fetch(COMMAND), prefetched)
+
+    def test_chunked_listings_are_not_prefetched(self):
+        azure = Azure.__new__(Azure)
+        azure.prefetcher = self.prefetcher
+        command = lambda value: COMMAND + [value]
+
+        with mock.patch.object(self.prefetcher, 'schedule') as schedule:
+            azure.chunk_size = 50
+            azure.prefetchChoices(['default', 'api'], ['api'], command)
+            schedule.assert_not_called()
+
+            azure.chunk_size = None
+            azure.prefetchChoices(['default', 'api'], ['api'], command)
+            self.assertEqual([call.args[0][-1] for call in schedule.call_args_list], ['default', 'api'])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+"""
+Reuse of an existing Azure CLI session: the profile and MSAL token cache are read without running `az`.
+"""
+
+import json
+import time
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+import support  # noqa: F401 (project paths)
+from azure.profile import AzureProfile
+
+TENANT = "11111111-2222-3333-4444-555555555555"
+HOME_ACCOUNT = f"user-oid.{TENANT}"
+
+class AzureProfileTest(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = Path(tempfile.mkdtemp(prefix="azure-cli-test-"))
+        self.addCleanup(shutil.rmtree, self.folder, True)
+        self.profile = AzureProfile(str(self.folder))
+        self.account = {"id": "sub-1", "name": "Production", "tenantId": TENANT, "state": "Enabled",
+                        "isDefault": True, "user": {"name": "Dev@Example.com", "type": "user"}}
+
+        # The Azure CLI writes its profile with a UTF-8 BOM
+        (self.folder / 'azureProfile.json').write_text(
+            json.dumps({"subscriptions": [
+                self.account,
+                {"id": "sub-2", "name": "Disabled", "tenantId": TENANT, "state": "Disabled", "isDefault": False},
+            ]}),
+            encoding='utf-8-sig'
+        )
+
+    def write_tokens(self, expires_in: int, realm: str = TENANT, username: str = "dev@example.com"):
+        (self.folder / 'msal_token_cache.json').write_text(json.dumps({
+            "Account": {HOME_ACCOUNT: {"home_account_id": HOME_ACCOUNT, "username": username}},
+            "AccessToken": {"token": {"home_account_id": HOME_ACCOUNT, "realm": realm,
+                                      "expires_on": str(int(time.time()) + expires_in)}},
+        }))
+
+    def test_find_account(self):
+        self.assertEqual(self.profile.find_account(TENANT)['id'], 'sub-1')
+        self.assertEqual(self.profile.find_account(TENANT, 'production')['id'], 'sub-1')
+        self.assertIsNone(self.profile.find_account(TENANT, 'sub-2'))
+        self.assertIsNone(self.profile.find_account('other-tenant'))
+
+    def test_valid_token(self):
+        self.write_tokens(3600)
+        self.assertTrue(self.profile.has_valid_token(self.account))
+
+    def test_token_expiring_within_the_margin(self):
+        self.write_tokens(120)
+        self.assertFalse(self.profile.has_valid_token(self.account))
+        self.assertTrue(self.profile.has_valid_token(self.account, min_validity=60))
+
+    def test_token_of_another_tenant_or_user(self):
+        self.write_tokens(3600, realm="other-tenant")
+        self.assertFalse(self.profile.has_valid_token(self.account))
+
+        self.write_tokens(3600, username="someone@example.com")
+        self.assertFalse(self.profile.has_valid_token(self.account))
+
+    def test_missing_or_encrypted_token_cache(self):
+        self.assertFalse(self.profile.has_valid_token(self.account))
+
+        (self.folder / 'msal_token_cache.json').write_bytes(b'\x00encrypted\xff')
+        self.assertFalse(self.profile.has_valid_token(self.account))
+
+if __name__ == "__main__":
+    unittest.main()
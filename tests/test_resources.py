@@ -0,0 +1,130 @@
+"""
+Typed records built from the `kubectl get -o json` listings, and the pod status shown by `kubectl get pods`.
+"""
+
+import json
+import time
+import unittest
+import support  # noqa: F401 (project paths)
+from azure.resources import parse_namespaces, parse_deployments, parse_pods, pod_status, label_selector, format_timestamp
+
+CREATED = "2025-01-07T10:00:00Z"
+
+def pod(name: str = "api-1", phase: str = "Running", containers: list = None, init: list = None, **metadata) -> dict:
+    """Builds a pod object with the given container statuses."""
+    status = {"phase": phase, "containerStatuses": containers or []}
+    if init is not None:
+        status["initContainerStatuses"] = init
+    return {
+        "metadata": {"name": name, "creationTimestamp": CREATED, **metadata},
+        "spec": {"containers": [{"name": "app"} for _ in containers or [None]]},
+        "status": status,
+    }
+
+def running(ready: bool = True, restarts: int = 0) -> dict:
+    return {"ready": ready, "restartCount": restarts, "state": {"running": {}}}
+
+def waiting(reason: str) -> dict:
+    return {"ready": False, "restartCount": 0, "state": {"waiting": {"reason": reason}}}
+
+def terminated(exit_code: int, reason: str = None) -> dict:
+    state = {"exitCode": exit_code, **({"reason": reason} if reason else {})}
+    return {"ready": False, "restartCount": 0, "state": {"terminated": state}}
+
+class ParseListingTest(unittest.TestCase):
+
+    def test_namespaces(self):
+        document = json.dumps({"items": [
+            {"metadata": {"name": "default", "creationTimestamp": CREATED}, "status": {"phase": "Active"}},
+            {"metadata": {"name": "old"}, "status": {}},
+        ]})
+
+        default, old = parse_namespaces(document)
+        self.assertEqual((default.name, default.status), ("default", "Active"))
+        self.assertEqual(format_timestamp(default.created), CREATED)
+        self.assertEqual(old.status, "Unknown")
+        self.assertLess(old.age, 60)
+
+    def test_deployments(self):
+        (deployment,) = parse_deployments({"items": [{
+            "metadata": {"name": "api", "creationTimestamp": CREATED},
+            "spec": {"replicas": 3, "selector": {"matchLabels": {"app": "api"}}},
+            "status": {"readyReplicas": 2, "updatedReplicas": 3, "availableReplicas": 2},
+        }]})
+
+        self.assertEqual(deployment.data()["selector"], "app=api")
+        self.assertEqual(deployment.row()[:4], ["api", "2/3", "3", "2"])
+
+    def test_scaled_down_deployment(self):
+        (deployment,) = parse_deployments({"items": [{"metadata": {"name": "idle"}, "spec": {"replicas": 0}, "status": {}}]})
+        self.assertEqual(deployment.row()[:4], ["idle", "0/0", "0", "0"])
+        self.assertEqual(deployment.selector, "")
+
+    def test_pods_count_ready_containers_and_restarts(self):
+        item = pod(containers=[running(restarts=2), running(ready=False, restarts=1)])
+        (record,) = parse_pods({"items": [item]})
+
+        self.assertEqual(record.row()[:4], ["api-1", "1/2", "Running", "3"])
+        self.assertEqual(format_timestamp(record.created), CREATED)
+
+    def test_empty_or_invalid_listing(self):
+        self.assertEqual(parse_pods('{"kind": "List", "items": null}'), [])
+        with self.assertRaises(ValueError):
+            parse_pods("error: You must be logged in to the server")
+
+class PodStatusTest(unittest.TestCase):
+
+    def test_phase_of_a_healthy_pod(self):
+        self.assertEqual(pod_status(pod(containers=[running()])), "Running")
+        self.assertEqual(pod_status(pod(phase="Pending")), "Pending")
+        self.assertEqual(pod_status({}), "Unknown")
+
+    def test_reason_overrides_the_phase(self):
+        item = pod(phase="Failed")
+        item["status"]["reason"] = "Evicted"
+        self.assertEqual(pod_status(item), "Evicted")
+
+    def test_waiting_or_terminated_container(self):
+        self.assertEqual(pod_status(pod(containers=[running(), waiting("CrashLoopBackOff")])), "CrashLoopBackOff")
+        self.assertEqual(pod_status(pod(phase="Succeeded", containers=[terminated(0, "Completed")])), "Completed")
+        self.assertEqual(pod_status(pod(phase="Failed", containers=[terminated(137)])), "ExitCode:137")
+
+    def test_init_containers_take_precedence(self):
+        initializing = {"state": {"waiting": {"reason": "PodInitializing"}}}
+        done = {"state": {"terminated": {"exitCode": 0, "reason": "Completed"}}}
+
+        self.assertEqual(pod_status(pod(phase="Pending", init=[done, initializing])), "Init:1/2")
+        self.assertEqual(pod_status(pod(phase="Pending", init=[{"state": {"waiting": {"reason": "ImagePullBackOff"}}}])), "Init:ImagePullBackOff")
+        self.assertEqual(pod_status(pod(phase="Pending", init=[{"state": {"terminated": {"exitCode": 1, "reason": "Error"}}}])), "Init:Error")
+        self.assertEqual(pod_status(pod(phase="Pending", init=[{"state": {"terminated": {"exitCode": 2}}}])), "Init:ExitCode:2")
+        self.assertEqual(pod_status(pod(init=[done], containers=[running()])), "Running")
+
+    def test_deleted_pod_is_terminating(self):
+        item = pod(containers=[waiting("CrashLoopBackOff")], deletionTimestamp=format_timestamp(time.time()))
+        self.assertEqual(pod_status(item), "Terminating")
+
+class LabelSelectorTest(unittest.TestCase):
+
+    def test_match_labels(self):
+        self.assertEqual(label_selector({"matchLabels": {"app": "api", "tier": "web"}}), "app=api,tier=web")
+        self.assertEqual(label_selector({}), "")
+        self.assertEqual(label_selector({"matchLabels": None, "matchExpressions": None}), "")
+
+    def test_match_expressions(self):
+        selector = {
+            "matchLabels": {"app": "api"},
+            "matchExpressions": [
+                {"key": "tier", "operator": "In", "values": ["web", "worker"]},
+                {"key": "env", "operator": "NotIn", "values": ["dev"]},
+                {"key": "release", "operator": "Exists"},
+                {"key": "canary", "operator": "DoesNotExist"},
+            ],
+        }
+        self.assertEqual(label_selector(selector), "app=api,tier in (web,worker),env notin (dev),release,!canary")
+
+    def test_unknown_operator_is_ignored(self):
+        selector = {"matchExpressions": [{"key": "tier", "operator": "Gt", "values": ["1"]}]}
+        self.assertEqual(label_selector(selector), "")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+"""
+Resumable backups: a full backup is staged next to the backup folder and only replaces it once complete.
+"""
+
+import os
+import io
+import unittest
+import contextlib
+from unittest import mock
+from support import ShimTestCase, ORIGIN, build_tree
+
+import azure.backup
+from azure.cli_manager import Azure
+
+class ResumableBackupTest(ShimTestCase):
+
+    def setUp(self):
+        super().setUp()
+        # Three units of about 1 MiB
+        build_tree(self.workdir / 'pod' / ORIGIN.lstrip('/'), 30, 100 * 1024)
+        patcher = mock.patch.dict(os.environ, self.environment)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.azure = Azure(banner=False)
+        self.addCleanup(self.azure.close)
+        self.backup_path = self.workdir / 'backups' / 'pod'
+
+    def backup(self, **options):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return self.azure.runBackup(
+                folder=str(self.backup_path), origin=ORIGIN, namespace='default', pod=self.running_pod(),
+                resumable=True, unit_size=1, retries=0, progress=False, **options
+            )
+
+    def test_interrupted_full_backup_keeps_previous_backup(self):
+        self.backup_path.mkdir(parents=True)
+        (self.backup_path / 'previous.txt').write_text('previous backup')
+
+        # The connection drops after the first unit
+        stream_tar = azure.backup.stream_tar
+        calls = []
+        def dropping(*args, **kwargs):
+            calls.append(1)
+            if len(calls) > 1:
+                raise RuntimeError("error: unexpected EOF")
+            return stream_tar(*args, **kwargs)
+
+        with mock.patch('azure.backup.stream_tar', side_effect=dropping):
+            with self.assertRaises(ValueError):
+                self.backup()
+
+        self.assertEqual((self.backup_path / 'previous.txt').read_text(), 'previous backup')
+        partial = self.workdir / 'backups' / '.pod.partial'
+        self.assertTrue(any(partial.rglob('*.php')))
+
+        # Resuming completes the copy and swaps it into place
+        self.backup(resume=True)
+        self.azure.close()
+        self.assertFalse(partial.exists())
+        self.assertFalse((self.backup_path / 'previous.txt').exists())
+        self.assertEqual(len(list(self.backup_path.rglob('*.php'))), 30)
+        self.assertFalse((self.workdir / 'backups' / '.pod.journal').exists())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,34 @@
+"""
+Classification of failed commands: only API server and network errors are retried.
+"""
+
+import unittest
+import support  # noqa: F401 (project paths)
+from azure.runner import TRANSIENT_ERRORS
+
+class TransientErrorsTest(unittest.TestCase):
+
+    def test_transient_errors(self):
+        for stderr in (
+            "Error from server (TooManyRequests): the server has received too many requests and has asked us to try again later",
+            "Error from server (ServiceUnavailable): the server is currently unable to handle the request",
+            "Unable to connect to the server: dial tcp 10.0.0.1:443: i/o timeout",
+            "error: an error on the server (\"\") has prevented the request from succeeding (get pods): status code 503",
+            "ERROR: (429) Too many requests. Please retry.",
+            "Error: HTTP 502 Bad Gateway",
+            "unexpected response: HTTP/1.1 504 Gateway Timeout",
+        ):
+            self.assertTrue(TRANSIENT_ERRORS.search(stderr), stderr)
+
+    def test_permanent_errors_mentioning_status_numbers(self):
+        for stderr in (
+            'Error from server (NotFound): pods "web-504" not found',
+            'Error from server (NotFound): deployments.apps "api-429" not found',
+            'Error from server (Forbidden): pods is forbidden: User "user-502" cannot list resource "pods"',
+            'error: unable to upgrade connection: container not found ("app-503")',
+            "Error from server (BadRequest): container app is not valid for pod api-7d9f8c6b5-xk502",
+        ):
+            self.assertIsNone(TRANSIENT_ERRORS.search(stderr), stderr)
+
+if __name__ == "__main__":
+    unittest.main()
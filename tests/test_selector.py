@@ -0,0 +1,65 @@
+"""
+Search of the selection prompt: ranking of the matches, incremental filtering and tolerance to typos.
+"""
+
+import unittest
+import support  # noqa: F401 (project paths)
+from lib.selector import ChoiceIndex
+
+CHOICES = ['api-7d9f-x6wc6', 'web-front-1', 'api-worker-5c6d', 'redis-master-0', 'payments-api-0', 'kube-proxy-abc']
+
+class ChoiceIndexTest(unittest.TestCase):
+
+    def test_empty_query_lists_recent_choices_first(self):
+        index = ChoiceIndex(CHOICES, recent=['redis-master-0', 'missing', 'redis-master-0'])
+        self.assertEqual(index.search('  ', limit=3), (['redis-master-0', 'api-7d9f-x6wc6', 'web-front-1'], 6))
+
+    def test_short_query_matches_the_start_of_words(self):
+        self.assertEqual(
+            ChoiceIndex(CHOICES).search('AP'),
+            (['api-7d9f-x6wc6', 'api-worker-5c6d', 'payments-api-0'], 3)
+        )
+        self.assertEqual(ChoiceIndex(CHOICES).search('ma'), (['redis-master-0'], 1))
+        self.assertEqual(ChoiceIndex(CHOICES).search('pi'), ([], 0))
+
+    def test_recent_matches_come_first(self):
+        index = ChoiceIndex(CHOICES, recent=['payments-api-0'])
+        self.assertEqual(index.search('ap')[0], ['payments-api-0', 'api-7d9f-x6wc6', 'api-worker-5c6d'])
+        self.assertEqual(index.search('api')[0], ['payments-api-0', 'api-7d9f-x6wc6', 'api-worker-5c6d'])
+
+    def test_long_query_matches_anywhere(self):
+        index = ChoiceIndex(CHOICES)
+        self.assertEqual(index.search('api'), (['api-7d9f-x6wc6', 'api-worker-5c6d', 'payments-api-0'], 3))
+        self.assertEqual(index.search('ork'), (['api-worker-5c6d'], 1))
+        self.assertEqual(index.search('er-', limit=1), (['api-worker-5c6d'], 2))
+
+    def test_longer_query_filters_the_previous_matches(self):
+        index = ChoiceIndex(CHOICES)
+        self.assertEqual(index.search('wor')[1], 1)
+        self.assertEqual(index.last_matches, [2])
+
+        self.assertEqual(index.search('work'), (['api-worker-5c6d'], 1))
+        self.assertEqual(index.search('worke'), (['api-worker-5c6d'], 1))
+        self.assertEqual(index.search('red'), (['redis-master-0'], 1))
+        self.assertEqual(index.last_matches, [3])
+
+    def test_typos_return_similar_choices(self):
+        self.assertEqual(ChoiceIndex(CHOICES).search('paymetns'), (['payments-api-0'], 1))
+        self.assertEqual(ChoiceIndex(CHOICES).search('workers'), (['api-worker-5c6d'], 1))
+        self.assertEqual(ChoiceIndex(CHOICES).search('zzzzzz'), ([], 0))
+
+    def test_limit_and_total(self):
+        index = ChoiceIndex([f"pod-{number}" for number in range(1000)])
+
+        best, total = index.search('pod-1', limit=5)
+        self.assertEqual(best, ['pod-1', 'pod-10', 'pod-100', 'pod-101', 'pod-102'])
+        self.assertEqual(total, 111)
+        self.assertEqual(index.search('99', limit=3), (['pod-99', 'pod-990', 'pod-991'], 11))
+
+    def test_membership(self):
+        index = ChoiceIndex(CHOICES)
+        self.assertIn('web-front-1', index)
+        self.assertNotIn('web', index)
+
+if __name__ == "__main__":
+    unittest.main()
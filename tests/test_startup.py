@@ -0,0 +1,85 @@
+"""
+Start-up path: --help imports no heavy module, a warm run lists the namespaces before any other command,
+and both stay within a wall-clock budget.
+
+The budgets are several times the ones of `benchmarks/bench_startup.py`, which measures the same paths more
+precisely: they catch a start-up regression (a heavy import or an extra round trip) on any test machine.
+"""
+
+import sys
+import json
+import statistics
+import unittest
+import subprocess
+from support import ShimTestCase, ROOT_DIR
+from bench_startup import time_to_output, FIRST_OUTPUT
+
+# Median seconds allowed to print --help, and to print the first listing of a warm run
+HELP_BUDGET = 1.5
+FIRST_OUTPUT_BUDGET = 4.0
+
+# Modules only needed once the cluster is contacted or a backup runs
+HEAVY_MODULES = [
+    'azure.cli_manager', 'azure.backup', 'azure.runner', 'azure.snapshots', 'azure.profile',
+    'json', 'subprocess', 'tarfile', 'tempfile', 'hashlib', 'threading', 'concurrent.futures',
+]
+
+class HelpImportsTest(unittest.TestCase):
+
+    def test_help_skips_heavy_modules(self):
+        result = subprocess.run(
+            [sys.executable, '-B', '-X', 'importtime', str(ROOT_DIR / 'azure-cli.py'), '--help'],
+            capture_output=True, text=True, stdin=subprocess.DEVNULL, timeout=60
+        )
+        self.assertEqual(result.returncode, 0, result.stderr[-2000:])
+        self.assertIn("usage:", result.stdout)
+
+        # Lines of -X importtime: "import time: self [us] | cumulative | imported package"
+        imported = {
+            line.rsplit('|', 1)[1].strip() for line in result.stderr.splitlines()
+            if line.startswith('import time:') and '|' in line
+        }
+        self.assertIn('argparse', imported)
+        for module in HEAVY_MODULES:
+            self.assertNotIn(module, imported)
+
+class FirstListingTest(ShimTestCase):
+
+    def commands(self, *args: str) -> list:
+        """Runs azure-cli.py and returns the `az` and `kubectl` commands it ran, in order."""
+        log = self.workdir / 'commands.log'
+        log.unlink(missing_ok=True)
+        self.environment['BENCH_COMMAND_LOG'] = str(log)
+        self.run_cli(*args)
+        return [json.loads(line) for line in log.read_text().splitlines()] if log.exists() else []
+
+    def test_warm_run_lists_namespaces_first(self):
+        self.write_config(namespace={"select": "default", "echo": True})
+
+        # A first run logs in and caches the credentials and the tool detection
+        self.assertTrue(any(command[0] == 'az' for command in self.commands()))
+
+        commands = self.commands()
+        self.assertTrue(commands)
+        self.assertEqual(commands[0], ['kubectl', 'get', '--raw', '/api/v1/namespaces'])
+        self.assertFalse([command for command in commands if command[0] == 'az'])
+        self.assertFalse([command for command in commands if 'version' in command])
+
+class StartupBudgetTest(ShimTestCase):
+
+    def median(self, command: list, marker: str = None, repeat: int = 3) -> float:
+        return statistics.median(time_to_output(command, self.environment, marker) for _ in range(repeat))
+
+    def test_help_within_budget(self):
+        self.assertLess(self.median(['--help']), HELP_BUDGET)
+
+    def test_first_listing_within_budget(self):
+        self.write_config(namespace={"select": "default", "echo": True})
+        run = ['--no-banner', '--output', 'plain']
+
+        # A first run logs in and caches the credentials and the tool detection
+        time_to_output(run, self.environment, FIRST_OUTPUT)
+        self.assertLess(self.median(run, FIRST_OUTPUT), FIRST_OUTPUT_BUDGET)
+
+if __name__ == "__main__":
+    unittest.main()
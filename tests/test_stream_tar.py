@@ -0,0 +1,136 @@
+"""
+Exit codes of the remote `tar`, with or without a compressor: 1 (files changed while read) is a warning,
+anything else fails the backup.
+"""
+
+import os
+import json
+import shutil
+import unittest
+from support import ShimTestCase, ORIGIN, build_tree
+
+# Stand-in for the pod's `tar`: deletes FAKE_TAR_REMOVE first, as a live pod would between the listing
+# and the archive, and archives with the real one. With FAKE_TAR_EXIT, it then reports FAKE_TAR_MESSAGE
+# (by default a file that changed while read) and exits with that code.
+FAKE_TAR = """#!/bin/sh
+[ -z "$FAKE_TAR_REMOVE" ] || rm -f "$FAKE_TAR_REMOVE"
+"$REAL_TAR" "$@"
+status=$?
+[ -n "$FAKE_TAR_EXIT" ] || exit $status
+echo "${FAKE_TAR_MESSAGE:-tar: ./module_0000/file_000003.php: file changed as we read it}" >&2
+exit "$FAKE_TAR_EXIT"
+"""
+
+DENIED = "tar: ./module_0000/file_000003.php: Cannot open: Permission denied"
+
+CHANGED = 'module_0000/file_000003.php'
+
+class RemoteTarExitTest(ShimTestCase):
+
+    def setUp(self):
+        super().setUp()
+        tools = self.workdir / 'tools'
+        tools.mkdir()
+        (tools / 'tar').write_text(FAKE_TAR)
+        (tools / 'tar').chmod(0o755)
+        self.environment['REAL_TAR'] = shutil.which('tar')
+        self.environment['PATH'] = f"{tools}{os.pathsep}{self.environment['PATH']}"
+        self.manifest = self.workdir / 'backups' / '.pod.manifest.json'
+
+    def test_changed_files_are_a_warning_and_checked_again(self):
+        self.write_config(backup={"incremental": True})
+        self.environment['FAKE_TAR_EXIT'] = '1'
+
+        result = self.run_cli('--backup')
+        self.assertIn("changed on the pod while they were archived", result.stdout + result.stderr)
+        files = json.loads(self.manifest.read_text())['files']
+        self.assertEqual(len(files), 19)
+        self.assertNotIn(CHANGED, files)
+
+        # The next backup transfers the file again, and only it
+        self.environment['PATH'] = self.environment['PATH'].split(os.pathsep, 1)[1]
+        result = self.run_cli('--backup')
+        self.assertIn("1 files transferred", result.stdout)
+        self.assertIn(CHANGED, json.loads(self.manifest.read_text())['files'])
+
+    def test_changed_files_are_checked_again_by_resumable_backups(self):
+        self.write_config(backup={"resumable": True})
+        self.environment['FAKE_TAR_EXIT'] = '1'
+
+        self.run_cli('--backup')
+        files = json.loads(self.manifest.read_text())['files']
+        self.assertEqual(len(files), 19)
+        self.assertTrue((self.workdir / 'backups' / 'pod' / CHANGED).is_file())
+
+    def test_other_exit_codes_fail(self):
+        self.write_config(backup={"incremental": True})
+        self.environment['FAKE_TAR_EXIT'] = '2'
+        self.environment['FAKE_TAR_MESSAGE'] = DENIED
+
+        result = self.run_cli('--backup', check=False)
+        self.assertNotEqual(result.returncode, 0)
+        self.assertIn("exit code 2", result.stdout + result.stderr)
+        self.assertFalse(self.manifest.exists())
+
+    def test_exit_code_of_tar_is_kept_behind_the_compressor(self):
+        self.write_config(backup={"incremental": True, "compression": "gzip"})
+        self.environment['FAKE_TAR_EXIT'] = '2'
+        self.environment['FAKE_TAR_MESSAGE'] = DENIED
+
+        result = self.run_cli('--backup', check=False)
+        self.assertNotEqual(result.returncode, 0)
+        self.assertIn("exit code 2", result.stdout + result.stderr)
+        self.assertIn("Permission denied", result.stdout + result.stderr)
+        self.assertNotIn("tar exit status", result.stdout + result.stderr)
+        self.assertFalse(self.manifest.exists())
+
+    def test_changed_files_are_detected_behind_the_compressor(self):
+        self.write_config(backup={"incremental": True, "compression": "gzip"})
+        self.environment['FAKE_TAR_EXIT'] = '1'
+
+        result = self.run_cli('--backup')
+        self.assertIn("changed on the pod while they were archived", result.stdout + result.stderr)
+        self.assertNotIn(CHANGED, json.loads(self.manifest.read_text())['files'])
+
+    def test_files_deleted_since_the_listing_are_skipped(self):
+        for compression in ('none', 'gzip'):
+            with self.subTest(compression=compression):
+                self.write_config(backup={"incremental": True, "compression": compression, "folder": str(self.workdir / compression)})
+                manifest = self.workdir / f'.{compression}.manifest.json'
+                self.run_cli('--backup')
+
+                # The file changes on the pod, then is deleted after the listing and before tar reads it
+                (self.workdir / 'pod' / ORIGIN.lstrip('/') / CHANGED).write_text("changed")
+                self.environment['FAKE_TAR_REMOVE'] = CHANGED
+                result = self.run_cli('--backup')
+                self.assertIn("changed on the pod while they were archived", result.stdout + result.stderr)
+                self.assertNotIn(CHANGED, json.loads(manifest.read_text())['files'])
+                self.assertFalse((self.workdir / compression / CHANGED).exists())
+
+                del self.environment['FAKE_TAR_REMOVE']
+                result = self.run_cli('--backup')
+                self.assertIn("0 files transferred", result.stdout)
+                self.assertEqual(len(json.loads(manifest.read_text())['files']), 19)
+                build_tree(self.workdir / 'pod' / ORIGIN.lstrip('/'), 20, 256)
+
+    def test_snapshot_leaves_out_files_deleted_since_the_listing(self):
+        self.write_config()
+        self.environment['FAKE_TAR_REMOVE'] = CHANGED
+
+        self.run_cli('--backup', '--snapshot')
+        snapshots = self.workdir / 'backups' / 'pod' / 'snapshots'
+        files = json.loads(next(snapshots.glob('*.json')).read_text())['files']
+        self.assertEqual(len(files), 19)
+        self.assertNotIn(CHANGED, files)
+
+    def test_full_archive_fails_behind_the_compressor(self):
+        self.write_config(backup={"compression": "gzip", "archive": True})
+        self.environment['FAKE_TAR_EXIT'] = '2'
+        self.environment['FAKE_TAR_MESSAGE'] = DENIED
+
+        result = self.run_cli('--backup', check=False)
+        self.assertNotEqual(result.returncode, 0)
+        self.assertFalse((self.workdir / 'backups' / 'pod.tar.gz').exists())
+
+if __name__ == "__main__":
+    unittest.main()
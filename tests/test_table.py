@@ -0,0 +1,91 @@
+"""
+Console tables: column widths computed from a sample of the rows, and paging one screen at a time.
+"""
+
+import io
+import os
+import unittest
+from unittest import mock
+from contextlib import redirect_stdout
+import support  # noqa: F401 (project paths)
+from lib.output import Console
+
+HEADERS = ['Name', 'Status']
+
+def rows(count: int, start: int = 0) -> list:
+    return [[f"pod-{index}", 'Running'] for index in range(start, start + count)]
+
+class TableTest(unittest.TestCase):
+
+    def setUp(self):
+        Console.configure('text')
+        self.addCleanup(Console.configure, 'text')
+
+        # A terminal of 12 lines shows 10 lines per screen
+        patcher = mock.patch('shutil.get_terminal_size', return_value=os.terminal_size((80, 12)))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def table(self, *args, **kwargs) -> list:
+        output = io.StringIO()
+        with redirect_stdout(output):
+            Console.table(*args, **kwargs)
+        return output.getvalue().splitlines()
+
+    def test_widths_from_the_sample(self):
+        lines = self.table(HEADERS, iter(rows(3) + [['a-much-longer-pod-name', 'CrashLoopBackOff']]), sample=3)
+
+        self.assertEqual(lines[:2], ["Name  | Status ", "------+--------"])
+        self.assertEqual(lines[2], "pod-0 | Running")
+        self.assertEqual(lines[-1], "a-... | Cras...")
+
+    def test_widths_capped_or_given(self):
+        lines = self.table(HEADERS, [['a-much-longer-pod-name', 'Running']], max_width=10)
+        self.assertEqual(lines[2], "a-much-... | Running")
+
+        lines = self.table(HEADERS, iter(rows(2)), widths=[6, 4], sample=0)
+        self.assertEqual(lines, ["Name   | S...", "-------+-----", "pod-0  | R...", "pod-1  | R..."])
+
+    def test_headers_alone(self):
+        self.assertEqual(self.table(HEADERS, []), ["Name | Status", "-----+-------"])
+
+    def test_rows_are_not_paged_by_default(self):
+        with mock.patch.object(Console, 'morePrompt') as prompt:
+            lines = self.table(HEADERS, rows(2000))
+        prompt.assert_not_called()
+        self.assertEqual(len(lines), 2002)
+
+    def test_paging_one_screen_at_a_time(self):
+        with mock.patch.object(Console, 'morePrompt', side_effect=[False, False]) as prompt:
+            lines = self.table(HEADERS, rows(25), page=True)
+
+        # 2 header lines and 8 rows, then 10 rows per screen
+        self.assertEqual(prompt.call_count, 2)
+        self.assertEqual(len(lines), 27)
+        self.assertEqual(lines[-1].split()[0], 'pod-24')
+
+    def test_paging_stops_on_quit(self):
+        with mock.patch.object(Console, 'morePrompt', return_value=None) as prompt:
+            lines = self.table(HEADERS, iter(rows(100)), page=True)
+
+        prompt.assert_called_once()
+        self.assertEqual(len(lines), 10)
+        self.assertEqual(lines[-1].split()[0], 'pod-7')
+
+    def test_paging_shows_all_the_remaining_rows(self):
+        with mock.patch.object(Console, 'morePrompt', return_value=True) as prompt:
+            lines = self.table(HEADERS, rows(100), page=True)
+
+        prompt.assert_called_once()
+        self.assertEqual(len(lines), 102)
+
+    def test_structured_modes_emit_records(self):
+        Console.configure('ndjson')
+        lines = self.table(HEADERS, rows(2), name='pod')
+
+        self.assertEqual(len(lines), 2)
+        self.assertIn('"pod-1"', lines[1])
+        self.assertIn('"Running"', lines[1])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+"""
+Tool detection cached between runs, keyed by the fingerprint of the binary.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+import support  # noqa: F401 (project paths)
+from azure.runner import runner
+from azure.cli_manager import Azure
+
+# Fake `kubectl` counting its calls in the CALLS file
+KUBECTL = """#!/bin/sh
+echo "$@" >> "$CALLS"
+echo '{"clientVersion": {"gitVersion": "v1.31.2"}}'
+"""
+
+class ToolCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = Path(tempfile.mkdtemp(prefix="azure-cli-test-"))
+        self.addCleanup(shutil.rmtree, self.folder, True)
+        self.binary = self.folder / 'bin' / 'kubectl'
+        self.binary.parent.mkdir()
+        self.binary.write_text(KUBECTL)
+        self.binary.chmod(0o755)
+        self.calls = self.folder / 'calls'
+
+        for patcher in (
+            mock.patch.dict(os.environ, {'PATH': str(self.binary.parent), 'CALLS': str(self.calls)}),
+            mock.patch('lib.cache.CACHE_DIR', self.folder / 'cache'),
+            mock.patch.object(runner, '_programs', {}),
+            mock.patch.object(runner, '_checks', {}),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.azure = Azure.__new__(Azure)
+
+    def version_calls(self) -> int:
+        return len(self.calls.read_text().splitlines()) if self.calls.exists() else 0
+
+    def test_detection_is_reused_while_the_binary_is_unchanged(self):
+        self.assertEqual(self.azure.check_tool('kubectl'), 'v1.31.2')
+        self.assertEqual(self.azure.check_tool('kubectl'), 'v1.31.2')
+        self.assertEqual(self.version_calls(), 1)
+
+    def test_upgraded_binary_is_detected_again(self):
+        self.azure.check_tool('kubectl')
+        self.binary.write_text(KUBECTL + "# upgraded\n")
+
+        self.azure.check_tool('kubectl')
+        self.assertEqual(self.version_calls(), 2)
+
+    def test_recheck_ignores_the_cache(self):
+        self.azure.check_tool('kubectl')
+        self.azure.check_tool('kubectl', recheck=True)
+        self.assertEqual(self.version_calls(), 2)
+
+    def test_missing_tool_is_reported(self):
+        with self.assertRaisesRegex(RuntimeError, "Azure CLI is not installed"):
+            self.azure.check_tool('az')
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,38 @@
+"""
+Verification of single-pod backups saved as archives.
+"""
+
+import unittest
+from support import ShimTestCase, ORIGIN
+
+class ArchiveVerifyTest(ShimTestCase):
+
+    def test_archive_is_verified(self):
+        self.write_config()
+
+        for compression in ('none', 'gzip'):
+            result = self.run_cli('--backup', '--archive', '--compression', compression, '--verify')
+            self.assertIn("Verification of pod", result.stdout)
+            self.assertIn("20 local files hashed", result.stdout)
+
+    def test_archive_mismatch_fails(self):
+        self.write_config()
+        self.run_cli('--backup', '--archive', '--compression', 'gzip')
+
+        changed = next((self.workdir / 'pod' / ORIGIN.lstrip('/')).rglob('*.php'))
+        changed.write_text("changed after the backup")
+
+        result = self.run_cli('--verify', '--archive', '--compression', 'gzip', check=False)
+        self.assertNotEqual(result.returncode, 0)
+        self.assertIn("1 mismatched", result.stdout)
+
+    def test_missing_archive_is_reported(self):
+        self.write_config()
+
+        result = self.run_cli('--verify', '--archive', check=False)
+        self.assertNotEqual(result.returncode, 0)
+        self.assertIn("The backup archive", result.stdout)
+        self.assertNotIn("The backup folder", result.stdout)
+
+if __name__ == "__main__":
+    unittest.main()
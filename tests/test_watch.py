@@ -0,0 +1,57 @@
+"""
+Failures of the pod watch: transient ones are retried with an increasing delay, the others stop it.
+"""
+
+import sys
+import time
+import unittest
+import subprocess
+from support import ShimTestCase, ROOT_DIR
+
+class WatchFailureTest(ShimTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.write_config()
+
+    def test_permanent_error_stops_the_watch(self):
+        self.environment['BENCH_WATCH_ERROR'] = 'Error from server (Forbidden): pods is forbidden: User "dev" cannot watch resource "pods"'
+
+        result = self.run_cli('--watch', check=False)
+        self.assertNotEqual(result.returncode, 0)
+        self.assertIn("Failed to watch pods", result.stdout)
+        self.assertIn("cannot watch resource", result.stdout)
+        self.assertNotIn("Restarting", result.stdout)
+
+    def test_transient_error_is_retried_with_backoff(self):
+        self.environment['BENCH_WATCH_ERROR'] = 'Unable to connect to the server: dial tcp 10.0.0.1:443: i/o timeout'
+
+        process = subprocess.Popen(
+            [sys.executable, '-B', str(ROOT_DIR / 'azure-cli.py'), '--no-banner', '--output', 'plain', '--watch'],
+            env=self.environment, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True
+        )
+        self.addCleanup(process.wait)
+        self.addCleanup(process.kill)
+
+        warnings = []
+        deadline = time.monotonic() + 30
+        for line in process.stdout:
+            if "Pod watch failed" in line:
+                warnings.append(line)
+                if len(warnings) == 3 or time.monotonic() > deadline:
+                    break
+
+        self.assertEqual(len(warnings), 3, warnings)
+        self.assertIn("i/o timeout", warnings[0])
+        self.assertEqual(
+            [line.rsplit("Restarting in ", 1)[1].strip() for line in warnings],
+            ["1s...", "2s...", "4s..."]
+        )
+
+    def test_json_output_is_rejected(self):
+        result = self.run_cli('--watch', '--output', 'json', check=False)
+        self.assertEqual(result.returncode, 2)
+        self.assertIn("--output ndjson", result.stderr)
+
+if __name__ == "__main__":
+    unittest.main()